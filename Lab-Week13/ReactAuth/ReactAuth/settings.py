@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -93,9 +95,40 @@ ROOT_URLCONF = 'ReactAuth.urls'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'users.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'users.pagination.AcademicCursorPagination',
+    'PAGE_SIZE': 50,
+}
+# Cache bersama (token_version serta versi katalog, skala nilai, ETag dan
+# statistik). Harus dibagi semua proses, termasuk run_workers, jadi bukan
+# LocMemCache; CACHE_DIR mengganti lokasi FileBasedCache.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'reactauth-cache')),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
 }
+# Detik respons katalog disimpan (entri lama tetap tidak terbaca begitu versi naik).
+CATALOG_CACHE_TTL = 60 * 60
+# Batas atas ?page_size= untuk endpoint list.
+ACADEMIC_MAX_PAGE_SIZE = 500
+# Detik token_version di-cache sebelum dicek ulang ke database (batas lambat pencabutan token).
+TOKEN_VERSION_CACHE_TTL = 60
+# Cache objek CustomUser per proses untuk request yang butuh model lengkap.
+USER_CACHE_MAXSIZE = 1024
+USER_CACHE_TTL = 300
+# Antrian job di database (python manage.py run_workers).
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_MAKS_PERCOBAAN = 5
+# Detik jeda retry pertama setelah "database is locked" (berlipat dua tiap percobaan).
+JOB_RETRY_DELAY = 2
+JOB_EXPORT_DIR = BASE_DIR / 'job_exports'
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
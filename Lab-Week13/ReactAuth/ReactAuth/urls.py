@@ -1,9 +1,10 @@
 from django.contrib import admin
 from django.urls import path, include
-from users.urls import (auth_urls, academic_urls)
+from users.urls import (auth_urls, academic_urls, batch_urls)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include(auth_urls)),
-    path('api/academic/', include(academic_urls)) 
+    path('api/academic/', include(academic_urls)),
+    path('api/batch/', include(batch_urls)),
 ]
\ No newline at end of file
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser, Matakuliah, Jurusan, KomponenNilai, Assessment, NilaiAkhir
+from .models import CustomUser, Matakuliah, Jurusan, KomponenNilai, Assessment, NilaiAkhir, SkalaNilai, Job
 
 class CustomUserAdmin(UserAdmin):
     list_display = (
@@ -43,4 +43,22 @@ admin.site.register(Jurusan)
 admin.site.register(Matakuliah)
 admin.site.register(KomponenNilai)
 admin.site.register(Assessment)
-admin.site.register(NilaiAkhir)
\ No newline at end of file
+admin.site.register(NilaiAkhir)
+admin.site.register(SkalaNilai)
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'jenis', 'status', 'progres', 'percobaan', 'created_at', 'finished_at')
+    list_filter = ('jenis', 'status')
+    # payload bisa berisi password registrasi angkatan; jangan pernah tampil di admin.
+    exclude = ('payload',)
+    readonly_fields = (
+        'jenis', 'status', 'hasil', 'error', 'progres', 'percobaan', 'maks_percobaan',
+        'jalan_setelah', 'worker', 'dibuat_oleh', 'created_at', 'started_at', 'finished_at',
+    )
+
+    def has_add_permission(self, request):
+        # Job dibuat lewat jobs.enqueue, bukan dari admin.
+        return False
+
+admin.site.register(Job, JobAdmin)
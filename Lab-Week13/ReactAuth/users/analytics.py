@@ -0,0 +1,152 @@
+# users/analytics.py
+"""Statistik distribusi nilai satu mata kuliah.
+
+Nilai diambil dengan values_list (tanpa instance model) lalu dihitung dalam
+satu lintasan NumPy; bila NumPy tidak ada, modul statistics dipakai. Hasilnya
+di-cache di bawah versi nilai per mata kuliah yang dinaikkan setiap kali
+NilaiAkhir mata kuliah itu dihitung ulang atau komponennya berubah.
+"""
+import math
+import statistics
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .grading import BOBOT_HURUF
+from .models import Assessment, KomponenNilai, Matakuliah, NilaiAkhir
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsional, modul statistics tetap benar
+    np = None
+
+STATISTIK_CACHE_TTL = getattr(settings, 'STATISTIK_CACHE_TTL', 60 * 60)
+PERSENTIL = (10, 25, 50, 75, 90)
+# Batas bawah kelas histogram skor komponen: [0,10), [10,20), ..., [90,100].
+BATAS_KELAS = tuple(range(0, 100, 10))
+
+
+def _kunci_versi(matakuliah_kode):
+    return f'statistik:versi:{matakuliah_kode}'
+
+
+def versi_nilai(matakuliah_kode):
+    key = _kunci_versi(matakuliah_kode)
+    versi = cache.get(key)
+    if versi is None:
+        # Berbasis waktu seperti versi katalog: tidak mengulang versi lama bila ter-evict.
+        cache.add(key, int(time.time() * 1000), None)
+        versi = cache.get(key)
+    return versi
+
+
+def _naikkan(matakuliah_kodes):
+    for kode in matakuliah_kodes:
+        try:
+            cache.incr(_kunci_versi(kode))
+        except ValueError:
+            cache.set(_kunci_versi(kode), int(time.time() * 1000), None)
+
+
+def naikkan_versi_nilai(matakuliah_kodes):
+    kodes = {kode for kode in matakuliah_kodes if kode is not None}
+    if kodes:
+        _naikkan(kodes)
+        transaction.on_commit(lambda: _naikkan(kodes))
+
+
+def _ringkas(nilai):
+    """mean/median/std/min/max/persentil dari list float (std populasi)."""
+    if not nilai:
+        return {'jumlah': 0, 'mean': None, 'median': None, 'std': None, 'min': None, 'max': None,
+                'persentil': {str(p): None for p in PERSENTIL}}
+
+    if np is not None:
+        arr = np.asarray(nilai, dtype=float)
+        hasil = {
+            'mean': arr.mean(), 'median': np.median(arr), 'std': arr.std(),
+            'min': arr.min(), 'max': arr.max(),
+        }
+        persentil = dict(zip(PERSENTIL, np.percentile(arr, PERSENTIL)))
+    else:
+        hasil = {
+            'mean': statistics.fmean(nilai), 'median': statistics.median(nilai),
+            'std': statistics.pstdev(nilai), 'min': min(nilai), 'max': max(nilai),
+        }
+        # method='inclusive' sama dengan interpolasi linear bawaan np.percentile.
+        titik = statistics.quantiles(nilai, n=100, method='inclusive') if len(nilai) > 1 else nilai * 99
+        persentil = {p: titik[p - 1] for p in PERSENTIL}
+
+    return {
+        'jumlah': len(nilai),
+        **{key: round(float(value), 2) for key, value in hasil.items()},
+        'persentil': {str(p): round(float(value), 2) for p, value in persentil.items()},
+    }
+
+
+def _histogram_skor(nilai):
+    if np is not None and nilai:
+        kelas = np.clip(np.asarray(nilai, dtype=float) // 10, 0, len(BATAS_KELAS) - 1).astype(int)
+        jumlah = np.bincount(kelas, minlength=len(BATAS_KELAS)).tolist()
+    else:
+        jumlah = [0] * len(BATAS_KELAS)
+        for value in nilai:
+            jumlah[min(max(int(math.floor(value / 10)), 0), len(BATAS_KELAS) - 1)] += 1
+    return [
+        {'rentang': f'{batas}-{batas + 10}' if batas < 90 else '90-100', 'jumlah': n}
+        for batas, n in zip(BATAS_KELAS, jumlah)
+    ]
+
+
+def _hitung(matakuliah):
+    kode = matakuliah['kode_mk']
+    nilai_akhir = list(NilaiAkhir.objects.filter(matakuliah_id=kode).values_list('nilai_total', 'nilai_huruf'))
+    komponen = list(
+        KomponenNilai.objects.filter(matakuliah_id=kode).order_by('id').values('id', 'nama_komponen', 'bobot_persen')
+    )
+    per_komponen = {k['id']: [] for k in komponen}
+    for komponen_id, nilai in Assessment.objects.filter(matakuliah_id=kode).values_list('komponen_id', 'nilai_angka'):
+        per_komponen.setdefault(komponen_id, []).append(float(nilai))
+
+    histogram = {huruf: 0 for huruf in BOBOT_HURUF}
+    belum = 0
+    for _, huruf in nilai_akhir:
+        if huruf:
+            histogram[huruf] = histogram.get(huruf, 0) + 1
+        else:
+            belum += 1
+
+    return {
+        'matakuliah': kode,
+        'nama_mk': matakuliah['nama_mk'],
+        'jumlah_mahasiswa': len(nilai_akhir),
+        'belum_dihitung': belum,
+        'nilai_akhir': _ringkas([float(total) for total, _ in nilai_akhir if total is not None]),
+        'histogram_huruf': histogram,
+        'komponen': [
+            {
+                'id': k['id'],
+                'nama_komponen': k['nama_komponen'],
+                'bobot_persen': str(k['bobot_persen']),
+                **_ringkas(per_komponen[k['id']]),
+                'histogram': _histogram_skor(per_komponen[k['id']]),
+            }
+            for k in komponen
+        ],
+    }
+
+
+def statistik_matakuliah(matakuliah_kode):
+    """Statistik distribusi nilai; mengembalikan (success, result) seperti utils.py."""
+    matakuliah = Matakuliah.objects.filter(kode_mk=matakuliah_kode).values('kode_mk', 'nama_mk').first()
+    if matakuliah is None:
+        return False, "Mata Kuliah tidak ditemukan."
+
+    key = f'statistik:{matakuliah_kode}:{versi_nilai(matakuliah_kode)}'
+    hasil = cache.get(key)
+    if hasil is None:
+        hasil = _hitung(matakuliah)
+        cache.set(key, hasil, STATISTIK_CACHE_TTL)
+    return True, hasil
@@ -0,0 +1,109 @@
+# users/async_views.py
+"""View async (ASGI) untuk endpoint baca yang paling sering dipanggil.
+
+DRF belum mendukung view async, jadi ini view Django biasa dengan ORM async
+(``async for``, ``afirst``) dan autentikasi ClaimsJWTAuthentication.aauthenticate.
+Di bawah ASGI, request yang menunggu database tidak menahan thread worker.
+Bentuk respons sama dengan versi DRF-nya; pagination memakai cursor pk
+sederhana (``?after=<pk>``) yang bisa diikuti lewat link ``next``.
+"""
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from . import catalog_cache
+from .authentication import ClaimsJWTAuthentication
+from .dashboard import adashboard_dosen, adashboard_mahasiswa
+from .models import CustomUser, Matakuliah, NilaiAkhir
+from .renderers import FastJSONRenderer
+from .serializers import MatakuliahReadSerializer, NilaiAkhirSerializer
+
+PAGE_SIZE = settings.REST_FRAMEWORK.get('PAGE_SIZE', 50)
+MAX_PAGE_SIZE = getattr(settings, 'ACADEMIC_MAX_PAGE_SIZE', 500)
+
+_renderer = FastJSONRenderer()
+
+
+def _json(data, status=200):
+    return HttpResponse(_renderer.render(data), status=status, content_type='application/json')
+
+
+def async_read_view(wajib_login=True):
+    """Dekorator: hanya GET/HEAD, autentikasi JWT async, error dalam format DRF."""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return _json({'detail': f'Method "{request.method}" tidak diizinkan.'}, 405)
+            try:
+                hasil = await ClaimsJWTAuthentication().aauthenticate(request)
+            except (AuthenticationFailed, InvalidToken) as e:
+                return _json(e.detail if isinstance(e.detail, dict) else {'detail': e.detail}, 401)
+
+            if hasil is None and wajib_login:
+                return _json({'detail': 'Kredensial autentikasi tidak diberikan.'}, 401)
+            request.user = hasil[0] if hasil else AnonymousUser()
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def _halaman(request, queryset, serializer_class):
+    try:
+        page_size = min(int(request.GET.get('page_size', PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        page_size = PAGE_SIZE
+
+    after = request.GET.get('after')
+    if after:
+        queryset = queryset.filter(pk__gt=after)
+    rows = [obj async for obj in queryset.order_by('pk')[:page_size + 1]]
+
+    next_url = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        query = request.GET.copy()
+        query['after'] = rows[-1].pk
+        next_url = request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+    return {'next': next_url, 'previous': None, 'results': serializer_class(rows, many=True).data}
+
+
+def _cursor_tidak_valid():
+    return _json({'detail': 'Cursor tidak valid.'}, 400)
+
+
+@async_read_view(wajib_login=False)
+async def matakuliah_list(request):
+    queryset = Matakuliah.objects.select_related('jurusan').prefetch_related(
+        Prefetch('pengajar', queryset=CustomUser.objects.only('id', 'full_name', 'email'))
+    )
+    try:
+        data = await catalog_cache.acached(
+            request, lambda: _halaman(request, queryset, MatakuliahReadSerializer)
+        )
+    except (ValueError, ValidationError):
+        return _cursor_tidak_valid()
+    return _json(data)
+
+
+@async_read_view()
+async def transkrip(request):
+    queryset = NilaiAkhir.objects.select_related('matakuliah')
+    if request.user.role == CustomUser.Role.MAHASISWA and not request.user.is_staff:
+        queryset = queryset.filter(mahasiswa_id=request.user.id)
+    try:
+        return _json(await _halaman(request, queryset, NilaiAkhirSerializer))
+    except (ValueError, ValidationError):
+        return _cursor_tidak_valid()
+
+
+@async_read_view()
+async def dashboard(request):
+    if request.user.role == CustomUser.Role.DOSEN:
+        return _json(await adashboard_dosen(request.user.id))
+    return _json(await adashboard_mahasiswa(request.user.id))
@@ -0,0 +1,149 @@
+# users/authentication.py
+"""Autentikasi JWT tanpa memuat CustomUser untuk request baca.
+
+Token sudah membawa id, email, role, full_name, major dan is_staff, jadi
+untuk GET/HEAD/OPTIONS user dibangun langsung dari claim yang sudah
+diverifikasi. Request tulis tetap memuat user dari database. Pencabutan token
+memakai claim ``ver`` yang harus sama dengan CustomUser.token_version (naik saat
+password, role, is_staff, is_superuser atau is_active berubah); versi itu di-cache sebentar agar request baca tidak perlu query. View async memakai
+aauthenticate yang memeriksa versi lewat cache/ORM async.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework import permissions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .user_cache import user_cache
+
+CustomUser = get_user_model()
+
+TOKEN_VERSION_CACHE_TTL = getattr(settings, 'TOKEN_VERSION_CACHE_TTL', 60)
+
+
+def _cache_key(user_id):
+    return f'users:token_version:{user_id}'
+
+
+def versi_token(user_id):
+    """token_version user saat ini (None bila user tidak ada atau nonaktif)."""
+    key = _cache_key(user_id)
+    versi = cache.get(key)
+    if versi is None:
+        versi = (
+            CustomUser.objects.filter(pk=user_id, is_active=True)
+            .values_list('token_version', flat=True).first()
+        )
+        # -1 menandai user yang tidak ada/nonaktif supaya tidak di-query terus.
+        cache.set(key, -1 if versi is None else versi, TOKEN_VERSION_CACHE_TTL)
+        return versi
+    return None if versi == -1 else versi
+
+
+async def aversi_token(user_id):
+    """Versi async dari versi_token untuk view async (tidak memblok event loop)."""
+    key = _cache_key(user_id)
+    versi = await cache.aget(key)
+    if versi is None:
+        versi = await (
+            CustomUser.objects.filter(pk=user_id, is_active=True)
+            .values_list('token_version', flat=True).afirst()
+        )
+        await cache.aset(key, -1 if versi is None else versi, TOKEN_VERSION_CACHE_TTL)
+        return versi
+    return None if versi == -1 else versi
+
+
+def lupakan_versi_token(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+def cek_versi_token(token):
+    versi = versi_token(token[api_settings.USER_ID_CLAIM])
+    if versi is None:
+        raise AuthenticationFailed("User tidak ditemukan atau tidak aktif.", code='user_not_found')
+    if token.get('ver', 0) != versi:
+        raise InvalidToken("Token sudah dicabut.")
+
+
+async def acek_versi_token(token):
+    versi = await aversi_token(token[api_settings.USER_ID_CLAIM])
+    if versi is None:
+        raise AuthenticationFailed("User tidak ditemukan atau tidak aktif.", code='user_not_found')
+    if token.get('ver', 0) != versi:
+        raise InvalidToken("Token sudah dicabut.")
+
+
+class ClaimsUser(TokenUser):
+    """User ringan dari claim token; atribut di luar claim memuat CustomUser sekali.
+
+    id/pk berupa int seperti CustomUser.pk (claim user_id disimpan sebagai str),
+    dan claim ``major`` hanya tersedia sebagai major_id; ``major`` tetap objek
+    Jurusan seperti di CustomUser.
+    """
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @property
+    def major_id(self):
+        return self.token.get('major')
+
+    @property
+    def instance(self):
+        if '_instance' not in self.__dict__:
+            self.__dict__['_instance'] = user_cache.get(self.id, self.token.get('ver', 0))
+        return self.__dict__['_instance']
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        if attr in self.token and attr != 'major':
+            return self.token[attr]
+        return getattr(self.instance, attr)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        cek_versi_token(validated_token)
+        if request.method in permissions.SAFE_METHODS:
+            return ClaimsUser(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    async def aauthenticate(self, request):
+        """Untuk view async (hanya baca): verifikasi token + cek versi tanpa blocking."""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        # Verifikasi tanda tangan murni CPU, tidak menyentuh database.
+        validated_token = self.get_validated_token(raw_token)
+        await acek_versi_token(validated_token)
+        return ClaimsUser(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        # Versi sudah dicek, jadi (id, ver) di token aman dipakai sebagai kunci cache.
+        try:
+            return user_cache.get(validated_token[api_settings.USER_ID_CLAIM], validated_token.get('ver', 0))
+        except CustomUser.DoesNotExist:
+            raise AuthenticationFailed("User tidak ditemukan atau tidak aktif.", code='user_not_found')
@@ -0,0 +1,96 @@
+# users/batch.py
+"""Menjalankan beberapa request API akademik dalam satu round trip.
+
+Setiap sub-request dibuat dengan RequestFactory dan langsung diteruskan ke
+view-nya (tanpa middleware), memakai user yang sudah diautentikasi request
+batch sehingga JWT hanya diverifikasi sekali. Bila ada request tulis, semua
+dijalankan dalam satu transaksi: satu yang gagal membatalkan semuanya.
+Respons DRF diambil dari ``response.data`` tanpa dirender dua kali.
+"""
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import Resolver404, resolve
+from rest_framework import permissions
+from rest_framework.response import Response
+
+MAX_BATCH = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+PREFIX = '/api/academic/'
+METHODS = {'GET', 'POST', 'PUT', 'PATCH', 'DELETE'}
+
+_factory = RequestFactory()
+
+
+def _gagal(item_id, status_code, detail):
+    return {'id': item_id, 'status': status_code, 'data': {'detail': detail}}
+
+
+def _jalankan(request, item_id, item):
+    method = str(item.get('method') or 'GET').upper()
+    path = item.get('path')
+    if method not in METHODS:
+        return _gagal(item_id, 405, f"Method '{method}' tidak didukung.")
+    if not isinstance(path, str) or not path.startswith(PREFIX):
+        return _gagal(item_id, 400, f"path harus diawali {PREFIX}")
+
+    try:
+        match = resolve(path.split('?', 1)[0])
+    except Resolver404:
+        return _gagal(item_id, 404, "Endpoint tidak ditemukan.")
+
+    headers = item.get('headers') if isinstance(item.get('headers'), dict) else {}
+    body = item.get('body')
+    sub = _factory.generic(
+        method, path,
+        data=json.dumps(body) if body is not None else '',
+        content_type='application/json',
+        headers={key: str(value) for key, value in headers.items() if key.lower() not in ('authorization', 'host')},
+        secure=request.is_secure(),
+        # Host asli agar link absolut (cursor next/previous) tetap benar.
+        HTTP_HOST=request.get_host(),
+    )
+    # Dibaca oleh rest_framework.request.Request: autentikasi tidak diulang.
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+
+    response = match.func(sub, *match.args, **match.kwargs)
+    if isinstance(response, StreamingHttpResponse):
+        return _gagal(item_id, 400, "Respons streaming (ekspor) tidak bisa dijalankan dalam batch.")
+    if isinstance(response, Response):
+        data = response.data
+    elif response.content:
+        try:
+            data = json.loads(response.content)
+        except ValueError:
+            data = response.content.decode(response.charset or 'utf-8', 'replace')
+    else:
+        data = None
+
+    hasil = {'id': item_id, 'status': response.status_code, 'data': data}
+    if response.has_header('ETag'):
+        hasil['etag'] = response['ETag']
+    return hasil
+
+
+def jalankan_batch(request, items):
+    """Jalankan sub-request berurutan; mengembalikan (success, result)."""
+    if not items:
+        return False, "Batch kosong."
+    if len(items) > MAX_BATCH:
+        return False, f"Maksimal {MAX_BATCH} request per batch."
+
+    ada_tulis = any(
+        str(item.get('method') or 'GET').upper() not in permissions.SAFE_METHODS for item in items
+    )
+    if not ada_tulis:
+        return True, {'responses': [_jalankan(request, item.get('id', i), item) for i, item in enumerate(items)]}
+
+    with transaction.atomic():
+        responses = [_jalankan(request, item.get('id', i), item) for i, item in enumerate(items)]
+        dibatalkan = any(r['status'] >= 400 for r in responses)
+        if dibatalkan:
+            transaction.set_rollback(True)
+    return True, {'responses': responses, 'rolled_back': dibatalkan}
@@ -0,0 +1,113 @@
+# users/catalog_cache.py
+"""Cache respons baca katalog (Jurusan, Matakuliah) dengan kunci versi.
+
+Setiap respons disimpan di bawah versi katalog saat itu. Perubahan Jurusan,
+Matakuliah, pengajar atau total_mahasiswa menaikkan versi (sekali saat itu
+juga dan sekali lagi saat commit), sehingga entri lama tidak pernah dibaca
+lagi dan cukup dibiarkan kedaluwarsa. Versi disimpan di cache Django sendiri
+supaya semua proses yang berbagi backend (misal FileBasedCache) ikut melihatnya.
+"""
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+VERSION_KEY = 'katalog:versi'
+CATALOG_CACHE_TTL = getattr(settings, 'CATALOG_CACHE_TTL', 60 * 60)
+
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def versi_katalog():
+    versi = cache.get(VERSION_KEY)
+    if versi is None:
+        # Berbasis waktu agar tidak pernah mengulang versi lama bila kuncinya ter-evict.
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        versi = cache.get(VERSION_KEY)
+    return versi
+
+
+async def aversi_katalog():
+    versi = await cache.aget(VERSION_KEY)
+    if versi is None:
+        await cache.aadd(VERSION_KEY, int(time.time() * 1000), None)
+        versi = await cache.aget(VERSION_KEY)
+    return versi
+
+
+def _naikkan():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), None)
+
+
+def naikkan_versi_katalog():
+    # Langsung (request lain di transaksi ini) dan saat commit (request yang sempat
+    # meng-cache data lama di antara keduanya).
+    _naikkan()
+    transaction.on_commit(_naikkan)
+
+
+def stats():
+    with _lock:
+        total = _stats['hits'] + _stats['misses']
+        return {
+            **_stats,
+            'versi': versi_katalog(),
+            'hit_rate': round(_stats['hits'] / total, 4) if total else None,
+        }
+
+
+def _catat(hit):
+    with _lock:
+        _stats['hits' if hit else 'misses'] += 1
+
+
+def kunci_cache(request, versi):
+    # URL lengkap (host + query) ikut kunci karena link cursor pagination absolut.
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'katalog:{versi}:{url}'
+
+
+async def acached(request, loader):
+    """Versi async untuk view katalog async: loader() adalah coroutine yang mengembalikan data."""
+    key = kunci_cache(request, await aversi_katalog())
+    data = await cache.aget(key)
+    if data is not None:
+        _catat(hit=True)
+        return data
+
+    _catat(hit=False)
+    data = await loader()
+    await cache.aset(key, data, CATALOG_CACHE_TTL)
+    return data
+
+
+class CatalogCacheMixin:
+    """Cache list/retrieve ViewSet katalog. Datanya sama untuk semua user."""
+
+    def _cached(self, request, handler, *args, **kwargs):
+        key = kunci_cache(request, versi_katalog())
+
+        data = cache.get(key)
+        if data is not None:
+            _catat(hit=True)
+            return Response(data)
+
+        _catat(hit=False)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, CATALOG_CACHE_TTL)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(request, super().retrieve, *args, **kwargs)
@@ -0,0 +1,151 @@
+# users/cohort.py
+"""Registrasi satu angkatan sekaligus.
+
+Validasi email (pola + yang sudah terdaftar) dan jurusan dilakukan dengan satu
+query per tabel, password diperiksa dengan AUTH_PASSWORD_VALIDATORS, hashing PBKDF2 disebar ke process pool (inti CPU lain, tidak
+terhalang GIL), lalu user disimpan dengan bulk_create.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from .models import Jurusan
+from .serializers import STUDENT_PATTERN, INSTRUCTOR_PATTERN
+
+CustomUser = get_user_model()
+
+# Di bawah jumlah ini biaya menyalakan pool lebih mahal daripada hashing-nya.
+MIN_POOL = 8
+
+
+def _init_worker(settings_module):
+    # Dibutuhkan bila start method 'spawn' (macOS/Windows); pada fork Django sudah siap.
+    import django
+    from django.conf import settings
+    if not settings.configured:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+        django.setup()
+
+
+def hash_passwords(passwords, workers=None):
+    passwords = list(passwords)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(passwords) < MIN_POOL:
+        return [make_password(p) for p in passwords]
+
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'ReactAuth.settings'),),
+    ) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def _role_dari_email(email):
+    if STUDENT_PATTERN.match(email):
+        return CustomUser.Role.MAHASISWA
+    if INSTRUCTOR_PATTERN.match(email):
+        return CustomUser.Role.DOSEN
+    return None
+
+
+def daftarkan_angkatan(rows, password_default=None, workers=None, batch_size=1000):
+    """Daftarkan banyak user; rows berisi dict email, full_name, major, role, password.
+
+    role boleh kosong (ditentukan dari domain email), password boleh kosong bila
+    password_default diisi. Baris yang salah dilewati dan dilaporkan per baris.
+    Mengembalikan (success, result) seperti fungsi di utils.py.
+    """
+    mulai = time.perf_counter()
+    rows = list(rows)
+    if not rows:
+        return False, "Data user kosong."
+
+    emails = [str(row.get('email') or '').strip().lower() for row in rows]
+    sudah_ada = set(CustomUser.objects.filter(email__in=[e for e in emails if e]).values_list('email', flat=True))
+    majors = {str(row.get('major') or '').strip() for row in rows} - {''}
+    jurusan_valid = set(Jurusan.objects.filter(kode__in=majors).values_list('kode', flat=True))
+
+    hasil, calon, dilihat = [], [], set()
+    for nomor, (row, email) in enumerate(zip(rows, emails), start=1):
+        errors = {}
+        pola_role = _role_dari_email(email)
+        if not email:
+            errors['email'] = "Email harus diisi."
+        elif pola_role is None:
+            errors['email'] = "Email harus berakhiran @student.prasetiyamulya.ac.id atau @prasetiyamulya.ac.id"
+        elif email in sudah_ada:
+            errors['email'] = "Email sudah terdaftar."
+        elif email in dilihat:
+            errors['email'] = "Email muncul lebih dari sekali."
+        dilihat.add(email)
+
+        full_name = str(row.get('full_name') or '').strip()
+        if not full_name:
+            errors['full_name'] = "Nama lengkap harus diisi."
+
+        major = str(row.get('major') or '').strip() or None
+        if major and major not in jurusan_valid:
+            errors['major'] = f"Jurusan '{major}' tidak ditemukan."
+
+        role = str(row.get('role') or '').strip().upper() or pola_role
+        if role and role not in (CustomUser.Role.MAHASISWA, CustomUser.Role.DOSEN):
+            errors['role'] = f"Pilihan role '{role}' tidak valid."
+
+        user = CustomUser(email=email, full_name=full_name, major_id=major, role=role)
+        password = row.get('password') or password_default
+        if not password:
+            errors['password'] = "Password harus diisi."
+        else:
+            # Aturan AUTH_PASSWORD_VALIDATORS yang sama dengan registrasi biasa.
+            try:
+                validate_password(password, user)
+            except ValidationError as e:
+                errors['password'] = ' '.join(e.messages)
+
+        if errors:
+            hasil.append({'baris': nomor, 'email': email, 'status': 'gagal', 'errors': errors})
+            continue
+        hasil.append({'baris': nomor, 'email': email, 'status': 'dibuat'})
+        calon.append((user, password))
+
+    if calon:
+        hashes = hash_passwords([password for _, password in calon], workers)
+        for (user, _), password_hash in zip(calon, hashes):
+            user.password = password_hash
+
+        while calon:
+            try:
+                with transaction.atomic():
+                    CustomUser.objects.bulk_create([user for user, _ in calon], batch_size=batch_size)
+                break
+            except IntegrityError:
+                # Email didaftarkan request lain setelah pengecekan di atas.
+                bentrok = set(
+                    CustomUser.objects.filter(email__in=[user.email for user, _ in calon]).values_list('email', flat=True)
+                )
+                if not bentrok:
+                    raise
+                calon = [(user, password) for user, password in calon if user.email not in bentrok]
+                for item in hasil:
+                    if item['status'] == 'dibuat' and item['email'] in bentrok:
+                        item.update(status='gagal', errors={'email': "Email sudah terdaftar."})
+        ids = dict(CustomUser.objects.filter(email__in=[user.email for user, _ in calon]).values_list('email', 'id'))
+        for item in hasil:
+            if item['status'] == 'dibuat':
+                item['id'] = ids[item['email']]
+
+    return True, {
+        'jumlah': len(rows),
+        'dibuat': len(calon),
+        'gagal': len(rows) - len(calon),
+        'hasil': hasil,
+        'durasi_ms': round((time.perf_counter() - mulai) * 1000, 2),
+    }
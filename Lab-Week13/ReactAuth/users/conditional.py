@@ -0,0 +1,155 @@
+# users/conditional.py
+"""Conditional GET (ETag / Last-Modified / 304) untuk ViewSet akademik.
+
+Validator dibangun dari versi per tabel yang disimpan di cache Django
+bersama, bukan dari query ke database: signal dan jalur tulis massal
+(bulk_create/update) menaikkan versi tabel yang diubahnya, sekali saat itu
+juga dan sekali lagi saat commit, seperti versi katalog. Request dengan
+If-None-Match yang cocok dijawab 304 tanpa query sama sekali, dan respons
+penuh tidak membayar query tambahan. Last-Modified adalah waktu perubahan
+terakhir tabel-tabel itu (lebih konservatif daripada per baris).
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils.http import http_date, parse_http_date_safe, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import catalog_cache
+
+_state = threading.local()
+
+
+def _kunci_versi(tabel):
+    return f'etag:versi:{tabel}'
+
+
+def _kunci_waktu(tabel):
+    return f'etag:waktu:{tabel}'
+
+
+def _naikkan(tabels):
+    sekarang = time.time()
+    for tabel in tabels:
+        try:
+            cache.incr(_kunci_versi(tabel))
+        except ValueError:
+            cache.set(_kunci_versi(tabel), int(sekarang * 1000), None)
+    cache.set_many({_kunci_waktu(tabel): sekarang for tabel in tabels}, None)
+
+
+class _Tertunda:
+    """Tabel yang diubah di transaksi ini; versinya dinaikkan lagi sekali saat commit."""
+
+    def __init__(self):
+        self.tabel = set()
+
+    def flush(self):
+        if getattr(_state, 'tertunda', None) is self:
+            _state.tertunda = None
+        _naikkan(self.tabel)
+
+
+def naikkan_versi(*tabels):
+    _naikkan(tabels)
+    if not connection.in_atomic_block:
+        return
+    tertunda = getattr(_state, 'tertunda', None)
+    # Sama seperti recompute: callback lama ikut terbuang bila savepoint-nya di-rollback.
+    if tertunda is None or not any(func == tertunda.flush for _, func, *_ in connection.run_on_commit):
+        tertunda = _Tertunda()
+        _state.tertunda = tertunda
+        transaction.on_commit(tertunda.flush)
+    tertunda.tabel.update(tabels)
+
+
+def versi_tabel(tabels):
+    """{tabel: (versi, waktu)} dalam satu panggilan cache."""
+    kunci = [k for tabel in tabels for k in (_kunci_versi(tabel), _kunci_waktu(tabel))]
+    nilai = cache.get_many(kunci)
+    hasil = {}
+    for tabel in tabels:
+        versi, waktu = nilai.get(_kunci_versi(tabel)), nilai.get(_kunci_waktu(tabel))
+        if versi is None:
+            # Berbasis waktu agar tidak pernah mengulang versi lama bila kuncinya ter-evict.
+            cache.add(_kunci_versi(tabel), int(time.time() * 1000), None)
+            versi = cache.get(_kunci_versi(tabel))
+        if waktu is None:
+            # Waktu perubahan tidak diketahui: anggap baru saja berubah.
+            cache.add(_kunci_waktu(tabel), time.time(), None)
+            waktu = cache.get(_kunci_waktu(tabel))
+        hasil[tabel] = (versi, waktu)
+    return hasil
+
+
+class ConditionalGetMixin:
+    """Tambahkan ETag/Last-Modified ke list dan retrieve.
+
+    etag_tabel berisi tabel yang datanya ikut tampil di respons, misal
+    ('assessment', 'komponen', 'user'); 'katalog' berarti versi katalog
+    (Jurusan, Matakuliah), 'user' naik saat nama user berubah. Query string
+    dan user ikut validator karena filter dan cakupan queryset berbeda per
+    request.
+    """
+    etag_tabel = ()
+
+    def _validator(self, request):
+        """(etag, last_modified) untuk request ini; last_modified bisa None."""
+        bagian, waktu = [], []
+        tabel_db = [tabel for tabel in self.etag_tabel if tabel != 'katalog']
+        for tabel, (versi, diubah) in versi_tabel(tabel_db).items():
+            bagian.append((tabel, versi))
+            waktu.append(diubah)
+        if 'katalog' in self.etag_tabel:
+            bagian.append(('katalog', catalog_cache.versi_katalog()))
+            # Versi katalog tidak menyimpan waktu perubahan.
+            waktu.append(None)
+
+        last_modified = None
+        if waktu and None not in waktu:
+            last_modified = datetime.fromtimestamp(max(waktu), tz=timezone.utc)
+
+        bagian += [request.get_full_path(), getattr(request.user, 'id', None)]
+        etag = '"%s"' % hashlib.md5(repr(bagian).encode()).hexdigest()
+        return etag, last_modified
+
+    def _tidak_berubah(self, request, etag, last_modified, detail):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or etag in etags or f'W/{etag}' in etags
+
+        # Tanpa If-None-Match: If-Modified-Since hanya untuk satu objek, sama
+        # seperti sebelumnya (list juga bergantung pada query string).
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if detail and if_modified_since and last_modified:
+            batas = parse_http_date_safe(if_modified_since)
+            return batas is not None and int(last_modified.timestamp()) <= batas
+        return False
+
+    def _conditional(self, request, handler, detail, *args, **kwargs):
+        etag, last_modified = self._validator(request)
+        if self._tidak_berubah(request, etag, last_modified, detail):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        # Browser boleh menyimpan, tapi harus revalidasi (token per user).
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(request, super().list, False, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(request, super().retrieve, True, *args, **kwargs)
@@ -0,0 +1,128 @@
+# users/dashboard.py
+"""Payload dashboard per role dalam satu respons.
+
+Mahasiswa: mata kuliah yang diambil beserta nilai akhirnya (satu query JOIN)
+dan ringkasan IPK/SKS (satu query). Dosen: mata kuliah yang diampu dengan
+jumlah peserta dan progres input nilai, dihitung lewat subquery COUNT dalam
+satu query. Jumlah query tidak ikut tumbuh bersama data. Fungsi berawalan
+``a`` adalah versi async (ORM async) untuk view ASGI.
+"""
+from asgiref.sync import sync_to_async
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Assessment, KomponenNilai, Matakuliah, NilaiAkhir, RingkasanTranskrip
+from .serializers import NilaiAkhirSerializer, RingkasanTranskripSerializer
+
+
+def _info_matakuliah(mk):
+    return {
+        'kode_mk': mk.kode_mk,
+        'nama_mk': mk.nama_mk,
+        'sks': mk.sks,
+        'jurusan': {'kode': mk.jurusan.kode, 'nama': mk.jurusan.nama},
+    }
+
+
+def _hitung_per_matakuliah(model, **filter):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(matakuliah=OuterRef('pk'), **filter)
+            .order_by()
+            .values('matakuliah')
+            .annotate(jumlah=Count('id'))
+            .values('jumlah'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def _nilai_mahasiswa(mahasiswa_id):
+    return (
+        NilaiAkhir.objects.filter(mahasiswa_id=mahasiswa_id)
+        .select_related('matakuliah__jurusan')
+        .order_by('matakuliah_id')
+    )
+
+
+def _payload_mahasiswa(nilai_akhir, ringkasan):
+    keluar = [nilai for nilai in nilai_akhir if nilai.nilai_huruf]
+    return {
+        'role': 'MAHASISWA',
+        'matakuliah': [_info_matakuliah(nilai.matakuliah) for nilai in nilai_akhir],
+        'nilai_akhir': NilaiAkhirSerializer(keluar, many=True).data,
+        'ringkasan': RingkasanTranskripSerializer(ringkasan).data if ringkasan else None,
+    }
+
+
+def _buat_ringkasan(mahasiswa_id):
+    # Sama seperti nilai-akhir/summary: dibuat sekali untuk data lama.
+    from .utils import perbarui_ringkasan_transkrip
+    hasil = perbarui_ringkasan_transkrip([mahasiswa_id])
+    return hasil[0] if hasil else None
+
+
+def dashboard_mahasiswa(mahasiswa_id):
+    nilai_akhir = list(_nilai_mahasiswa(mahasiswa_id))
+    ringkasan = RingkasanTranskrip.objects.filter(mahasiswa_id=mahasiswa_id).first()
+    if ringkasan is None:
+        ringkasan = _buat_ringkasan(mahasiswa_id)
+    return _payload_mahasiswa(nilai_akhir, ringkasan)
+
+
+async def adashboard_mahasiswa(mahasiswa_id):
+    nilai_akhir = [nilai async for nilai in _nilai_mahasiswa(mahasiswa_id)]
+    ringkasan = await RingkasanTranskrip.objects.filter(mahasiswa_id=mahasiswa_id).afirst()
+    if ringkasan is None:
+        ringkasan = await sync_to_async(_buat_ringkasan)(mahasiswa_id)
+    return _payload_mahasiswa(nilai_akhir, ringkasan)
+
+
+def _matakuliah_dosen(dosen_id):
+    return (
+        Matakuliah.objects.filter(pengajar=dosen_id)
+        .select_related('jurusan')
+        .annotate(
+            jumlah_komponen=_hitung_per_matakuliah(KomponenNilai),
+            nilai_terinput=_hitung_per_matakuliah(Assessment),
+            nilai_akhir_keluar=_hitung_per_matakuliah(NilaiAkhir, nilai_huruf__isnull=False),
+        )
+        .order_by('kode_mk')
+    )
+
+
+def _payload_dosen(matakuliah):
+    daftar = []
+    total = {'total_mahasiswa': 0, 'nilai_terinput': 0, 'nilai_diharapkan': 0}
+    for mk in matakuliah:
+        diharapkan = mk.total_mahasiswa * mk.jumlah_komponen
+        daftar.append({
+            **_info_matakuliah(mk),
+            'total_mahasiswa': mk.total_mahasiswa,
+            'jumlah_komponen': mk.jumlah_komponen,
+            'nilai_terinput': mk.nilai_terinput,
+            'nilai_diharapkan': diharapkan,
+            'nilai_akhir_keluar': mk.nilai_akhir_keluar,
+            'progres_persen': round(mk.nilai_terinput * 100 / diharapkan, 1) if diharapkan else 0,
+        })
+        total['total_mahasiswa'] += mk.total_mahasiswa
+        total['nilai_terinput'] += mk.nilai_terinput
+        total['nilai_diharapkan'] += diharapkan
+
+    total['progres_persen'] = (
+        round(total['nilai_terinput'] * 100 / total['nilai_diharapkan'], 1) if total['nilai_diharapkan'] else 0
+    )
+    return {
+        'role': 'DOSEN',
+        'matakuliah': daftar,
+        'ringkasan': {'jumlah_matakuliah': len(daftar), **total},
+    }
+
+
+def dashboard_dosen(dosen_id):
+    return _payload_dosen(_matakuliah_dosen(dosen_id))
+
+
+async def adashboard_dosen(dosen_id):
+    return _payload_dosen([mk async for mk in _matakuliah_dosen(dosen_id)])
@@ -0,0 +1,116 @@
+# users/fieldsets.py
+"""Sparse fieldset: ``?fields=a,b,c`` pada endpoint baca.
+
+Field yang tidak diminta dibuang dari serializer, lalu queryset dipersempit
+dengan only() dan select_related/prefetch_related yang tidak lagi dibutuhkan
+ikut dilepas, jadi kolom dan join yang tidak dipakai tidak pernah di-query.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import permissions, serializers
+from rest_framework.exceptions import ValidationError
+
+
+def fields_diminta(request):
+    raw = request.query_params.get('fields') if request is not None else None
+    if not raw:
+        return None
+    return {nama.strip() for nama in raw.split(',') if nama.strip()} or None
+
+
+def terapkan_fields(serializer, request):
+    """Buang field yang tidak ada di ?fields= (serializer tunggal atau many=True)."""
+    diminta = fields_diminta(request)
+    if diminta is None:
+        return serializer
+
+    target = getattr(serializer, 'child', serializer)
+    dikenal = {nama for nama, field in target.fields.items() if not field.write_only}
+    tidak_dikenal = diminta - dikenal
+    if tidak_dikenal:
+        raise ValidationError({'fields': f"Field tidak dikenal: {', '.join(sorted(tidak_dikenal))}."})
+
+    for nama in list(target.fields):
+        if nama not in diminta:
+            target.fields.pop(nama)
+    return serializer
+
+
+def _kolom(serializer, model, prefix, sumber):
+    """(only, select_related, prefetch) yang dibutuhkan serializer, atau None bila tidak bisa ditebak."""
+    only, related, prefetch = set(), set(), set()
+    for nama, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if nama in sumber:
+            paths = [path.split('__') for path in sumber[nama]]
+        elif isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+            return None
+        else:
+            paths = [field.source_attrs]
+
+        for attrs in paths:
+            model_saat_ini, path = model, []
+            for i, attr in enumerate(attrs):
+                try:
+                    model_field = model_saat_ini._meta.get_field(attr)
+                except FieldDoesNotExist:
+                    # Property/method di model: tidak bisa diproyeksikan.
+                    return None
+                if model_field.many_to_many or model_field.one_to_many:
+                    prefetch.add(prefix + '__'.join(path + [attr]))
+                    break
+                path.append(attr)
+                kolom = prefix + '__'.join(path)
+                only.add(kolom)
+
+                terakhir = i == len(attrs) - 1
+                if model_field.is_relation and not terakhir:
+                    related.add(kolom)
+                    model_saat_ini = model_field.related_model
+                elif model_field.is_relation and isinstance(field, serializers.BaseSerializer):
+                    # Serializer bersarang: ikut proyeksikan field anaknya.
+                    related.add(kolom)
+                    anak = _kolom(field, model_field.related_model, kolom + '__', {})
+                    if anak is None:
+                        return None
+                    only |= anak[0]
+                    related |= anak[1]
+                    prefetch |= anak[2]
+    return only, related, prefetch
+
+
+class SparseFieldsetMixin:
+    """?fields= untuk list/retrieve: memangkas serializer dan kolom yang di-query.
+
+    sparse_sources memetakan field yang tidak punya source model (misal
+    SerializerMethodField) ke path ORM yang dibacanya.
+    """
+    sparse_sources = {}
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.request.method in permissions.SAFE_METHODS:
+            terapkan_fields(serializer, self.request)
+        return serializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if getattr(self, 'action', 'list') in ('list', 'retrieve') and fields_diminta(self.request):
+            queryset = self.proyeksikan(queryset)
+        return queryset
+
+    def proyeksikan(self, queryset):
+        kolom = _kolom(self.get_serializer(), queryset.model, '', self.sparse_sources)
+        if kolom is None:
+            return queryset
+        only, related, prefetch = kolom
+
+        lookups = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if (lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup).split('__')[0] in prefetch
+        ]
+        queryset = queryset.select_related(None).prefetch_related(None).prefetch_related(*lookups)
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*only)
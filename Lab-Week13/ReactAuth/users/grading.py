@@ -0,0 +1,126 @@
+# users/grading.py
+"""Pemetaan nilai angka ke nilai huruf untuk banyak nilai sekaligus.
+
+Skala dikompilasi sekali menjadi array batas menaik sehingga satu array
+total cukup dipetakan dengan searchsorted (NumPy) atau bisect. Skala per
+Matakuliah/Jurusan (SkalaNilai) di-cache per proses bersama versi skala yang
+disimpan di cache Django; signal SkalaNilai menaikkan versi itu sehingga
+proses lain (worker WSGI, run_workers) memuat ulang skalanya, asalkan cache
+itu dibagi antarproses (FileBasedCache di settings, bukan LocMemCache).
+"""
+import threading
+import time
+from bisect import bisect_right
+
+from django.core.cache import cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsional, bisect tetap cukup cepat
+    np = None
+
+GRADING_SCALE = [
+    (80, 'A'),
+    (75, 'AB'),
+    (70, 'B'),
+    (65, 'BC'),
+    (60, 'C'),
+    (50, 'D'),
+    (0, 'E'),
+]
+
+# Bobot (grade point) tiap nilai huruf untuk perhitungan IPK.
+BOBOT_HURUF = {
+    'A': 4.0,
+    'AB': 3.5,
+    'B': 3.0,
+    'BC': 2.5,
+    'C': 2.0,
+    'D': 1.0,
+    'E': 0.0,
+}
+
+
+class CompiledScale:
+    __slots__ = ('thresholds', 'letters', '_np_thresholds', '_np_letters')
+
+    def __init__(self, scale):
+        # scale: [(batas, huruf), ...] menurun seperti GRADING_SCALE.
+        ascending = sorted(scale, key=lambda item: item[0])
+        floor_letter = ascending[0][1]
+        self.thresholds = tuple(float(threshold) for threshold, _ in ascending[1:])
+        self.letters = (floor_letter,) + tuple(letter for _, letter in ascending[1:])
+        if np is not None:
+            self._np_thresholds = np.asarray(self.thresholds, dtype=float)
+            self._np_letters = np.asarray(self.letters, dtype=object)
+
+    def letter(self, total):
+        return self.letters[bisect_right(self.thresholds, float(total))]
+
+    def letters_for(self, totals):
+        """Petakan deretan total (Decimal/float) ke list nilai huruf dalam satu panggilan."""
+        if np is None:
+            thresholds, letters = self.thresholds, self.letters
+            return [letters[bisect_right(thresholds, float(total))] for total in totals]
+        values = np.fromiter((float(total) for total in totals), dtype=float)
+        return self._np_letters[np.searchsorted(self._np_thresholds, values, side='right')].tolist()
+
+
+_default = CompiledScale(GRADING_SCALE)
+_lock = threading.Lock()
+# (versi, per_matakuliah, per_jurusan)
+_registry = None
+
+VERSION_KEY = 'skala:versi'
+
+
+def versi_skala():
+    versi = cache.get(VERSION_KEY)
+    if versi is None:
+        # Berbasis waktu seperti versi katalog: tidak mengulang versi lama bila ter-evict.
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        versi = cache.get(VERSION_KEY)
+    return versi
+
+
+def _load_registry():
+    from .models import SkalaNilai
+
+    per_matakuliah, per_jurusan = {}, {}
+    for skala in SkalaNilai.objects.all():
+        compiled = CompiledScale(skala.as_scale())
+        if skala.matakuliah_id:
+            per_matakuliah[skala.matakuliah_id] = compiled
+        else:
+            per_jurusan[skala.jurusan_id] = compiled
+    return per_matakuliah, per_jurusan
+
+
+def _get_registry():
+    global _registry
+    versi = versi_skala()
+    registry = _registry
+    if registry is None or registry[0] != versi:
+        with _lock:
+            if _registry is None or _registry[0] != versi:
+                # Versi dibaca sebelum memuat: perubahan di tengah pemuatan tetap memicu muat ulang.
+                _registry = (versi, *_load_registry())
+            registry = _registry
+    return registry[1:]
+
+
+def invalidate():
+    """Naikkan versi skala bersama; setiap proses memuat ulang pada scale_for berikutnya."""
+    global _registry
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), None)
+    with _lock:
+        _registry = None
+
+
+def scale_for(matakuliah_kode=None, jurusan_kode=None):
+    """Skala Matakuliah, lalu skala Jurusan, lalu skala bawaan."""
+    per_matakuliah, per_jurusan = _get_registry()
+    return per_matakuliah.get(matakuliah_kode) or per_jurusan.get(jurusan_kode) or _default
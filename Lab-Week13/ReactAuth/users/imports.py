@@ -0,0 +1,174 @@
+# users/imports.py
+"""Impor nilai Assessment dari lembar nilai CSV/XLSX.
+
+Format: baris pertama adalah header; kolom pertama ``email`` (atau
+``mahasiswa_id``), kolom berikutnya nama KomponenNilai mata kuliah tersebut
+(misal UTS, UAS, Tugas). Satu baris untuk satu mahasiswa, sel kosong dilewati.
+"""
+import codecs
+import csv
+import time
+import zipfile
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .models import Assessment, KomponenNilai, Matakuliah
+from . import conditional, recompute
+
+CustomUser = get_user_model()
+
+KOLOM_MAHASISWA = ('email', 'mahasiswa_id')
+
+
+def baca_baris(uploaded_file):
+    """Iterasi baris lembar nilai tanpa memuat seluruh berkas ke memori."""
+    nama = (uploaded_file.name or '').lower()
+
+    if nama.endswith('.xlsx'):
+        try:
+            from openpyxl import load_workbook
+            from openpyxl.utils.exceptions import InvalidFileException
+        except ImportError:
+            raise ValueError("Impor XLSX membutuhkan paket openpyxl.")
+        try:
+            workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+        except (zipfile.BadZipFile, InvalidFileException, KeyError):
+            # Bernama .xlsx tetapi bukan workbook (KeyError: zip tanpa bagian workbook).
+            raise ValueError("Format berkas harus .csv atau .xlsx.")
+        try:
+            for row in workbook.active.iter_rows(values_only=True):
+                yield ['' if cell is None else str(cell).strip() for cell in row]
+        finally:
+            workbook.close()
+        return
+
+    if nama.endswith('.csv'):
+        uploaded_file.seek(0)
+        for row in csv.reader(codecs.iterdecode(uploaded_file, 'utf-8-sig')):
+            yield [cell.strip() for cell in row]
+        return
+
+    raise ValueError("Format berkas harus .csv atau .xlsx.")
+
+
+def _parse_nilai(raw):
+    try:
+        nilai = Decimal(str(raw).replace(',', '.'))
+    except InvalidOperation:
+        raise ValueError(f"Nilai '{raw}' bukan angka.")
+    if not nilai.is_finite() or not (0 <= nilai <= 100):
+        raise ValueError(f"Nilai '{raw}' harus antara 0 dan 100.")
+    return nilai.quantize(Decimal('0.01'))
+
+
+def impor_nilai_assessment(matakuliah_kode, rows, chunk_size=1000):
+    """Simpan nilai dari iterable ``rows`` dengan upsert per chunk dalam satu transaksi.
+
+    Mengembalikan (success, result) seperti fungsi di utils.py; error per baris
+    dilaporkan di result['errors'] dan baris yang salah dilewati.
+    """
+    mulai = time.perf_counter()
+
+    if not Matakuliah.objects.filter(kode_mk=matakuliah_kode).exists():
+        return False, "Mata Kuliah tidak ditemukan."
+
+    rows = iter(rows)
+    try:
+        header = next(rows)
+    except StopIteration:
+        return False, "Berkas kosong."
+    except ValueError as e:
+        return False, str(e)
+
+    kolom_id = (header[0] if header else '').lower()
+    if kolom_id not in KOLOM_MAHASISWA:
+        return False, "Kolom pertama harus 'email' atau 'mahasiswa_id'."
+
+    komponen_map = dict(
+        KomponenNilai.objects.filter(matakuliah_id=matakuliah_kode).values_list('nama_komponen', 'id')
+    )
+    kolom_komponen = []
+    for index, nama in enumerate(header[1:], start=1):
+        if not nama:
+            continue
+        if nama not in komponen_map:
+            return False, f"Komponen '{nama}' tidak ada pada mata kuliah {matakuliah_kode}."
+        kolom_komponen.append((index, nama, komponen_map[nama]))
+
+    mahasiswa_qs = CustomUser.objects.filter(role=CustomUser.Role.MAHASISWA)
+    if kolom_id == 'email':
+        mahasiswa_map = {email.lower(): pk for email, pk in mahasiswa_qs.values_list('email', 'id')}
+    else:
+        mahasiswa_map = {str(pk): pk for pk in mahasiswa_qs.values_list('id', flat=True)}
+
+    errors = []
+    baris_diproses = 0
+    nilai_disimpan = 0
+    chunk = {}
+
+    def flush():
+        nonlocal nilai_disimpan
+        Assessment.objects.bulk_create(
+            chunk.values(),
+            batch_size=chunk_size,
+            update_conflicts=True,
+            unique_fields=['mahasiswa', 'komponen'],
+            update_fields=['nilai_angka'],
+        )
+        nilai_disimpan += len(chunk)
+        chunk.clear()
+
+    try:
+        with transaction.atomic():
+            for nomor_baris, row in enumerate(rows, start=2):
+                if not any(row):
+                    continue
+                baris_diproses += 1
+
+                mahasiswa_id = mahasiswa_map.get(row[0].lower())
+                if mahasiswa_id is None:
+                    errors.append({'baris': nomor_baris, 'detail': f"Mahasiswa '{row[0]}' tidak ditemukan."})
+                    continue
+
+                nilai_baris = {}
+                for index, nama, komponen_id in kolom_komponen:
+                    raw = row[index] if index < len(row) else ''
+                    if raw == '':
+                        continue
+                    try:
+                        nilai_baris[komponen_id] = _parse_nilai(raw)
+                    except ValueError as e:
+                        errors.append({'baris': nomor_baris, 'kolom': nama, 'detail': str(e)})
+                        nilai_baris = None
+                        break
+                if not nilai_baris:
+                    continue
+
+                for komponen_id, nilai in nilai_baris.items():
+                    chunk[(mahasiswa_id, komponen_id)] = Assessment(
+                        mahasiswa_id=mahasiswa_id,
+                        komponen_id=komponen_id,
+                        matakuliah_id=matakuliah_kode,
+                        nilai_angka=nilai,
+                    )
+                if len(chunk) >= chunk_size:
+                    flush()
+
+            if chunk:
+                flush()
+            # bulk_create tidak memicu signal, jadi tandai mata kuliahnya secara eksplisit.
+            if nilai_disimpan:
+                recompute.mark_course_dirty(matakuliah_kode)
+                conditional.naikkan_versi('assessment')
+    except ValueError as e:
+        return False, str(e)
+
+    return True, {
+        'matakuliah': matakuliah_kode,
+        'baris_diproses': baris_diproses,
+        'nilai_disimpan': nilai_disimpan,
+        'errors': errors,
+        'durasi_ms': round((time.perf_counter() - mulai) * 1000, 2),
+    }
@@ -0,0 +1,228 @@
+# users/jobs.py
+"""Antrian job latar belakang di database, tanpa broker eksternal.
+
+View memanggil ``enqueue`` yang hanya menyimpan satu baris Job lalu langsung
+menjawab 202. Worker (``manage.py run_workers``) mengambil job dengan UPDATE
+bersyarat ``WHERE id = ? AND status = 'ANTRI'``, jadi satu job hanya pernah
+diambil satu proses, lalu menjalankan fungsi yang didaftarkan dengan
+``@tugas`` dan menulis progres/hasilnya ke baris itu. SQLite mengunci seluruh
+database saat menulis; "database is locked" dianggap sementara dan job
+diantrekan ulang dengan jeda eksponensial sampai ``maks_percobaan``.
+"""
+import os
+import signal
+import socket
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Assessment, Job, NilaiAkhir
+
+JOB_MAKS_PERCOBAAN = getattr(settings, 'JOB_MAKS_PERCOBAAN', 5)
+# Jeda retry pertama (detik); berlipat dua di setiap percobaan berikutnya.
+JOB_RETRY_DELAY = getattr(settings, 'JOB_RETRY_DELAY', 2)
+JOB_EXPORT_DIR = getattr(settings, 'JOB_EXPORT_DIR', os.path.join(settings.BASE_DIR, 'job_exports'))
+
+_TUGAS = {}
+
+
+def tugas(jenis, rahasia=False):
+    """Daftarkan ``func(job, **payload)`` sebagai jenis job.
+
+    rahasia=True: payload (misal password) dikosongkan begitu job selesai atau gagal.
+    """
+    def decorator(func):
+        _TUGAS[jenis] = (func, rahasia)
+        return func
+    return decorator
+
+
+def database_terkunci(exc):
+    return isinstance(exc, OperationalError) and 'database is locked' in str(exc)
+
+
+def _ulangi_bila_terkunci(func, percobaan=5, jeda=0.05):
+    # Untuk tulis status yang kecil: tunggu sebentar daripada menggagalkan job.
+    for i in range(percobaan):
+        try:
+            return func()
+        except OperationalError as e:
+            if not database_terkunci(e) or i == percobaan - 1:
+                raise
+            time.sleep(jeda * 2 ** i)
+
+
+def _simpan(job, **fields):
+    for key, value in fields.items():
+        setattr(job, key, value)
+    _ulangi_bila_terkunci(lambda: Job.objects.filter(pk=job.pk).update(**fields))
+
+
+def enqueue(jenis, payload=None, user=None):
+    if jenis not in _TUGAS:
+        raise ValueError(f"Jenis job '{jenis}' tidak dikenal.")
+    return Job.objects.create(
+        jenis=jenis,
+        payload=payload or {},
+        # request.user bisa berupa ClaimsUser (tanpa query), jadi cukup id-nya.
+        dibuat_oleh_id=user.id if user is not None and user.is_authenticated else None,
+        maks_percobaan=JOB_MAKS_PERCOBAAN,
+    )
+
+
+def laporkan_progres(job, persen):
+    """Simpan progres (0-100); hanya menulis bila angkanya berubah."""
+    persen = max(0, min(100, int(persen)))
+    if persen == job.progres:
+        return
+    job.progres = persen
+    try:
+        _ulangi_bila_terkunci(lambda: Job.objects.filter(pk=job.pk).update(progres=persen))
+    except OperationalError as e:
+        # Progres hanya informasi; jangan gagalkan job karena database sedang sibuk.
+        if not database_terkunci(e):
+            raise
+
+
+def ambil_job(worker):
+    """Klaim satu job yang siap jalan untuk worker ini, atau None."""
+    sekarang = timezone.now()
+    kandidat = list(
+        Job.objects.filter(status=Job.Status.ANTRI, jalan_setelah__lte=sekarang)
+        .order_by('id').values_list('pk', flat=True)[:10]
+    )
+    for pk in kandidat:
+        # Worker lain mungkin lebih dulu; UPDATE bersyarat ini yang menentukan pemenangnya.
+        diambil = Job.objects.filter(pk=pk, status=Job.Status.ANTRI).update(
+            status=Job.Status.BERJALAN, worker=worker, started_at=sekarang,
+            percobaan=F('percobaan') + 1, progres=0,
+        )
+        if diambil:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def jalankan_job(job):
+    func, rahasia = _TUGAS.get(job.jenis, (None, False))
+    bersihkan = {'payload': {}} if rahasia else {}
+    try:
+        if func is None:
+            raise ValueError(f"Jenis job '{job.jenis}' tidak dikenal.")
+        hasil = func(job, **job.payload)
+    except Exception as e:
+        pesan = str(e) or type(e).__name__
+        if database_terkunci(e) and job.percobaan < job.maks_percobaan:
+            jeda = JOB_RETRY_DELAY * 2 ** (job.percobaan - 1)
+            _simpan(job, status=Job.Status.ANTRI, worker='', error=pesan,
+                    jalan_setelah=timezone.now() + timedelta(seconds=jeda))
+        else:
+            _simpan(job, status=Job.Status.GAGAL, error=pesan, finished_at=timezone.now(), **bersihkan)
+        return job
+
+    _simpan(job, status=Job.Status.SELESAI, hasil=hasil, error='', progres=100,
+            finished_at=timezone.now(), **bersihkan)
+    return job
+
+
+def antrekan_ulang_macet(batas_detik):
+    """Job BERJALAN lebih lama dari batas_detik (worker-nya mati) dikembalikan ke antrian."""
+    sekarang = timezone.now()
+    macet = Job.objects.filter(status=Job.Status.BERJALAN, started_at__lt=sekarang - timedelta(seconds=batas_detik))
+    habis = macet.filter(percobaan__gte=F('maks_percobaan'))
+    # Job rahasia yang gagal tidak akan dijalankan lagi; payload-nya jangan tertinggal.
+    habis.filter(jenis__in=[jenis for jenis, (_, rahasia) in _TUGAS.items() if rahasia]).update(payload={})
+    gagal = habis.update(
+        status=Job.Status.GAGAL, error="Worker berhenti sebelum job selesai.", finished_at=sekarang
+    )
+    ulang = macet.update(status=Job.Status.ANTRI, worker='', jalan_setelah=sekarang)
+    return ulang, gagal
+
+
+def proses_antrian(worker=None, poll=1.0, burst=False, berhenti=None):
+    """Jalankan job satu per satu sampai `berhenti` di-set (atau antrian kosong bila burst)."""
+    worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+    jumlah = 0
+    while berhenti is None or not berhenti.is_set():
+        close_old_connections()
+        try:
+            job = ambil_job(worker)
+        except OperationalError as e:
+            if not database_terkunci(e):
+                raise
+            job = None
+        if job is None:
+            if burst:
+                break
+            if berhenti is not None:
+                berhenti.wait(poll)
+            else:
+                time.sleep(poll)
+            continue
+        jalankan_job(job)
+        jumlah += 1
+    return jumlah
+
+
+def jalankan_worker(settings_module, nama, poll, burst, berhenti):
+    """Entry point proses worker run_workers."""
+    from .cohort import _init_worker
+    _init_worker(settings_module)
+    # Ctrl+C sampai ke seluruh process group; biarkan induk yang memberi aba-aba
+    # lewat `berhenti` supaya job yang sedang jalan selesai dulu.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: berhenti.set())
+    proses_antrian(f'{socket.gethostname()}:{nama}:{os.getpid()}', poll, burst, berhenti)
+
+
+def berkas_ekspor(job):
+    """Path berkas hasil job ekspor yang sudah selesai, atau None."""
+    if job.jenis != 'ekspor' or job.status != Job.Status.SELESAI or not job.hasil:
+        return None
+    path = os.path.join(JOB_EXPORT_DIR, os.path.basename(job.hasil['berkas']))
+    return path if os.path.exists(path) else None
+
+
+@tugas('hitung_nilai_matakuliah')
+def _hitung_nilai_matakuliah(job, matakuliah_kode):
+    from .utils import hitung_nilai_akhir_matakuliah
+    success, result = hitung_nilai_akhir_matakuliah(matakuliah_kode)
+    if not success:
+        raise ValueError(result)
+    return result
+
+
+@tugas('registrasi_angkatan', rahasia=True)
+def _registrasi_angkatan(job, users, password_default=None):
+    from .cohort import daftarkan_angkatan
+    success, result = daftarkan_angkatan(users, password_default=password_default)
+    if not success:
+        raise ValueError(result)
+    return result
+
+
+SUMBER_EKSPOR = {'assessment': Assessment, 'nilai_akhir': NilaiAkhir}
+
+
+@tugas('ekspor')
+def _ekspor(job, sumber, tipe='csv', filter=None):
+    from .exports import KOLOM_EKSPOR, tulis_ekspor
+
+    fields, kolom = KOLOM_EKSPOR[sumber]
+    queryset = SUMBER_EKSPOR[sumber].objects.filter(**(filter or {}))
+
+    os.makedirs(JOB_EXPORT_DIR, exist_ok=True)
+    nama = f'{sumber}-{job.pk}.{tipe}'
+    path = os.path.join(JOB_EXPORT_DIR, nama)
+    # Tulis ke berkas sementara dulu supaya download tidak pernah melihat berkas setengah jadi.
+    with open(path + '.tmp', 'w', newline='', encoding='utf-8') as f:
+        jumlah = tulis_ekspor(
+            queryset, fields, f, tipe=tipe, kolom=kolom,
+            # 100 baru ditulis saat job SELESAI.
+            progres=lambda selesai, total: laporkan_progres(job, min(99, selesai * 100 // total) if total else 99),
+        )
+    os.replace(path + '.tmp', path)
+    return {'berkas': nama, 'tipe': tipe, 'jumlah_baris': jumlah}
@@ -0,0 +1,267 @@
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.db import connection
+from users.models import CustomUser, Matakuliah, NilaiAkhir
+
+# Bobot default campuran request; bisa diganti lewat --mix.
+MIX_DEFAULT = 'login=1,matakuliah=3,assessment=3,calculate=1,transkrip=2,ringkasan=2'
+OPERASI = ('login', 'matakuliah', 'assessment', 'calculate', 'transkrip', 'ringkasan', 'dashboard')
+
+# Path endpoint baca; --async-routes memakai versi async (users/async_views.py).
+PATH_SYNC = {
+    'matakuliah': '/api/academic/matakuliah/',
+    'transkrip': '/api/academic/nilai-akhir/',
+    'dashboard': '/api/academic/dashboard/',
+}
+PATH_ASYNC = {
+    'matakuliah': '/api/academic/async/matakuliah/',
+    'transkrip': '/api/academic/async/transkrip/',
+    'dashboard': '/api/academic/async/dashboard/',
+}
+
+
+class QueryCountingApp:
+    """Bungkus aplikasi WSGI dan kirim jumlah query SQL per request lewat header X-Query-Count."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        jumlah = [0]
+
+        def hitung(execute, sql, params, many, context):
+            jumlah[0] += 1
+            return execute(sql, params, many, context)
+
+        def start(status, headers, exc_info=None):
+            return start_response(status, headers + [('X-Query-Count', str(jumlah[0]))], exc_info)
+
+        with connection.execute_wrapper(hitung):
+            return self.app(environ, start)
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def persentil(data, p):
+    if not data:
+        return None
+    index = min(len(data) - 1, max(0, round(p / 100 * len(data) + 0.5) - 1))
+    return round(data[index], 2)
+
+
+def ringkas(hasil, durasi):
+    latensi = sorted(r[1] for r in hasil)
+    queries = [r[3] for r in hasil if r[3] is not None]
+    return {
+        'requests': len(hasil),
+        'errors': sum(1 for r in hasil if r[2] >= 400 or r[2] == 0),
+        'rps': round(len(hasil) / durasi, 2) if durasi else None,
+        'latency_ms': {
+            'p50': persentil(latensi, 50),
+            'p95': persentil(latensi, 95),
+            'p99': persentil(latensi, 99),
+            'mean': round(sum(latensi) / len(latensi), 2) if latensi else None,
+        },
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark latensi dan throughput API /api/academic terhadap database yang sudah di-seed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', default='1,4,8', help='Daftar level konkurensi, misal 1,4,16.')
+        parser.add_argument('--duration', type=float, default=10.0, help='Detik per level konkurensi.')
+        parser.add_argument('--warmup', type=float, default=1.0, help='Detik pemanasan sebelum tiap level.')
+        parser.add_argument('--mix', default=MIX_DEFAULT, help='Bobot operasi, format nama=bobot,...')
+        parser.add_argument('--password', default='password123', help='Password user hasil seed_synthetic.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--base-url', help='Uji server yang sudah berjalan (tanpa hitungan query).')
+        parser.add_argument('--output', help='Tulis hasil JSON ke berkas ini.')
+        parser.add_argument(
+            '--async-routes', action='store_true',
+            help='Pakai endpoint baca async (matakuliah, transkrip, dashboard); untuk server ASGI.'
+        )
+
+    def handle(self, *args, **options):
+        self.mix = self.parse_mix(options['mix'])
+        self.password = options['password']
+        self.seed = options['seed']
+        self.paths = PATH_ASYNC if options['async_routes'] else PATH_SYNC
+        try:
+            levels = [int(c) for c in options['concurrency'].split(',') if c.strip()]
+        except ValueError:
+            raise CommandError("--concurrency harus berupa daftar angka, misal 1,4,16.")
+
+        self.load_fixtures()
+
+        server = None
+        base_url = options['base_url']
+        if not base_url:
+            server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler, allow_reuse_address=False)
+            server.set_app(QueryCountingApp(get_internal_wsgi_application()))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f'http://127.0.0.1:{server.server_port}'
+        self.base_url = base_url.rstrip('/')
+
+        try:
+            hasil = {
+                'base_url': self.base_url,
+                'debug': settings.DEBUG,
+                'database': settings.DATABASES['default']['ENGINE'],
+                'mix': self.mix,
+                'async_routes': options['async_routes'],
+                'duration_s': options['duration'],
+                'levels': [],
+            }
+            for concurrency in levels:
+                self.stderr.write(f"Level konkurensi {concurrency}...")
+                if options['warmup']:
+                    self.run_level(concurrency, options['warmup'])
+                hasil['levels'].append(self.run_level(concurrency, options['duration']))
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+
+        output = json.dumps(hasil, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Hasil ditulis ke {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def parse_mix(self, raw):
+        mix = {}
+        for bagian in raw.split(','):
+            nama, _, bobot = bagian.partition('=')
+            nama = nama.strip()
+            if nama not in OPERASI:
+                raise CommandError(f"Operasi '{nama}' tidak dikenal. Pilihan: {', '.join(OPERASI)}.")
+            try:
+                mix[nama] = float(bobot or 1)
+            except ValueError:
+                raise CommandError(f"Bobot '{bobot}' untuk {nama} bukan angka.")
+        if not any(mix.values()):
+            raise CommandError("--mix tidak boleh kosong.")
+        return mix
+
+    def load_fixtures(self):
+        """Ambil sampel dosen, mahasiswa, mata kuliah dan pasangan nilai dari database."""
+        rng = random.Random(self.seed)
+        self.dosen = list(
+            CustomUser.objects.filter(role=CustomUser.Role.DOSEN).order_by('id').values_list('email', flat=True)[:200]
+        )
+        self.mahasiswa = list(
+            CustomUser.objects.filter(role=CustomUser.Role.MAHASISWA, transkrip__isnull=False)
+            .distinct().order_by('id').values_list('email', flat=True)[:2000]
+        )
+        self.matakuliah = list(Matakuliah.objects.order_by('kode_mk').values_list('kode_mk', flat=True)[:2000])
+        pasangan = list(NilaiAkhir.objects.order_by('id').values_list('mahasiswa_id', 'matakuliah_id')[:20000])
+        self.pasangan = rng.sample(pasangan, min(len(pasangan), 2000))
+
+        if not (self.dosen and self.mahasiswa and self.matakuliah and self.pasangan):
+            raise CommandError("Database belum berisi data. Jalankan 'manage.py seed_synthetic' terlebih dahulu.")
+
+    def request(self, method, path, token=None, data=None):
+        body = json.dumps(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        req.add_header('Content-Type', 'application/json')
+        if token:
+            req.add_header('Authorization', f'Bearer {token}')
+
+        mulai = time.perf_counter()
+        try:
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                payload = resp.read()
+                status, headers = resp.status, resp.headers
+        except urllib.error.HTTPError as e:
+            payload = e.read()
+            status, headers = e.code, e.headers
+        except OSError:
+            return (time.perf_counter() - mulai) * 1000, 0, None, None
+        latensi = (time.perf_counter() - mulai) * 1000
+
+        queries = headers.get('X-Query-Count')
+        return latensi, status, int(queries) if queries is not None else None, payload
+
+    def login(self, email):
+        _, status, _, payload = self.request('POST', '/api/auth/login/', data={'email': email, 'password': self.password})
+        if status != 200:
+            raise CommandError(f"Login {email} gagal ({status}). Periksa --password.")
+        return json.loads(payload)['access']
+
+    def run_level(self, concurrency, durasi):
+        hasil = []
+        lock = threading.Lock()
+        errors = []
+        berhenti = time.perf_counter() + durasi
+        nama_operasi, bobot = zip(*self.mix.items())
+
+        def worker(index):
+            rng = random.Random(self.seed * 1000 + index)
+            try:
+                token_dosen = self.login(rng.choice(self.dosen))
+                token_mahasiswa = self.login(rng.choice(self.mahasiswa))
+            except CommandError as e:
+                errors.append(str(e))
+                return
+
+            lokal = []
+            while time.perf_counter() < berhenti:
+                operasi = rng.choices(nama_operasi, bobot)[0]
+                if operasi == 'login':
+                    email = rng.choice(self.dosen + self.mahasiswa[:len(self.dosen)])
+                    r = self.request('POST', '/api/auth/login/', data={'email': email, 'password': self.password})
+                elif operasi == 'matakuliah':
+                    r = self.request('GET', self.paths['matakuliah'], token_dosen)
+                elif operasi == 'assessment':
+                    kode = rng.choice(self.matakuliah)
+                    r = self.request('GET', f'/api/academic/assessment/?matakuliah_kode_mk={kode}', token_dosen)
+                elif operasi == 'calculate':
+                    mahasiswa_id, kode = rng.choice(self.pasangan)
+                    r = self.request(
+                        'POST', '/api/academic/nilai-akhir/calculate_final_score/', token_dosen,
+                        {'mahasiswa_id': mahasiswa_id, 'matakuliah_kode': kode},
+                    )
+                elif operasi == 'transkrip':
+                    r = self.request('GET', self.paths['transkrip'], token_mahasiswa)
+                elif operasi == 'dashboard':
+                    token = token_dosen if rng.random() < 0.5 else token_mahasiswa
+                    r = self.request('GET', self.paths['dashboard'], token)
+                else:
+                    r = self.request('GET', '/api/academic/nilai-akhir/summary/', token_mahasiswa)
+                lokal.append((operasi, r[0], r[1], r[2]))
+
+            with lock:
+                hasil.extend(lokal)
+
+        mulai = time.perf_counter()
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        durasi_aktual = time.perf_counter() - mulai
+
+        if errors:
+            raise CommandError(errors[0])
+
+        level = {'concurrency': concurrency, **ringkas(hasil, durasi_aktual), 'per_operasi': {}}
+        for operasi in self.mix:
+            subset = [r for r in hasil if r[0] == operasi]
+            if subset:
+                level['per_operasi'][operasi] = ringkas(subset, durasi_aktual)
+        return level
@@ -0,0 +1,77 @@
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+# Hanya endpoint baca yang punya versi async.
+MIX_BACA = 'matakuliah=1,transkrip=1,dashboard=1'
+
+
+class Command(BaseCommand):
+    help = (
+        'Bandingkan throughput endpoint baca di deployment WSGI dan ASGI pada banyak koneksi bersamaan. '
+        'Jalankan server ASGI lebih dulu, misal: uvicorn ReactAuth.asgi:application --port 8001'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--asgi-url', required=True, help='Base URL server ASGI (endpoint async dipakai).')
+        parser.add_argument(
+            '--wsgi-url',
+            help='Base URL server WSGI, misal gunicorn ReactAuth.wsgi. Kosong: server WSGI in-process bench_api.'
+        )
+        parser.add_argument('--concurrency', default='8,32,64', help='Daftar jumlah koneksi bersamaan.')
+        parser.add_argument('--duration', type=float, default=10.0)
+        parser.add_argument('--warmup', type=float, default=1.0)
+        parser.add_argument('--mix', default=MIX_BACA)
+        parser.add_argument('--password', default='password123')
+        parser.add_argument('--output', help='Tulis hasil JSON ke berkas ini.')
+
+    def jalankan(self, base_url, async_routes, options):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            call_command(
+                'bench_api',
+                base_url=base_url,
+                async_routes=async_routes,
+                concurrency=options['concurrency'],
+                duration=options['duration'],
+                warmup=options['warmup'],
+                mix=options['mix'],
+                password=options['password'],
+                output=path,
+                stderr=self.stderr,
+            )
+            with open(path) as f:
+                return json.load(f)
+        finally:
+            os.remove(path)
+
+    def handle(self, *args, **options):
+        self.stderr.write("WSGI (endpoint sync)...")
+        wsgi = self.jalankan(options['wsgi_url'], False, options)
+        self.stderr.write("ASGI (endpoint async)...")
+        asgi = self.jalankan(options['asgi_url'], True, options)
+
+        perbandingan = []
+        for w, a in zip(wsgi['levels'], asgi['levels']):
+            perbandingan.append({
+                'concurrency': w['concurrency'],
+                'wsgi_rps': w['rps'],
+                'asgi_rps': a['rps'],
+                'rasio_rps': round(a['rps'] / w['rps'], 2) if w['rps'] else None,
+                'wsgi_p95_ms': w['latency_ms']['p95'],
+                'asgi_p95_ms': a['latency_ms']['p95'],
+                'wsgi_errors': w['errors'],
+                'asgi_errors': a['errors'],
+            })
+
+        output = json.dumps({'perbandingan': perbandingan, 'wsgi': wsgi, 'asgi': asgi}, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Hasil ditulis ke {options['output']}"))
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,39 @@
+import csv
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from users.cohort import daftarkan_angkatan
+
+
+class Command(BaseCommand):
+    help = 'Mendaftarkan satu angkatan dari CSV (kolom: email, full_name, major, role, password).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--password', help='Password default untuk baris tanpa kolom password.')
+        parser.add_argument('--workers', type=int, help='Jumlah proses hashing (default: semua inti CPU).')
+        parser.add_argument('--report', help='Tulis hasil per baris sebagai JSON ke berkas ini.')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8-sig') as f:
+                rows = list(csv.DictReader(f))
+        except OSError as e:
+            raise CommandError(f"Tidak bisa membaca {options['csv_path']}: {e}")
+
+        success, result = daftarkan_angkatan(rows, password_default=options['password'], workers=options['workers'])
+        if not success:
+            raise CommandError(result)
+
+        for item in result['hasil']:
+            if item['status'] == 'gagal':
+                detail = '; '.join(f"{field}: {pesan}" for field, pesan in item['errors'].items())
+                self.stdout.write(self.style.WARNING(f"  Baris {item['baris']} ({item['email'] or '-'}): {detail}"))
+
+        if options['report']:
+            with open(options['report'], 'w') as f:
+                json.dump(result, f, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['dibuat']} user dibuat, {result['gagal']} gagal dalam {result['durasi_ms'] / 1000:.1f} detik."
+        ))
@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from users.jobs import antrekan_ulang_macet, jalankan_worker, proses_antrian
+
+
+class Command(BaseCommand):
+    help = 'Menjalankan worker antrian job di database; setiap worker adalah proses terpisah.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=getattr(settings, 'JOB_WORKERS', None),
+            help='Jumlah proses worker (default: JOB_WORKERS atau semua inti CPU).'
+        )
+        parser.add_argument('--poll', type=float, default=1.0, help='Detik menunggu saat antrian kosong.')
+        parser.add_argument('--burst', action='store_true', help='Berhenti begitu antrian kosong.')
+        parser.add_argument(
+            '--stale-after', type=int, default=getattr(settings, 'JOB_STALE_AFTER', 60 * 60),
+            help='Job BERJALAN lebih lama dari ini (detik) dianggap worker-nya mati dan diantrekan ulang.'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or os.cpu_count() or 1
+        if workers < 1:
+            raise CommandError("--workers minimal 1.")
+        if settings.CACHES['default']['BACKEND'] == 'django.core.cache.backends.locmem.LocMemCache':
+            # Versi skala nilai, katalog, ETag dan statistik tidak akan sampai ke proses web.
+            raise CommandError("run_workers butuh cache yang dibagi antarproses (misal FileBasedCache), bukan LocMemCache.")
+
+        ulang, gagal = antrekan_ulang_macet(options['stale_after'])
+        if ulang or gagal:
+            self.stdout.write(self.style.WARNING(f"{ulang} job macet diantrekan ulang, {gagal} ditandai gagal."))
+
+        if workers == 1:
+            berhenti = threading.Event()
+            signal.signal(signal.SIGTERM, lambda *_: berhenti.set())
+            try:
+                jumlah = proses_antrian(poll=options['poll'], burst=options['burst'], berhenti=berhenti)
+            except KeyboardInterrupt:
+                return
+            self.stdout.write(self.style.SUCCESS(f"{jumlah} job diproses."))
+            return
+
+        # Koneksi SQLite tidak boleh dipakai bersama lintas fork.
+        connections.close_all()
+        berhenti = multiprocessing.Event()
+        settings_module = os.environ.get('DJANGO_SETTINGS_MODULE', 'ReactAuth.settings')
+        # Bukan daemon: job registrasi angkatan membuat process pool sendiri untuk hashing.
+        proses = [
+            multiprocessing.Process(
+                target=jalankan_worker,
+                args=(settings_module, f'worker-{i}', options['poll'], options['burst'], berhenti),
+                name=f'worker-{i}',
+            )
+            for i in range(workers)
+        ]
+        for p in proses:
+            p.start()
+        self.stdout.write(f"{workers} worker berjalan (Ctrl+C untuk berhenti setelah job yang sedang jalan).")
+
+        signal.signal(signal.SIGTERM, lambda *_: berhenti.set())
+        try:
+            for p in proses:
+                p.join()
+        except KeyboardInterrupt:
+            berhenti.set()
+            for p in proses:
+                p.join()
+        self.stdout.write(self.style.SUCCESS("Semua worker berhenti."))
@@ -0,0 +1,161 @@
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from users.models import Jurusan, Matakuliah, KomponenNilai, Assessment, CustomUser
+from users import conditional
+from users.utils import hitung_ulang_nilai_akhir
+
+NAMA_DEPAN = [
+    'Adi', 'Ayu', 'Bagus', 'Citra', 'Dewi', 'Eka', 'Fajar', 'Gita', 'Hadi', 'Indah',
+    'Joko', 'Kadek', 'Lestari', 'Made', 'Nadia', 'Putu', 'Rizky', 'Sari', 'Tono', 'Wayan',
+]
+NAMA_BELAKANG = [
+    'Astawa', 'Budiman', 'Pratama', 'Santoso', 'Wijaya', 'Saputra', 'Kusuma', 'Hidayat',
+    'Nugroho', 'Permana', 'Setiawan', 'Utami', 'Wibowo', 'Yulianti', 'Gunawan', 'Lestari',
+]
+NAMA_KOMPONEN = [kode for kode, _ in KomponenNilai.NAMA_KOMPONEN_CHOICES]
+
+
+class Command(BaseCommand):
+    help = 'Membuat data kampus sintetis (deterministik dari --seed) untuk load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--jurusan', type=int, default=10)
+        parser.add_argument('--dosen', type=int, default=50)
+        parser.add_argument('--mahasiswa', type=int, default=2000)
+        parser.add_argument('--matakuliah', type=int, default=100)
+        parser.add_argument('--komponen', type=int, default=4, help='Komponen nilai per mata kuliah (maks 5).')
+        parser.add_argument('--mahasiswa-per-mk', type=int, default=40)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--password', default='password123', help='Password bersama semua user sintetis.')
+        parser.add_argument('--tanpa-nilai-akhir', action='store_true', help='Lewati perhitungan NilaiAkhir.')
+
+    def handle(self, *args, **options):
+        if not 1 <= options['komponen'] <= len(NAMA_KOMPONEN):
+            raise CommandError(f"--komponen harus antara 1 dan {len(NAMA_KOMPONEN)}.")
+        if options['mahasiswa_per_mk'] > options['mahasiswa']:
+            raise CommandError("--mahasiswa-per-mk tidak boleh melebihi --mahasiswa.")
+        if Jurusan.objects.filter(kode__startswith='SJ').exists():
+            raise CommandError("Data sintetis sudah ada. Gunakan database yang bersih.")
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        mulai = time.perf_counter()
+
+        # Satu hash PBKDF2 dipakai bersama; hashing per user adalah bagian termahal.
+        password_hash = make_password(options['password'])
+
+        with transaction.atomic():
+            jurusan_kodes = self.seed_jurusan(options['jurusan'])
+            dosen_ids = self.seed_users('dosen', CustomUser.Role.DOSEN, options['dosen'], jurusan_kodes, password_hash)
+            mahasiswa_ids = self.seed_users('mhs', CustomUser.Role.MAHASISWA, options['mahasiswa'], jurusan_kodes, password_hash)
+            matakuliah_kodes = self.seed_matakuliah(options['matakuliah'], jurusan_kodes, dosen_ids)
+            jumlah_assessment = self.seed_assessment(
+                matakuliah_kodes, mahasiswa_ids, options['komponen'], options['mahasiswa_per_mk']
+            )
+            conditional.naikkan_versi('komponen', 'assessment')
+
+            if not options['tanpa_nilai_akhir']:
+                self.stdout.write("Menghitung NilaiAkhir...")
+                for start in range(0, len(matakuliah_kodes), 50):
+                    hitung_ulang_nilai_akhir(matakuliah_kodes=matakuliah_kodes[start:start + 50], batch_size=self.batch_size)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Selesai dalam {time.perf_counter() - mulai:.1f} detik: {len(jurusan_kodes)} jurusan, "
+            f"{len(dosen_ids)} dosen, {len(mahasiswa_ids)} mahasiswa, {len(matakuliah_kodes)} mata kuliah, "
+            f"{jumlah_assessment} assessment."
+        ))
+
+    def seed_jurusan(self, jumlah):
+        jurusan = [Jurusan(kode=f'SJ{i:04d}', nama=f'Jurusan Sintetis {i}') for i in range(jumlah)]
+        Jurusan.objects.bulk_create(jurusan, batch_size=self.batch_size)
+        self.stdout.write(f"  + {jumlah} jurusan")
+        return [j.kode for j in jurusan]
+
+    def seed_users(self, prefix, role, jumlah, jurusan_kodes, password_hash):
+        domain = 'student.prasetiyamulya.ac.id' if role == CustomUser.Role.MAHASISWA else 'prasetiyamulya.ac.id'
+        for start in range(0, jumlah, self.batch_size):
+            CustomUser.objects.bulk_create([
+                CustomUser(
+                    email=f'syn.{prefix}{i:07d}@{domain}',
+                    full_name=f"{self.rng.choice(NAMA_DEPAN)} {self.rng.choice(NAMA_BELAKANG)}",
+                    role=role,
+                    major_id=self.rng.choice(jurusan_kodes),
+                    password=password_hash,
+                )
+                for i in range(start, min(start + self.batch_size, jumlah))
+            ])
+        self.stdout.write(f"  + {jumlah} {prefix}")
+        return list(
+            CustomUser.objects.filter(email__startswith=f'syn.{prefix}', role=role)
+            .order_by('id').values_list('id', flat=True)
+        )
+
+    def seed_matakuliah(self, jumlah, jurusan_kodes, dosen_ids):
+        matakuliah = [
+            Matakuliah(
+                kode_mk=f'SM{i:06d}',
+                nama_mk=f'Mata Kuliah Sintetis {i}',
+                sks=self.rng.choice((2, 3, 3, 4)),
+                jurusan_id=self.rng.choice(jurusan_kodes),
+            )
+            for i in range(jumlah)
+        ]
+        Matakuliah.objects.bulk_create(matakuliah, batch_size=self.batch_size)
+
+        if dosen_ids:
+            Pengajar = Matakuliah.pengajar.through
+            Pengajar.objects.bulk_create([
+                Pengajar(matakuliah_id=mk.kode_mk, customuser_id=dosen_id)
+                for mk in matakuliah
+                for dosen_id in self.rng.sample(dosen_ids, min(2, len(dosen_ids)))
+            ], batch_size=self.batch_size)
+        self.stdout.write(f"  + {jumlah} mata kuliah")
+        return [mk.kode_mk for mk in matakuliah]
+
+    def seed_komponen(self, matakuliah_kodes, per_mk):
+        komponen = []
+        for kode in matakuliah_kodes:
+            porsi = [self.rng.randint(1, 4) for _ in range(per_mk)]
+            bobot = [Decimal(100 * p // sum(porsi)) for p in porsi]
+            bobot[-1] += Decimal(100) - sum(bobot)
+            komponen.extend(
+                KomponenNilai(matakuliah_id=kode, nama_komponen=nama, bobot_persen=b)
+                for nama, b in zip(self.rng.sample(NAMA_KOMPONEN, per_mk), bobot)
+            )
+        KomponenNilai.objects.bulk_create(komponen, batch_size=self.batch_size)
+
+        per_matakuliah = {}
+        for pk, kode in KomponenNilai.objects.filter(matakuliah_id__in=matakuliah_kodes).values_list('pk', 'matakuliah_id'):
+            per_matakuliah.setdefault(kode, []).append(pk)
+        return per_matakuliah
+
+    def seed_assessment(self, matakuliah_kodes, mahasiswa_ids, per_mk, mahasiswa_per_mk):
+        komponen = self.seed_komponen(matakuliah_kodes, per_mk)
+        # Kemampuan dasar tiap mahasiswa supaya sebaran nilainya realistis.
+        kemampuan = {pk: self.rng.gauss(72, 10) for pk in mahasiswa_ids}
+
+        batch, jumlah = [], 0
+        for kode in matakuliah_kodes:
+            for mahasiswa_id in self.rng.sample(mahasiswa_ids, mahasiswa_per_mk):
+                for komponen_id in komponen[kode]:
+                    nilai = min(100.0, max(0.0, self.rng.gauss(kemampuan[mahasiswa_id], 8)))
+                    batch.append(Assessment(
+                        mahasiswa_id=mahasiswa_id, komponen_id=komponen_id, matakuliah_id=kode,
+                        nilai_angka=Decimal(f'{nilai:.2f}'),
+                    ))
+            if len(batch) >= self.batch_size:
+                Assessment.objects.bulk_create(batch, batch_size=self.batch_size)
+                jumlah += len(batch)
+                batch = []
+                self.stdout.write(f"  ... {jumlah} assessment", ending='\r')
+        if batch:
+            Assessment.objects.bulk_create(batch, batch_size=self.batch_size)
+            jumlah += len(batch)
+        self.stdout.write(f"  + {jumlah} assessment")
+        return jumlah
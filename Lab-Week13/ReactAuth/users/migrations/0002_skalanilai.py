@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:45
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkalaNilai',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('batas_a', models.DecimalField(decimal_places=2, default=Decimal('80.00'), max_digits=5)),
+                ('batas_ab', models.DecimalField(decimal_places=2, default=Decimal('75.00'), max_digits=5)),
+                ('batas_b', models.DecimalField(decimal_places=2, default=Decimal('70.00'), max_digits=5)),
+                ('batas_bc', models.DecimalField(decimal_places=2, default=Decimal('65.00'), max_digits=5)),
+                ('batas_c', models.DecimalField(decimal_places=2, default=Decimal('60.00'), max_digits=5)),
+                ('batas_d', models.DecimalField(decimal_places=2, default=Decimal('50.00'), max_digits=5)),
+                ('jurusan', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='skala_nilai', to='users.jurusan')),
+                ('matakuliah', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='skala_nilai', to='users.matakuliah')),
+            ],
+            options={
+                'verbose_name_plural': 'Skala Nilai',
+                'constraints': [models.CheckConstraint(condition=models.Q(models.Q(('jurusan__isnull', False), ('matakuliah__isnull', True)), models.Q(('jurusan__isnull', True), ('matakuliah__isnull', False)), _connector='OR'), name='skala_nilai_satu_pemilik')],
+            },
+        ),
+    ]
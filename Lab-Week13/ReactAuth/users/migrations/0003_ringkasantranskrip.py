@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:46
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_skalanilai'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RingkasanTranskrip',
+            fields=[
+                ('mahasiswa', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ringkasan_transkrip', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('jumlah_matakuliah', models.PositiveIntegerField(default=0)),
+                ('total_sks', models.PositiveIntegerField(default=0)),
+                ('total_bobot', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=8)),
+                ('ipk', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=3)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Ringkasan Transkrip',
+            },
+        ),
+    ]
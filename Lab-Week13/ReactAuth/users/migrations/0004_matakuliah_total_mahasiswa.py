@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:55
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def isi_total_mahasiswa(apps, schema_editor):
+    Matakuliah = apps.get_model('users', 'Matakuliah')
+    NilaiAkhir = apps.get_model('users', 'NilaiAkhir')
+    jumlah = (
+        NilaiAkhir.objects.filter(matakuliah=OuterRef('pk'))
+        .order_by()
+        .values('matakuliah')
+        .annotate(jumlah=Count('id'))
+        .values('jumlah')
+    )
+    Matakuliah.objects.update(total_mahasiswa=Coalesce(Subquery(jumlah), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_ringkasantranskrip'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matakuliah',
+            name='total_mahasiswa',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(isi_total_mahasiswa, migrations.RunPython.noop),
+    ]
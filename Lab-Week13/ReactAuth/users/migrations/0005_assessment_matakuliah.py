@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 5000
+
+
+def isi_matakuliah_assessment(apps, schema_editor):
+    Assessment = apps.get_model('users', 'Assessment')
+    KomponenNilai = apps.get_model('users', 'KomponenNilai')
+    matakuliah = KomponenNilai.objects.filter(pk=OuterRef('komponen_id')).values('matakuliah_id')[:1]
+
+    # Per rentang id supaya tiap UPDATE (dan lock tabelnya) tetap pendek.
+    ids = Assessment.objects.order_by('pk').values_list('pk', flat=True)
+    mulai = ids.first()
+    while mulai is not None:
+        akhir = ids.filter(pk__gte=mulai)[BATCH_SIZE - 1:BATCH_SIZE].first()
+        batch = Assessment.objects.filter(pk__gte=mulai)
+        if akhir is not None:
+            batch = batch.filter(pk__lte=akhir)
+        batch.update(matakuliah_id=Subquery(matakuliah))
+        mulai = ids.filter(pk__gt=akhir).first() if akhir is not None else None
+
+
+class Migration(migrations.Migration):
+    # Tanpa transaksi pembungkus: setiap batch UPDATE di-commit sendiri dan
+    # melepas write lock SQLite, bukan menahannya sampai migrasi selesai.
+    atomic = False
+
+    dependencies = [
+        ('users', '0004_matakuliah_total_mahasiswa'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessment',
+            name='matakuliah',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='assessment_scores', to='users.matakuliah'),
+        ),
+        migrations.RunPython(isi_matakuliah_assessment, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='assessment',
+            name='matakuliah',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='assessment_scores', to='users.matakuliah'),
+        ),
+        migrations.AddIndex(
+            model_name='assessment',
+            index=models.Index(fields=['matakuliah', 'mahasiswa'], name='assessment_mk_mahasiswa_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_customuser_token_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='nilaiakhir',
+            index=models.Index(fields=['matakuliah', 'nilai_total'], name='nilaiakhir_mk_total_idx'),
+        ),
+    ]
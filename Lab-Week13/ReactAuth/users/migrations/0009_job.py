@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_nilaiakhir_mk_total_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jenis', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('ANTRI', 'Antri'), ('BERJALAN', 'Berjalan'), ('SELESAI', 'Selesai'), ('GAGAL', 'Gagal')], default='ANTRI', max_length=10)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('hasil', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('progres', models.PositiveSmallIntegerField(default=0, help_text='Persen (0-100)')),
+                ('percobaan', models.PositiveSmallIntegerField(default=0)),
+                ('maks_percobaan', models.PositiveSmallIntegerField(default=5)),
+                ('jalan_setelah', models.DateTimeField(default=django.utils.timezone.now)),
+                ('worker', models.CharField(blank=True, max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('dibuat_oleh', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Job',
+                'indexes': [models.Index(fields=['status', 'jalan_setelah'], name='job_antrian_idx')],
+            },
+        ),
+    ]
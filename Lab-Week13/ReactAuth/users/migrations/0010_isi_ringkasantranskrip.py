@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Case, Count, DecimalField, F, Sum, Value, When
+
+BATCH_SIZE = 1000
+
+# Salinan grading.BOBOT_HURUF saat migrasi ini ditulis.
+BOBOT_HURUF = {'A': 4.0, 'AB': 3.5, 'B': 3.0, 'BC': 2.5, 'C': 2.0, 'D': 1.0, 'E': 0.0}
+
+
+def isi_ringkasan_transkrip(apps, schema_editor):
+    NilaiAkhir = apps.get_model('users', 'NilaiAkhir')
+    RingkasanTranskrip = apps.get_model('users', 'RingkasanTranskrip')
+    bobot_huruf = Case(
+        *[When(nilai_huruf=huruf, then=Value(Decimal(str(bobot)))) for huruf, bobot in BOBOT_HURUF.items()],
+        default=Value(Decimal('0')),
+        output_field=DecimalField(max_digits=3, decimal_places=2),
+    )
+
+    # Mahasiswa lama belum punya ringkasan; sebelumnya baru dibuat saat pertama diminta.
+    mahasiswa_ids = sorted(set(NilaiAkhir.objects.values_list('mahasiswa_id', flat=True)))
+    for start in range(0, len(mahasiswa_ids), BATCH_SIZE):
+        batch = mahasiswa_ids[start:start + BATCH_SIZE]
+        agregat = {
+            row['mahasiswa_id']: row
+            for row in NilaiAkhir.objects.filter(mahasiswa_id__in=batch, nilai_huruf__isnull=False)
+            .values('mahasiswa_id')
+            .annotate(jumlah=Count('id'), sks=Sum('matakuliah__sks'), bobot=Sum(F('matakuliah__sks') * bobot_huruf))
+            .order_by()
+        }
+        ringkasan = []
+        for mahasiswa_id in batch:
+            row = agregat.get(mahasiswa_id, {})
+            total_sks = row.get('sks') or 0
+            total_bobot = Decimal(row.get('bobot') or 0)
+            ringkasan.append(RingkasanTranskrip(
+                mahasiswa_id=mahasiswa_id,
+                jumlah_matakuliah=row.get('jumlah', 0),
+                total_sks=total_sks,
+                total_bobot=total_bobot,
+                ipk=(total_bobot / total_sks).quantize(Decimal('0.01')) if total_sks else Decimal('0.00'),
+            ))
+        RingkasanTranskrip.objects.bulk_create(
+            ringkasan,
+            update_conflicts=True,
+            unique_fields=['mahasiswa'],
+            update_fields=['jumlah_matakuliah', 'total_sks', 'total_bobot', 'ipk', 'updated_at'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(isi_ringkasan_transkrip, migrations.RunPython.noop),
+    ]
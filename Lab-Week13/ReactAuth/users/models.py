@@ -1,6 +1,8 @@
 
 from django.db import models
+from django.core.exceptions import ValidationError
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from .managers import CustomUserManager 
 from decimal import Decimal
@@ -36,6 +38,9 @@ class CustomUser(AbstractUser):
     
     role = models.CharField(max_length=50, choices=Role.choices, default=Role.MAHASISWA)
 
+    # Disalin ke claim 'ver' di JWT; menaikkannya membatalkan semua token lama.
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+
     REQUIRED_FIELDS = ['full_name'] 
     
     objects = CustomUserManager()
@@ -43,6 +48,47 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return self.email
 
+    # Ikut tertanam di claim JWT; perubahannya harus membatalkan token lama.
+    FIELD_CLAIM_AKSES = ('role', 'is_staff', 'is_superuser', 'is_active')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Simpan nilai saat dimuat agar save() tahu apakah hak aksesnya berubah.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def _naikkan_token_version(self):
+        if not getattr(self, '_token_version_naik', False):
+            self.token_version += 1
+            self._token_version_naik = True
+
+    def set_password(self, raw_password):
+        super().set_password(raw_password)
+        self._naikkan_token_version()
+
+    def save(self, *args, **kwargs):
+        lama = getattr(self, '_loaded_values', None) or {}
+        if any(field in lama and lama[field] != getattr(self, field) for field in self.FIELD_CLAIM_AKSES):
+            self._naikkan_token_version()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and getattr(self, '_token_version_naik', False):
+            # Misal rehash password saat login: save(update_fields=['password']).
+            kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        self._token_version_naik = False
+        self._loaded_values = {
+            **lama,
+            **{field: self.__dict__[field] for field in (*self.FIELD_CLAIM_AKSES, 'full_name') if field in self.__dict__},
+        }
+
+    def cabut_token(self):
+        """Batalkan semua JWT milik user ini (misal akun dibobol atau dinonaktifkan)."""
+        CustomUser.objects.filter(pk=self.pk).update(token_version=models.F('token_version') + 1)
+        self.refresh_from_db(fields=['token_version'])
+        from .authentication import lupakan_versi_token
+        lupakan_versi_token(self.pk)
+
 class Matakuliah(models.Model):
     kode_mk = models.CharField(max_length=10, unique=True, primary_key=True)
     nama_mk = models.CharField(max_length=150)
@@ -58,12 +104,23 @@ class Matakuliah(models.Model):
         verbose_name=_('Dosen Pengajar')
     )
 
+    # Jumlah mahasiswa yang punya NilaiAkhir di mata kuliah ini; dijaga oleh
+    # signal NilaiAkhir dan oleh upsert massal di utils.py.
+    total_mahasiswa = models.PositiveIntegerField(default=0, editable=False)
+
     def __str__(self):
         return f"{self.kode_mk} - {self.nama_mk}"
     
     class Meta:
         verbose_name_plural = "Mata Kuliah"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Simpan nilai saat dimuat agar signal tahu bila SKS berubah.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
 class KomponenNilai(models.Model):
     
     NAMA_KOMPONEN_CHOICES = [
@@ -92,6 +149,13 @@ class KomponenNilai(models.Model):
     def __str__(self):
         return f"{self.matakuliah.kode_mk} - {self.nama_komponen} ({self.bobot_persen}%)"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Simpan nilai saat dimuat agar signal bisa tahu field apa yang berubah.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
 class Assessment(models.Model):
     
     mahasiswa = models.ForeignKey(
@@ -102,6 +166,16 @@ class Assessment(models.Model):
     )
     
     komponen = models.ForeignKey(KomponenNilai, on_delete=models.CASCADE)
+
+    # Salinan komponen.matakuliah supaya query per mata kuliah tidak perlu join
+    # ke KomponenNilai. Diisi otomatis di save(); indeksnya ada di Meta.indexes.
+    matakuliah = models.ForeignKey(
+        Matakuliah,
+        on_delete=models.CASCADE,
+        editable=False,
+        db_index=False,
+        related_name='assessment_scores'
+    )
     
     nilai_angka = models.DecimalField(
         max_digits=5, 
@@ -112,9 +186,27 @@ class Assessment(models.Model):
     class Meta:
         unique_together = ('mahasiswa', 'komponen')
         verbose_name_plural = "Assessment Scores"
+        indexes = [
+            models.Index(fields=['matakuliah', 'mahasiswa'], name='assessment_mk_mahasiswa_idx'),
+        ]
         
     def __str__(self):
         return f"{self.mahasiswa.email} - {self.komponen.nama_komponen}: {self.nilai_angka}"
+
+    def save(self, *args, **kwargs):
+        # bulk_create tidak lewat sini; pemanggilnya wajib mengisi matakuliah_id sendiri.
+        self.matakuliah_id = self.komponen.matakuliah_id
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'komponen' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'matakuliah'}
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Simpan nilai saat dimuat agar signal bisa tahu field apa yang berubah.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
     
 class NilaiAkhir(models.Model):
     
@@ -148,8 +240,142 @@ class NilaiAkhir(models.Model):
     class Meta:
         unique_together = ('mahasiswa', 'matakuliah')
         verbose_name_plural = "Nilai Akhir (Transkrip)"
+        indexes = [
+            # Ranking per mata kuliah (ORDER BY nilai_total di dalam satu matakuliah).
+            models.Index(fields=['matakuliah', 'nilai_total'], name='nilaiakhir_mk_total_idx'),
+        ]
         
     def __str__(self):
         return f"{self.mahasiswa.full_name} - {self.matakuliah.kode_mk}: {self.nilai_huruf or 'Belum Dihitung'}"
 
-                
\ No newline at end of file
+                
+
+
+class SkalaNilai(models.Model):
+    """Batas bawah tiap nilai huruf, berlaku untuk satu Jurusan atau satu Matakuliah.
+
+    Skala Matakuliah mengalahkan skala Jurusan; tanpa keduanya dipakai
+    GRADING_SCALE bawaan di utils.py. Nilai di bawah batas_d mendapat 'E'.
+    """
+
+    jurusan = models.OneToOneField(
+        Jurusan,
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='skala_nilai'
+    )
+    matakuliah = models.OneToOneField(
+        Matakuliah,
+        on_delete=models.CASCADE,
+        null=True, blank=True,
+        related_name='skala_nilai'
+    )
+
+    batas_a = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('80.00'))
+    batas_ab = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('75.00'))
+    batas_b = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('70.00'))
+    batas_bc = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('65.00'))
+    batas_c = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('60.00'))
+    batas_d = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('50.00'))
+
+    class Meta:
+        verbose_name_plural = "Skala Nilai"
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(jurusan__isnull=False, matakuliah__isnull=True)
+                    | models.Q(jurusan__isnull=True, matakuliah__isnull=False)
+                ),
+                name='skala_nilai_satu_pemilik',
+            ),
+        ]
+
+    def as_scale(self):
+        """Bentuk yang sama dengan GRADING_SCALE: [(batas, huruf), ...] menurun."""
+        return [
+            (self.batas_a, 'A'),
+            (self.batas_ab, 'AB'),
+            (self.batas_b, 'B'),
+            (self.batas_bc, 'BC'),
+            (self.batas_c, 'C'),
+            (self.batas_d, 'D'),
+            (Decimal('0'), 'E'),
+        ]
+
+    def clean(self):
+        batas = [threshold for threshold, _ in self.as_scale()[:-1]]
+        if any(atas <= bawah for atas, bawah in zip(batas, batas[1:])):
+            raise ValidationError(_('Batas nilai harus menurun tegas dari A sampai D.'))
+
+    def __str__(self):
+        pemilik = self.matakuliah_id or self.jurusan_id
+        return f"Skala Nilai {pemilik}"
+
+
+class RingkasanTranskrip(models.Model):
+    """Ringkasan transkrip per mahasiswa yang dijaga tetap sinkron dengan NilaiAkhir.
+
+    Hanya NilaiAkhir yang sudah punya nilai huruf yang dihitung. IPK adalah
+    total_bobot (SKS x bobot huruf) dibagi total_sks.
+    """
+
+    mahasiswa = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='ringkasan_transkrip'
+    )
+    jumlah_matakuliah = models.PositiveIntegerField(default=0)
+    total_sks = models.PositiveIntegerField(default=0)
+    total_bobot = models.DecimalField(max_digits=8, decimal_places=2, default=Decimal('0.00'))
+    ipk = models.DecimalField(max_digits=3, decimal_places=2, default=Decimal('0.00'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "Ringkasan Transkrip"
+
+    def __str__(self):
+        return f"{self.mahasiswa_id} - IPK {self.ipk} ({self.total_sks} SKS)"
+
+
+class Job(models.Model):
+    """Pekerjaan latar belakang yang diantrekan di database dan dijalankan `run_workers`."""
+
+    class Status(models.TextChoices):
+        ANTRI = 'ANTRI', _('Antri')
+        BERJALAN = 'BERJALAN', _('Berjalan')
+        SELESAI = 'SELESAI', _('Selesai')
+        GAGAL = 'GAGAL', _('Gagal')
+
+    jenis = models.CharField(max_length=50)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.ANTRI)
+    payload = models.JSONField(default=dict, blank=True)
+    hasil = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    progres = models.PositiveSmallIntegerField(default=0, help_text="Persen (0-100)")
+
+    percobaan = models.PositiveSmallIntegerField(default=0)
+    maks_percobaan = models.PositiveSmallIntegerField(default=5)
+    # Job baru diambil worker setelah waktu ini (dipakai untuk jeda retry).
+    jalan_setelah = models.DateTimeField(default=timezone.now)
+    worker = models.CharField(max_length=100, blank=True)
+
+    dibuat_oleh = models.ForeignKey(
+        CustomUser,
+        on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name_plural = "Job"
+        indexes = [
+            # Query worker: status=ANTRI AND jalan_setelah <= now ORDER BY id.
+            models.Index(fields=['status', 'jalan_setelah'], name='job_antrian_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.jenis} ({self.status})"
@@ -0,0 +1,16 @@
+# users/pagination.py
+"""Cursor (keyset) pagination untuk semua endpoint list.
+
+Halaman berikutnya diambil dengan ``WHERE pk > cursor ORDER BY pk LIMIT n``
+sehingga halaman ke-1000 sama murahnya dengan halaman pertama (tanpa OFFSET
+dan tanpa query COUNT). Cursor di-encode DRF menjadi string opaque.
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class AcademicCursorPagination(CursorPagination):
+    # Primary key selalu unik dan terindeks, jadi urutannya stabil untuk keyset.
+    ordering = 'pk'
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'ACADEMIC_MAX_PAGE_SIZE', 500)
@@ -0,0 +1,97 @@
+# users/ranking.py
+"""Peringkat mahasiswa per mata kuliah (nilai_total) dan per jurusan (IPK).
+
+Rank, DenseRank dan PercentRank dihitung database dengan window function,
+jadi leaderboard cukup ``LIMIT n`` dan peringkat satu mahasiswa diambil
+dengan membungkus query ber-window sebagai subquery (WHERE di luar window,
+supaya peringkat tetap dihitung atas seluruh angkatan) dalam satu query.
+"""
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import Count, F, Window
+from django.db.models.functions import DenseRank, PercentRank, Rank
+
+from .models import Jurusan, Matakuliah, NilaiAkhir, RingkasanTranskrip
+
+MAX_LIMIT = 100
+KOLOM = ('mahasiswa_id', 'full_name', 'nilai', 'peringkat', 'peringkat_padat', 'persentil', 'jumlah')
+
+
+def _berperingkat(queryset, kolom_nilai):
+    urutan = F(kolom_nilai).desc()
+    return (
+        queryset.annotate(
+            nilai=F(kolom_nilai),
+            full_name=F('mahasiswa__full_name'),
+            peringkat=Window(Rank(), order_by=urutan),
+            peringkat_padat=Window(DenseRank(), order_by=urutan),
+            # Persentase mahasiswa lain yang nilainya lebih rendah (0 = terbawah, 1 = teratas).
+            persentil=Window(PercentRank(), order_by=F(kolom_nilai).asc()),
+            jumlah=Window(Count('pk')),
+        )
+        .order_by('peringkat', 'mahasiswa_id')
+        .values_list(*KOLOM)
+    )
+
+
+def _baris(row):
+    hasil = dict(zip(KOLOM, row))
+    # Baris dari cursor mentah belum melewati converter Django (SQLite: float).
+    hasil['nilai'] = str(Decimal(str(hasil['nilai'])).quantize(Decimal('0.01')))
+    hasil['persentil'] = round(hasil['persentil'] * 100, 1)
+    del hasil['jumlah']
+    return hasil
+
+
+def _milik(ranked, mahasiswa_id):
+    sql, params = ranked.query.sql_with_params()
+    kolom = ', '.join(connection.ops.quote_name(k) for k in KOLOM)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT {kolom} FROM ({sql}) AS berperingkat WHERE mahasiswa_id = %s',
+            (*params, mahasiswa_id),
+        )
+        return cursor.fetchone()
+
+
+def _hasil(ranked, limit, mahasiswa_id):
+    # jumlah ikut di setiap baris (COUNT OVER ()), jadi tidak perlu query COUNT terpisah.
+    hasil = {'jumlah': None}
+    if limit:
+        rows = list(ranked[:min(limit, MAX_LIMIT)])
+        hasil['jumlah'] = rows[0][-1] if rows else 0
+        hasil['leaderboard'] = [_baris(row) for row in rows]
+    if mahasiswa_id is not None:
+        row = _milik(ranked, mahasiswa_id)
+        if row:
+            hasil['jumlah'] = row[-1]
+        hasil['mahasiswa'] = _baris(row) if row else None
+    return hasil
+
+
+def peringkat_matakuliah(matakuliah_kode, limit=10, mahasiswa_id=None):
+    """Leaderboard `limit` teratas dan/atau peringkat satu mahasiswa; (success, result)."""
+    ranked = _berperingkat(
+        NilaiAkhir.objects.filter(matakuliah_id=matakuliah_kode, nilai_total__isnull=False), 'nilai_total'
+    )
+    hasil = _hasil(ranked, limit, mahasiswa_id)
+    # Kode yang tidak ada hanya mungkin bila hasilnya kosong; baru saat itu dicek.
+    if not hasil['jumlah'] and not Matakuliah.objects.filter(kode_mk=matakuliah_kode).exists():
+        return False, "Mata Kuliah tidak ditemukan."
+    return True, {'matakuliah': matakuliah_kode, **hasil}
+
+
+def peringkat_jurusan(jurusan_kode, limit=10, mahasiswa_id=None):
+    """Seperti peringkat_matakuliah, berdasarkan IPK mahasiswa jurusan itu.
+
+    Memakai RingkasanTranskrip, yang ada untuk setiap mahasiswa yang punya
+    NilaiAkhir (dijaga signal/upsert massal, data lama diisi migrasi 0010).
+    """
+    ranked = _berperingkat(
+        RingkasanTranskrip.objects.filter(mahasiswa__major_id=jurusan_kode, jumlah_matakuliah__gt=0), 'ipk'
+    )
+    hasil = _hasil(ranked, limit, mahasiswa_id)
+    if not hasil['jumlah'] and not Jurusan.objects.filter(kode=jurusan_kode).exists():
+        return False, "Jurusan tidak ditemukan."
+    return True, {'jurusan': jurusan_kode, **hasil}
@@ -0,0 +1,80 @@
+# users/recompute.py
+"""Pelacak pasangan (mahasiswa, matakuliah) yang NilaiAkhir-nya sudah basi,
+serta mahasiswa yang RingkasanTranskrip-nya perlu disegarkan.
+
+Signal hanya menandai pasangan/mata kuliah sebagai kotor. Di dalam transaksi,
+semua tanda dikumpulkan dan dihitung ulang sekali saat commit lewat
+``hitung_ulang_nilai_akhir``; di luar transaksi (autocommit) langsung dihitung.
+"""
+import threading
+
+from django.db import connection, transaction
+
+_state = threading.local()
+
+
+class _Batch:
+    def __init__(self):
+        self.pasangan = set()
+        self.matakuliah_kodes = set()
+        self.ringkasan = set()
+
+    def flush(self):
+        if getattr(_state, 'batch', None) is self:
+            _state.batch = None
+        from .utils import hitung_ulang_nilai_akhir, perbarui_ringkasan_transkrip
+        rows = hitung_ulang_nilai_akhir(self.pasangan, self.matakuliah_kodes)
+        perbarui_ringkasan_transkrip(self.ringkasan - {row.mahasiswa_id for row in rows})
+
+
+def _current_batch():
+    batch = getattr(_state, 'batch', None)
+    # Callback ikut terbuang bila transaksinya di-rollback, jadi batch lama
+    # hanya dipakai selama flush-nya masih terdaftar di on_commit.
+    if batch is not None and any(func == batch.flush for _, func, *_ in connection.run_on_commit):
+        return batch
+    batch = _Batch()
+    _state.batch = batch
+    transaction.on_commit(batch.flush)
+    return batch
+
+
+def mark_dirty(mahasiswa_id, matakuliah_kode):
+    if matakuliah_kode is None:
+        return
+    if not connection.in_atomic_block:
+        from .utils import hitung_ulang_nilai_akhir
+        hitung_ulang_nilai_akhir(pasangan=[(mahasiswa_id, matakuliah_kode)])
+        return
+    _current_batch().pasangan.add((mahasiswa_id, matakuliah_kode))
+
+
+def mark_course_dirty(matakuliah_kode):
+    if matakuliah_kode is not None:
+        mark_courses_dirty([matakuliah_kode])
+
+
+def mark_courses_dirty(matakuliah_kodes):
+    matakuliah_kodes = set(matakuliah_kodes)
+    if not matakuliah_kodes:
+        return
+    if not connection.in_atomic_block:
+        from .utils import hitung_ulang_nilai_akhir
+        hitung_ulang_nilai_akhir(matakuliah_kodes=matakuliah_kodes)
+        return
+    _current_batch().matakuliah_kodes.update(matakuliah_kodes)
+
+
+def mark_summary_dirty(mahasiswa_id):
+    mark_summaries_dirty([mahasiswa_id])
+
+
+def mark_summaries_dirty(mahasiswa_ids):
+    mahasiswa_ids = set(mahasiswa_ids)
+    if not mahasiswa_ids:
+        return
+    if not connection.in_atomic_block:
+        from .utils import perbarui_ringkasan_transkrip
+        perbarui_ringkasan_transkrip(mahasiswa_ids)
+        return
+    _current_batch().ringkasan.update(mahasiswa_ids)
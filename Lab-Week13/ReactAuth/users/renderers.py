@@ -0,0 +1,36 @@
+# users/renderers.py
+"""Renderer JSON berbasis orjson (opsional).
+
+orjson menulis bytes langsung dari C dan jauh lebih cepat daripada json.dumps
+untuk list besar. Tipe yang tidak dikenalnya (Decimal, lazy string, dll.)
+diteruskan ke encoder DRF supaya hasilnya sama persis. Bila orjson tidak
+terpasang, renderer ini berperilaku seperti JSONRenderer biasa.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Decimal mentah (misal di dict hasil utils) jadi float seperti di encoder DRF;
+# DecimalField serializer sendiri sudah menghasilkan string.
+_default = JSONRenderer.encoder_class().default
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        # orjson hanya mengenal indentasi 2 spasi (BrowsableAPI meminta indent).
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        ret = orjson.dumps(data, default=_default, option=option)
+
+        # Sama seperti JSONRenderer: \u2028/\u2029 di-escape agar tetap subset JavaScript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
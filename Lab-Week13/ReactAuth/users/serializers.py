@@ -1,10 +1,11 @@
 
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 import re
 from django.utils.translation import gettext_lazy as _
 from .models import *
+from decimal import Decimal
 User = get_user_model()
 
 STUDENT_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@student\.prasetiyamulya\.ac\.id$', re.IGNORECASE)
@@ -82,8 +83,10 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['email'] = user.email
         token['username'] = user.username 
         token['full_name'] = user.full_name
-        token['major'] = user.major.kode if user.major else None
+        token['major'] = user.major_id
         token['role'] = user.role
+        token['is_staff'] = user.is_staff
+        token['ver'] = user.token_version
         return token
 
     def validate(self, attrs):
@@ -93,12 +96,19 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
             'email': self.user.email,
             'username': self.user.username,
             'full_name': self.user.full_name,
-            'major': self.user.major.kode if self.user.major else None,
+            'major': self.user.major_id,
             'role': self.user.role,
             'token': token_data,
         })
         return data
       
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        # Refresh token yang versinya sudah dicabut tidak boleh menerbitkan access baru.
+        from .authentication import cek_versi_token
+        cek_versi_token(self.token_class(attrs['refresh']))
+        return super().validate(attrs)
+
 class JurusanSerializer(serializers.ModelSerializer):
     class Meta:
         model = Jurusan
@@ -107,7 +117,7 @@ class JurusanSerializer(serializers.ModelSerializer):
 class MatakuliahReadSerializer(serializers.ModelSerializer):
     jurusan = JurusanSerializer(read_only=True)
     pengajar = serializers.SerializerMethodField()
-    total_mahasiswa = serializers.SerializerMethodField()
+    total_mahasiswa = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Matakuliah
@@ -116,10 +126,6 @@ class MatakuliahReadSerializer(serializers.ModelSerializer):
     def get_pengajar(self, obj):
         return [{'full_name': user.full_name, 'email': user.email} 
                 for user in obj.pengajar.all()]
-
-    def get_total_mahasiswa(self, obj):
-        count = obj.nilaiakhir_set.values('mahasiswa').distinct().count()
-        return count
       
 class MatakuliahWriteSerializer(serializers.ModelSerializer):
     jurusan = serializers.SlugRelatedField(
@@ -165,6 +171,89 @@ class AssessmentSerializer(serializers.ModelSerializer):
             )
         ]
 
+class AssessmentBulkListSerializer(serializers.ListSerializer):
+    """Validasi dan simpan satu grid nilai dengan jumlah query yang tetap.
+
+    Keberadaan mahasiswa/komponen dan keunikan (mahasiswa, komponen) dicek
+    dengan satu query per tabel, bukan satu query per item. Dengan
+    context['upsert'] pasangan yang sudah ada diperbarui, bukan ditolak.
+    """
+
+    def to_internal_value(self, data):
+        # Validasi per field dulu (tanpa query), baru validasi berbasis himpunan.
+        attrs = super().to_internal_value(data)
+        mahasiswa_ids = {item['mahasiswa'] for item in attrs}
+        komponen_ids = {item['komponen'] for item in attrs}
+
+        mahasiswa_valid = set(
+            User.objects.filter(pk__in=mahasiswa_ids, role=User.Role.MAHASISWA).values_list('pk', flat=True)
+        )
+        self.komponen_matakuliah = dict(
+            KomponenNilai.objects.filter(pk__in=komponen_ids).values_list('pk', 'matakuliah_id')
+        )
+        self.existing = set(
+            Assessment.objects.filter(mahasiswa_id__in=mahasiswa_ids, komponen_id__in=komponen_ids)
+            .values_list('mahasiswa_id', 'komponen_id')
+        ) if mahasiswa_valid and self.komponen_matakuliah else set()
+
+        errors, seen = {}, set()
+        for index, item in enumerate(attrs):
+            pasangan = (item['mahasiswa'], item['komponen'])
+            item_errors = {}
+            if item['mahasiswa'] not in mahasiswa_valid:
+                item_errors['mahasiswa'] = ["Mahasiswa tidak ditemukan."]
+            if item['komponen'] not in self.komponen_matakuliah:
+                item_errors['komponen'] = ["Komponen nilai tidak ditemukan."]
+            if pasangan in seen:
+                item_errors['non_field_errors'] = ["Pasangan mahasiswa dan komponen muncul lebih dari sekali."]
+            elif pasangan in self.existing and not self.context.get('upsert'):
+                item_errors['non_field_errors'] = ["Nilai untuk komponen ini pada mahasiswa tersebut sudah ada."]
+            seen.add(pasangan)
+            if item_errors:
+                errors[index] = item_errors
+
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        from . import conditional, recompute
+
+        objs = [
+            Assessment(
+                mahasiswa_id=item['mahasiswa'],
+                komponen_id=item['komponen'],
+                matakuliah_id=self.komponen_matakuliah[item['komponen']],
+                nilai_angka=item['nilai_angka'],
+            )
+            for item in validated_data
+        ]
+        if self.context.get('upsert'):
+            Assessment.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=['mahasiswa', 'komponen'],
+                update_fields=['nilai_angka'],
+            )
+        else:
+            Assessment.objects.bulk_create(objs)
+
+        # bulk_create tidak memicu signal; tandai pasangan yang berubah secara eksplisit.
+        for obj in objs:
+            recompute.mark_dirty(obj.mahasiswa_id, obj.matakuliah_id)
+        conditional.naikkan_versi('assessment')
+        return objs
+
+class AssessmentBulkSerializer(serializers.Serializer):
+    mahasiswa = serializers.IntegerField()
+    komponen = serializers.IntegerField()
+    nilai_angka = serializers.DecimalField(
+        max_digits=5, decimal_places=2, min_value=Decimal('0'), max_value=Decimal('100')
+    )
+
+    class Meta:
+        list_serializer_class = AssessmentBulkListSerializer
+
 class NilaiAkhirSerializer(serializers.ModelSerializer):
     matakuliah_nama = serializers.CharField(source='matakuliah.nama_mk', read_only=True)
     class Meta:
@@ -172,8 +261,23 @@ class NilaiAkhirSerializer(serializers.ModelSerializer):
         fields = ['id', 'mahasiswa', 'matakuliah', 'matakuliah_nama', 'nilai_total', 'nilai_huruf']
         read_only_fields = ['mahasiswa', 'matakuliah', 'nilai_total', 'nilai_huruf'] 
         
+class RingkasanTranskripSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RingkasanTranskrip
+        fields = ['mahasiswa', 'jumlah_matakuliah', 'total_sks', 'total_bobot', 'ipk', 'updated_at']
+
 class MahasiswaSerializer(serializers.ModelSerializer):
     major_nama = serializers.CharField(source='major.nama', read_only=True)
     class Meta:
         model = User
-        fields = ['id', 'email', 'full_name', 'major', 'major_nama']
\ No newline at end of file
+        fields = ['id', 'email', 'full_name', 'major', 'major_nama']
+
+class JobSerializer(serializers.ModelSerializer):
+    # payload tidak ikut ditampilkan: bisa berisi data sensitif (misal password registrasi).
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'jenis', 'status', 'progres', 'hasil', 'error', 'percobaan', 'maks_percobaan',
+            'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
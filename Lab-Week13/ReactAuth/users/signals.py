@@ -1,17 +1,171 @@
 # users/signals.py
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from .models import Assessment
-from .utils import hitung_dan_simpan_nilai_akhir # Fungsi perhitungan nilai yang sudah kita buat
+from .models import Assessment, CustomUser, Jurusan, KomponenNilai, Matakuliah, NilaiAkhir, SkalaNilai
+from . import analytics, catalog_cache, conditional, grading, recompute
+
+
+@receiver(post_save, sender=Assessment)
+def tandai_assessment_tersimpan(sender, instance, created, **kwargs):
+    recompute.mark_dirty(instance.mahasiswa_id, instance.matakuliah_id)
+
+    lama = getattr(instance, '_loaded_values', None) or {}
+    pasangan_lama = (lama.get('mahasiswa_id', instance.mahasiswa_id), lama.get('matakuliah_id', instance.matakuliah_id))
+    if pasangan_lama != (instance.mahasiswa_id, instance.matakuliah_id):
+        # Nilai dipindah ke mahasiswa/mata kuliah lain: pasangan lama ikut basi.
+        recompute.mark_dirty(*pasangan_lama)
+
+    instance._loaded_values = {
+        'id': instance.pk,
+        'mahasiswa_id': instance.mahasiswa_id,
+        'komponen_id': instance.komponen_id,
+        'matakuliah_id': instance.matakuliah_id,
+        'nilai_angka': instance.nilai_angka,
+    }
+
+
+@receiver(post_delete, sender=Assessment)
+def tandai_assessment_terhapus(sender, instance, **kwargs):
+    recompute.mark_dirty(instance.mahasiswa_id, instance.matakuliah_id)
+
+
+@receiver(post_save, sender=KomponenNilai)
+def tandai_bobot_berubah(sender, instance, created, **kwargs):
+    lama = getattr(instance, '_loaded_values', None) or {}
+    if not created:
+        matakuliah_lama = lama.get('matakuliah_id', instance.matakuliah_id)
+        if lama.get('bobot_persen') != instance.bobot_persen or matakuliah_lama != instance.matakuliah_id:
+            if matakuliah_lama != instance.matakuliah_id:
+                # Jaga salinan Assessment.matakuliah tetap sama dengan komponennya.
+                Assessment.objects.filter(komponen=instance).update(matakuliah_id=instance.matakuliah_id)
+                conditional.naikkan_versi('assessment')
+                recompute.mark_course_dirty(matakuliah_lama)
+            # Bobot berlaku untuk semua mahasiswa: hitung ulang satu mata kuliah penuh.
+            recompute.mark_course_dirty(instance.matakuliah_id)
+
+    instance._loaded_values = {
+        'id': instance.pk,
+        'matakuliah_id': instance.matakuliah_id,
+        'nama_komponen': instance.nama_komponen,
+        'bobot_persen': instance.bobot_persen,
+    }
+
+
+@receiver(post_delete, sender=KomponenNilai)
+def tandai_komponen_terhapus(sender, instance, **kwargs):
+    recompute.mark_course_dirty(instance.matakuliah_id)
+
+
+@receiver(post_save, sender=SkalaNilai)
+@receiver(post_delete, sender=SkalaNilai)
+def skala_nilai_berubah(sender, instance, **kwargs):
+    grading.invalidate()
+    transaction.on_commit(grading.invalidate)
+
+    if instance.matakuliah_id:
+        recompute.mark_course_dirty(instance.matakuliah_id)
+    elif instance.jurusan_id:
+        recompute.mark_courses_dirty(
+            Matakuliah.objects.filter(jurusan_id=instance.jurusan_id).values_list('kode_mk', flat=True)
+        )
+
+
+@receiver(post_save, sender=NilaiAkhir)
+@receiver(post_delete, sender=NilaiAkhir)
+def nilai_akhir_berubah(sender, instance, **kwargs):
+    # Perubahan lewat bulk upsert menyegarkan ringkasannya sendiri di utils.py.
+    recompute.mark_summary_dirty(instance.mahasiswa_id)
+
+
+TABEL_ETAG = {Assessment: 'assessment', KomponenNilai: 'komponen', NilaiAkhir: 'nilai_akhir'}
+
 
 @receiver(post_save, sender=Assessment)
-def recalculate_nilai_akhir(sender, instance, **kwargs):
-    mahasiswa_id = instance.mahasiswa.id
-    matakuliah_kode = instance.komponen.matakuliah.kode_mk
-    success, result = hitung_dan_simpan_nilai_akhir(mahasiswa_id, matakuliah_kode)
-    
-    if success:
-        print(f"DEBUG: Nilai akhir untuk {mahasiswa_id} - {matakuliah_kode} berhasil diupdate.")
-    else:
-        print(f"DEBUG: Gagal update nilai: {result}")
\ No newline at end of file
+@receiver(post_delete, sender=Assessment)
+@receiver(post_save, sender=KomponenNilai)
+@receiver(post_delete, sender=KomponenNilai)
+@receiver(post_save, sender=NilaiAkhir)
+@receiver(post_delete, sender=NilaiAkhir)
+def etag_basi(sender, instance, **kwargs):
+    # Jalur bulk_create/update memanggil conditional.naikkan_versi sendiri.
+    conditional.naikkan_versi(TABEL_ETAG[sender])
+
+
+@receiver(post_save, sender=NilaiAkhir)
+@receiver(post_delete, sender=NilaiAkhir)
+@receiver(post_save, sender=KomponenNilai)
+@receiver(post_delete, sender=KomponenNilai)
+def statistik_basi(sender, instance, **kwargs):
+    # Upsert massal tidak memicu signal; hitung ulang di utils.py menaikkan versinya
+    # sendiri (termasuk mata kuliah lama bila komponen dipindah).
+    analytics.naikkan_versi_nilai([instance.matakuliah_id])
+
+
+@receiver(post_save, sender=NilaiAkhir)
+def tambah_total_mahasiswa(sender, instance, created, **kwargs):
+    if created:
+        Matakuliah.objects.filter(pk=instance.matakuliah_id).update(
+            total_mahasiswa=F('total_mahasiswa') + 1
+        )
+        catalog_cache.naikkan_versi_katalog()
+
+
+@receiver(post_delete, sender=NilaiAkhir)
+def kurangi_total_mahasiswa(sender, instance, **kwargs):
+    Matakuliah.objects.filter(pk=instance.matakuliah_id, total_mahasiswa__gt=0).update(
+        total_mahasiswa=F('total_mahasiswa') - 1
+    )
+    catalog_cache.naikkan_versi_katalog()
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def lupakan_versi_token_user(sender, instance, **kwargs):
+    # Password/is_active/token_version bisa berubah; paksa cek ulang ke database.
+    from .authentication import lupakan_versi_token
+    from .user_cache import user_cache
+    lupakan_versi_token(instance.pk)
+    user_cache.invalidate(instance.pk)
+    lama = getattr(instance, '_loaded_values', None) or {}
+    if not kwargs.get('created') and lama.get('full_name') != instance.full_name:
+        # Nama mahasiswa tampil di respons Assessment (mahasiswa_nama).
+        conditional.naikkan_versi('user')
+    if instance.role == CustomUser.Role.DOSEN:
+        # Nama/email dosen tampil sebagai pengajar di katalog Matakuliah.
+        catalog_cache.naikkan_versi_katalog()
+
+
+@receiver(post_save, sender=Jurusan)
+@receiver(post_delete, sender=Jurusan)
+def jurusan_berubah(sender, instance, **kwargs):
+    # User di cache membawa objek major; jurusan jarang berubah, kosongkan saja.
+    from .user_cache import user_cache
+    user_cache.clear()
+    catalog_cache.naikkan_versi_katalog()
+
+
+@receiver(post_save, sender=Matakuliah)
+@receiver(post_delete, sender=Matakuliah)
+def matakuliah_berubah(sender, instance, **kwargs):
+    catalog_cache.naikkan_versi_katalog()
+    analytics.naikkan_versi_nilai([instance.pk])
+
+
+@receiver(post_save, sender=Matakuliah)
+def tandai_sks_berubah(sender, instance, created, **kwargs):
+    lama = getattr(instance, '_loaded_values', None) or {}
+    if not created and lama.get('sks', instance.sks) != instance.sks:
+        # total_sks dan IPK tertimbang SKS semua peserta mata kuliah ini ikut basi.
+        recompute.mark_summaries_dirty(
+            NilaiAkhir.objects.filter(matakuliah_id=instance.pk).values_list('mahasiswa_id', flat=True)
+        )
+    instance._loaded_values = {'kode_mk': instance.pk, 'sks': instance.sks}
+
+
+@receiver(m2m_changed, sender=Matakuliah.pengajar.through)
+def pengajar_berubah(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        catalog_cache.naikkan_versi_katalog()
@@ -1,3 +1,1727 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings as django_settings
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import AsyncClient, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from .models import Jurusan, Matakuliah, KomponenNilai, Assessment, NilaiAkhir, CustomUser, Job, RingkasanTranskrip, SkalaNilai
+from .authentication import versi_token
+from .cohort import MIN_POOL, hash_passwords
+from .pagination import AcademicCursorPagination
+from .serializers import CustomTokenObtainPairSerializer
+from .user_cache import user_cache
+from .utils import perbarui_ringkasan_transkrip
+
+# Batas jumlah query per endpoint. Jalankan dengan UPDATE_QUERY_BUDGETS=1
+# untuk menulis ulang angka yang terukur setelah perubahan yang disengaja.
+BUDGET_FILE = Path(__file__).with_name('query_budgets.json')
+UPDATE_BUDGETS = bool(os.environ.get('UPDATE_QUERY_BUDGETS'))
+
+def access_token(user):
+    # Token dengan claim yang sama seperti hasil login (role, major, is_staff, ver).
+    return CustomTokenObtainPairSerializer.get_token(user).access_token
+
+
+# Data ditambah bertahap; jumlah query harus sama di setiap ukuran.
+SIZES = (2, 6)
+
+
+class CalculateCourseTests(APITestCase):
+    def setUp(self):
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=jurusan)
+        uts = KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UTS', bobot_persen=Decimal('40'))
+        uas = KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UAS', bobot_persen=Decimal('60'))
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.mahasiswa = []
+        for i, (nilai_uts, nilai_uas) in enumerate([(80, 90), (60, 70)]):
+            mahasiswa = CustomUser.objects.create(email=f'm{i}@student.prasetiyamulya.ac.id', full_name=f'M{i}')
+            Assessment.objects.create(mahasiswa=mahasiswa, komponen=uts, nilai_angka=Decimal(nilai_uts))
+            Assessment.objects.create(mahasiswa=mahasiswa, komponen=uas, nilai_angka=Decimal(nilai_uas))
+            self.mahasiswa.append(mahasiswa)
+        # Hanya role MAHASISWA yang mendapat NilaiAkhir.
+        Assessment.objects.create(mahasiswa=self.dosen, komponen=uts, nilai_angka=Decimal('100'))
+        # Nilai lama yang sudah basi harus ditimpa, bukan diduplikasi.
+        NilaiAkhir.objects.create(mahasiswa=self.mahasiswa[1], matakuliah=self.matakuliah,
+                                  nilai_total=Decimal('10'), nilai_huruf='E')
+
+    def post(self, user, data):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(user)}')
+        return self.client.post('/api/academic/nilai-akhir/calculate_course/', data, format='json')
+
+    def test_computes_every_student(self):
+        response = self.post(self.dosen, {'matakuliah_kode': 'MK001'})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            (response.data['jumlah_mahasiswa'], response.data['dibuat'], response.data['diperbarui']), (2, 1, 1)
+        )
+        self.assertEqual(
+            sorted(NilaiAkhir.objects.values_list('mahasiswa__email', 'nilai_total', 'nilai_huruf')),
+            [('m0@student.prasetiyamulya.ac.id', Decimal('86.00'), 'A'),
+             ('m1@student.prasetiyamulya.ac.id', Decimal('66.00'), 'BC')]
+        )
+        self.matakuliah.refresh_from_db()
+        self.assertEqual(self.matakuliah.total_mahasiswa, 2)
+
+    def test_errors_and_permissions(self):
+        self.assertEqual(self.post(self.mahasiswa[0], {'matakuliah_kode': 'MK001'}).status_code, 403)
+        self.assertEqual(self.post(self.dosen, {}).status_code, 400)
+        self.assertEqual(self.post(self.dosen, {'matakuliah_kode': 'TIDAK'}).status_code, 400)
+        self.assertEqual(NilaiAkhir.objects.get().nilai_total, Decimal('10.00'))
+
+
+class RecomputeTests(APITestCase):
+    """NilaiAkhir dan RingkasanTranskrip dihitung ulang dari pasangan kotor saat commit."""
+
+    def setUp(self):
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.mk1 = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah 1', sks=3, jurusan=jurusan)
+        self.mk2 = Matakuliah.objects.create(kode_mk='MK002', nama_mk='Mata Kuliah 2', sks=2, jurusan=jurusan)
+        self.uts = KomponenNilai.objects.create(matakuliah=self.mk1, nama_komponen='UTS', bobot_persen=Decimal('40'))
+        self.uas = KomponenNilai.objects.create(matakuliah=self.mk1, nama_komponen='UAS', bobot_persen=Decimal('60'))
+        self.m1 = CustomUser.objects.create(email='m1@student.prasetiyamulya.ac.id', full_name='M1')
+        self.m2 = CustomUser.objects.create(email='m2@student.prasetiyamulya.ac.id', full_name='M2')
+
+    def nilai(self, mahasiswa, matakuliah):
+        row = NilaiAkhir.objects.get(mahasiswa=mahasiswa, matakuliah=matakuliah)
+        return row.nilai_total, row.nilai_huruf
+
+    def beri_nilai(self, mahasiswa, uts, uas):
+        return [
+            Assessment.objects.create(mahasiswa=mahasiswa, komponen=self.uts, nilai_angka=Decimal(uts)),
+            Assessment.objects.create(mahasiswa=mahasiswa, komponen=self.uas, nilai_angka=Decimal(uas)),
+        ]
+
+    def test_assessment_marks_only_its_pair(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.beri_nilai(self.m1, 80, 90)
+        self.assertEqual(self.nilai(self.m1, self.mk1), (Decimal('86.00'), 'A'))
+        self.assertFalse(NilaiAkhir.objects.filter(mahasiswa=self.m2).exists())
+
+        ringkasan = RingkasanTranskrip.objects.get(mahasiswa=self.m1)
+        self.assertEqual((ringkasan.jumlah_matakuliah, ringkasan.total_sks, ringkasan.ipk), (1, 3, Decimal('4.00')))
+
+    def test_weight_change_recomputes_whole_course(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.beri_nilai(self.m1, 80, 90)
+            self.beri_nilai(self.m2, 60, 70)
+        self.assertEqual(self.nilai(self.m2, self.mk1), (Decimal('66.00'), 'BC'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.uts.bobot_persen = Decimal('60')
+            self.uts.save()
+            self.uas.bobot_persen = Decimal('40')
+            self.uas.save()
+        self.assertEqual(self.nilai(self.m1, self.mk1), (Decimal('84.00'), 'A'))
+        self.assertEqual(self.nilai(self.m2, self.mk1), (Decimal('64.00'), 'C'))
+        self.assertEqual(RingkasanTranskrip.objects.get(mahasiswa=self.m2).ipk, Decimal('2.00'))
+
+    def test_deleting_last_assessment_resets_nilai(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            nilai = self.beri_nilai(self.m1, 80, 90)
+        with self.captureOnCommitCallbacks(execute=True):
+            for assessment in nilai:
+                assessment.delete()
+        self.assertEqual(self.nilai(self.m1, self.mk1), (None, None))
+
+        ringkasan = RingkasanTranskrip.objects.get(mahasiswa=self.m1)
+        self.assertEqual((ringkasan.jumlah_matakuliah, ringkasan.total_sks, ringkasan.ipk), (0, 0, Decimal('0.00')))
+
+    def test_komponen_moved_to_other_course(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.beri_nilai(self.m1, 80, 90)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.uas.matakuliah = self.mk2
+            self.uas.save()
+
+        self.assertEqual(set(Assessment.objects.filter(komponen=self.uas).values_list('matakuliah_id', flat=True)), {'MK002'})
+        # MK001 tinggal UTS (40% x 80), MK002 mendapat UAS (60% x 90).
+        self.assertEqual(self.nilai(self.m1, self.mk1), (Decimal('32.00'), 'E'))
+        self.assertEqual(self.nilai(self.m1, self.mk2), (Decimal('54.00'), 'D'))
+        self.assertEqual(RingkasanTranskrip.objects.get(mahasiswa=self.m1).total_sks, 5)
+
+    def test_rolled_back_savepoint_does_not_lose_later_marks(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.beri_nilai(self.m1, 80, 90)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            # flush batch pertama ikut terbuang bersama savepoint; tanda ini harus memulai batch baru.
+            self.beri_nilai(self.m2, 60, 70)
+
+        self.assertFalse(NilaiAkhir.objects.filter(mahasiswa=self.m1).exists())
+        self.assertEqual(self.nilai(self.m2, self.mk1), (Decimal('66.00'), 'BC'))
+
+
+class GradingScaleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=self.jurusan)
+
+    def test_course_scale_beats_jurusan_scale(self):
+        from . import grading
+
+        SkalaNilai.objects.create(jurusan=self.jurusan, batas_a=Decimal('90'))
+        self.assertEqual(grading.scale_for('MK001', 'DBT').letters_for([95, 85, 40]), ['A', 'AB', 'E'])
+        SkalaNilai.objects.create(matakuliah=self.matakuliah, batas_a=Decimal('85'))
+        self.assertEqual(grading.scale_for('MK001', 'DBT').letter(85), 'A')
+        self.assertEqual(grading.scale_for('LAIN', None).letter(80), 'A')
+
+    def test_other_process_sees_new_scale(self):
+        from . import grading
+
+        self.assertEqual(grading.scale_for('MK001', 'DBT').letter(85), 'A')
+        registry_lama = grading._registry
+        SkalaNilai.objects.create(jurusan=self.jurusan, batas_a=Decimal('90'))
+        # Proses lain masih memegang registry lama; hanya versi di cache bersama yang berubah.
+        grading._registry = registry_lama
+        self.assertEqual(grading.scale_for('MK001', 'DBT').letter(85), 'AB')
+
+
+class TranscriptSummaryTests(APITestCase):
+    def setUp(self):
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        mk = [
+            Matakuliah.objects.create(kode_mk=f'MK00{i}', nama_mk=f'Mata Kuliah {i}', sks=sks, jurusan=jurusan)
+            for i, sks in enumerate([3, 2, 4])
+        ]
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.mahasiswa = CustomUser.objects.create(email='m0@student.prasetiyamulya.ac.id', full_name='M0')
+        self.lain = CustomUser.objects.create(email='m1@student.prasetiyamulya.ac.id', full_name='M1')
+        with self.captureOnCommitCallbacks(execute=True):
+            NilaiAkhir.objects.create(mahasiswa=self.mahasiswa, matakuliah=mk[0], nilai_total=Decimal('85'), nilai_huruf='A')
+            NilaiAkhir.objects.create(mahasiswa=self.mahasiswa, matakuliah=mk[1], nilai_total=Decimal('66'), nilai_huruf='BC')
+            # Belum punya nilai huruf: tidak dihitung ke IPK maupun SKS.
+            NilaiAkhir.objects.create(mahasiswa=self.mahasiswa, matakuliah=mk[2])
+            NilaiAkhir.objects.create(mahasiswa=self.lain, matakuliah=mk[0], nilai_total=Decimal('55'), nilai_huruf='D')
+
+    def get(self, user, query=''):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(user)}')
+        return self.client.get(f'/api/academic/nilai-akhir/summary/{query}')
+
+    def test_figures(self):
+        response = self.get(self.mahasiswa)
+        self.assertEqual(response.status_code, 200)
+        # (3 x 4.0 + 2 x 2.5) / 5 SKS
+        self.assertEqual(
+            (response.data['jumlah_matakuliah'], response.data['total_sks'],
+             response.data['total_bobot'], response.data['ipk']),
+            (2, 5, '17.00', '3.40')
+        )
+
+    def test_mahasiswa_only_sees_own_summary(self):
+        response = self.get(self.mahasiswa, f'?mahasiswa_id={self.lain.pk}')
+        self.assertEqual(response.data['mahasiswa'], self.mahasiswa.pk)
+
+        response = self.get(self.dosen, f'?mahasiswa_id={self.lain.pk}')
+        self.assertEqual((response.data['mahasiswa'], response.data['ipk']), (self.lain.pk, '1.00'))
+        self.assertEqual(self.get(self.dosen).status_code, 400)
+        self.assertEqual(self.get(self.dosen, '?mahasiswa_id=999').status_code, 404)
+
+    def test_missing_summary_built_on_demand(self):
+        RingkasanTranskrip.objects.all().delete()
+        self.assertEqual(self.get(self.mahasiswa).data['ipk'], '3.40')
+        self.assertTrue(RingkasanTranskrip.objects.filter(mahasiswa=self.mahasiswa).exists())
+
+    def test_sks_change_refreshes_summary(self):
+        matakuliah = Matakuliah.objects.get(pk='MK001')
+        matakuliah.sks = 4
+        with self.captureOnCommitCallbacks(execute=True):
+            matakuliah.save()
+        # (3 x 4.0 + 4 x 2.5) / 7 SKS
+        ringkasan = RingkasanTranskrip.objects.get(mahasiswa=self.mahasiswa)
+        self.assertEqual((ringkasan.total_sks, ringkasan.ipk), (7, Decimal('3.14')))
+
+    def test_migration_backfills_missing_summaries(self):
+        from importlib import import_module
+        from django.apps import apps
+
+        RingkasanTranskrip.objects.all().delete()
+        import_module('users.migrations.0010_isi_ringkasantranskrip').isi_ringkasan_transkrip(apps, None)
+        self.assertEqual(
+            dict(RingkasanTranskrip.objects.values_list('mahasiswa_id', 'ipk')),
+            {self.mahasiswa.pk: Decimal('3.40'), self.lain.pk: Decimal('1.00')}
+        )
+
+
+class AssessmentImportTests(APITestCase):
+    def setUp(self):
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=jurusan)
+        self.uts = KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UTS', bobot_persen=Decimal('40'))
+        self.uas = KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UAS', bobot_persen=Decimal('60'))
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.mahasiswa = [
+            CustomUser.objects.create(email=f'm{i}@student.prasetiyamulya.ac.id', full_name=f'M{i}')
+            for i in range(3)
+        ]
+        # Nilai lama ditimpa oleh impor (upsert).
+        with self.captureOnCommitCallbacks(execute=True):
+            Assessment.objects.create(mahasiswa=self.mahasiswa[0], komponen=self.uts, nilai_angka=Decimal('10'))
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.dosen)}')
+
+    def upload(self, nama, isi):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        return self.client.post(
+            '/api/academic/assessment/import/',
+            {'matakuliah_kode': 'MK001', 'file': SimpleUploadedFile(nama, isi)},
+            format='multipart',
+        )
+
+    def nilai(self):
+        return sorted(Assessment.objects.values_list('mahasiswa__email', 'komponen__nama_komponen', 'nilai_angka'))
+
+    def test_csv_with_row_errors(self):
+        isi = (
+            'email,UTS,UAS\n'
+            'M0@student.prasetiyamulya.ac.id,80,"90,5"\n'
+            'tidak@student.prasetiyamulya.ac.id,70,70\n'
+            'm1@student.prasetiyamulya.ac.id,abc,70\n'
+            'm2@student.prasetiyamulya.ac.id,,101\n'
+            ',,\n'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload('nilai.csv', isi.encode())
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual((response.data['baris_diproses'], response.data['nilai_disimpan']), (4, 2))
+        self.assertEqual([(e['baris'], e.get('kolom')) for e in response.data['errors']],
+                         [(3, None), (4, 'UTS'), (5, 'UAS')])
+        self.assertEqual(self.nilai(), [
+            ('m0@student.prasetiyamulya.ac.id', 'UAS', Decimal('90.50')),
+            ('m0@student.prasetiyamulya.ac.id', 'UTS', Decimal('80.00')),
+        ])
+        # Mata kuliah ditandai kotor: NilaiAkhir ikut dihitung saat commit.
+        self.assertEqual(NilaiAkhir.objects.get().nilai_total, Decimal('86.30'))
+
+    def test_xlsx(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        workbook.active.append(['mahasiswa_id', 'UAS'])
+        workbook.active.append([self.mahasiswa[1].pk, 75])
+        workbook.active.append([self.mahasiswa[2].pk, None])
+        berkas = tempfile.SpooledTemporaryFile()
+        workbook.save(berkas)
+        berkas.seek(0)
+
+        response = self.upload('nilai.xlsx', berkas.read())
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual((response.data['baris_diproses'], response.data['nilai_disimpan']), (2, 1))
+        self.assertIn(('m1@student.prasetiyamulya.ac.id', 'UAS', Decimal('75.00')), self.nilai())
+
+    def test_rejected_files(self):
+        for nama, isi in [
+            ('nilai.xlsx', b'bukan workbook'),
+            ('nilai.txt', b'email,UTS\n'),
+            ('nilai.csv', b'nama,UTS\n'),
+            ('nilai.csv', b'email,Kuis\n'),
+            ('nilai.csv', b''),
+        ]:
+            response = self.upload(nama, isi)
+            self.assertEqual(response.status_code, 400, (nama, isi))
+        self.assertEqual(self.upload('nilai.xlsx', b'bukan workbook').data['detail'], "Format berkas harus .csv atau .xlsx.")
+        self.assertEqual(len(self.nilai()), 1)
+
+
+class AssessmentBulkTests(APITestCase):
+    def setUp(self):
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=jurusan)
+        self.uts = KomponenNilai.objects.create(matakuliah=matakuliah, nama_komponen='UTS', bobot_persen=Decimal('40'))
+        self.uas = KomponenNilai.objects.create(matakuliah=matakuliah, nama_komponen='UAS', bobot_persen=Decimal('60'))
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.mahasiswa = CustomUser.objects.bulk_create([
+            CustomUser(email=f'm{i}@student.prasetiyamulya.ac.id', full_name=f'M{i}') for i in range(10)
+        ])
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.dosen)}')
+
+    def grid(self, mahasiswa, nilai='80'):
+        return [
+            {'mahasiswa': m.pk, 'komponen': k.pk, 'nilai_angka': nilai}
+            for m in mahasiswa for k in (self.uts, self.uas)
+        ]
+
+    def kirim(self, data, method='post'):
+        return getattr(self.client, method)('/api/academic/assessment/bulk/', data, format='json')
+
+    def test_create_and_recompute(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.kirim(self.grid(self.mahasiswa[:2]))
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.data, {'jumlah': 4, 'dibuat': 4, 'diperbarui': 0})
+        self.assertEqual(set(Assessment.objects.values_list('matakuliah_id', flat=True)), {'MK001'})
+        self.assertEqual(
+            list(NilaiAkhir.objects.order_by('mahasiswa_id').values_list('nilai_total', flat=True)),
+            [Decimal('80.00')] * 2
+        )
+
+    def test_validation_is_set_based(self):
+        def jumlah_query(items):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.kirim(items)
+            self.assertEqual(response.status_code, 201)
+            return len(queries)
+
+        # Request pertama ikut mengisi cache token_version dan user.
+        jumlah_query(self.grid(self.mahasiswa[:1]))
+        self.assertEqual(jumlah_query(self.grid(self.mahasiswa[1:2])), jumlah_query(self.grid(self.mahasiswa[2:10])))
+
+    def test_errors_reported_per_item(self):
+        Assessment.objects.create(mahasiswa=self.mahasiswa[0], komponen=self.uts, nilai_angka=Decimal('50'))
+        response = self.kirim([
+            {'mahasiswa': self.mahasiswa[1].pk, 'komponen': self.uts.pk, 'nilai_angka': '70'},
+            {'mahasiswa': self.mahasiswa[0].pk, 'komponen': self.uts.pk, 'nilai_angka': '70'},
+            {'mahasiswa': self.dosen.pk, 'komponen': 999, 'nilai_angka': '70'},
+            {'mahasiswa': self.mahasiswa[1].pk, 'komponen': self.uts.pk, 'nilai_angka': '70'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        errors = {int(index): sorted(item) for index, item in response.data.items()}
+        self.assertEqual(errors, {1: ['non_field_errors'], 2: ['komponen', 'mahasiswa'], 3: ['non_field_errors']})
+        # Satu item salah membatalkan seluruh grid.
+        self.assertEqual(Assessment.objects.count(), 1)
+
+        response = self.kirim([{'mahasiswa': self.mahasiswa[1].pk, 'komponen': self.uts.pk, 'nilai_angka': '101'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.kirim({'mahasiswa': 1}).status_code, 400)
+
+    def test_put_upserts(self):
+        Assessment.objects.create(mahasiswa=self.mahasiswa[0], komponen=self.uts, nilai_angka=Decimal('50'))
+        response = self.kirim(self.grid(self.mahasiswa[:1], nilai='90'), method='put')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data, {'jumlah': 2, 'dibuat': 1, 'diperbarui': 1})
+        self.assertEqual(
+            sorted(Assessment.objects.values_list('komponen__nama_komponen', 'nilai_angka')),
+            [('UAS', Decimal('90.00')), ('UTS', Decimal('90.00'))]
+        )
+
+    def test_mahasiswa_forbidden(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.mahasiswa[0])}')
+        self.assertEqual(self.kirim(self.grid(self.mahasiswa[:1])).status_code, 403)
+
+
+class EnrollmentCounterTests(APITestCase):
+    def setUp(self):
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.mk1 = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah 1', jurusan=jurusan)
+        self.mk2 = Matakuliah.objects.create(kode_mk='MK002', nama_mk='Mata Kuliah 2', jurusan=jurusan)
+        self.uts = KomponenNilai.objects.create(matakuliah=self.mk1, nama_komponen='UTS', bobot_persen=Decimal('100'))
+        self.mahasiswa = CustomUser.objects.bulk_create([
+            CustomUser(email=f'm{i}@student.prasetiyamulya.ac.id', full_name=f'M{i}') for i in range(3)
+        ])
+
+    def total(self):
+        return dict(Matakuliah.objects.values_list('kode_mk', 'total_mahasiswa'))
+
+    def test_signals_keep_count(self):
+        nilai = [NilaiAkhir.objects.create(mahasiswa=m, matakuliah=self.mk1) for m in self.mahasiswa]
+        NilaiAkhir.objects.create(mahasiswa=self.mahasiswa[0], matakuliah=self.mk2)
+        self.assertEqual(self.total(), {'MK001': 3, 'MK002': 1})
+
+        nilai[0].nilai_total = Decimal('90')
+        nilai[0].save()
+        nilai[1].delete()
+        self.assertEqual(self.total(), {'MK001': 2, 'MK002': 1})
+
+        # Cascade dari penghapusan mahasiswa ikut mengurangi.
+        self.mahasiswa[0].delete()
+        self.assertEqual(self.total(), {'MK001': 1, 'MK002': 0})
+
+    def test_bulk_upsert_recounts(self):
+        from .utils import hitung_nilai_akhir_matakuliah
+
+        Assessment.objects.bulk_create([
+            Assessment(mahasiswa=m, komponen=self.uts, matakuliah=self.mk1, nilai_angka=Decimal('70'))
+            for m in self.mahasiswa
+        ])
+        hitung_nilai_akhir_matakuliah('MK001')
+        hitung_nilai_akhir_matakuliah('MK001')
+        self.assertEqual(self.total(), {'MK001': 3, 'MK002': 0})
+
+    def test_count_in_response(self):
+        NilaiAkhir.objects.create(mahasiswa=self.mahasiswa[0], matakuliah=self.mk1)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.mahasiswa[1])}')
+        response = self.client.get('/api/academic/matakuliah/MK001/')
+        self.assertEqual(response.data['total_mahasiswa'], 1)
+
+
+class QueryBudgetTests(APITestCase):
+    """Mendeteksi N+1: jumlah query tiap endpoint tidak boleh ikut tumbuh bersama data."""
+
+    measured = {}
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.budgets = json.loads(BUDGET_FILE.read_text())
+
+    @classmethod
+    def tearDownClass(cls):
+        if UPDATE_BUDGETS:
+            budgets = {**cls.budgets, **cls.measured}
+            BUDGET_FILE.write_text(json.dumps(dict(sorted(budgets.items())), indent=2) + '\n')
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN, major=self.jurusan
+        )
+        self.mahasiswa = CustomUser.objects.create(
+            email='mhs@student.prasetiyamulya.ac.id', full_name='Mahasiswa', major=self.jurusan
+        )
+        self.jumlah_matakuliah = 0
+
+    def grow(self, n):
+        """Tambah n mata kuliah, masing-masing dengan n mahasiswa baru dan dua komponen nilai."""
+        for _ in range(n):
+            index = self.jumlah_matakuliah
+            self.jumlah_matakuliah += 1
+
+            jurusan = Jurusan.objects.create(kode=f'J{index}', nama=f'Jurusan {index}')
+            matakuliah = Matakuliah.objects.create(kode_mk=f'MK{index:03d}', nama_mk=f'Mata Kuliah {index}', jurusan=jurusan)
+            matakuliah.pengajar.add(self.dosen)
+            komponen = [
+                KomponenNilai.objects.create(matakuliah=matakuliah, nama_komponen='UTS', bobot_persen=Decimal('40')),
+                KomponenNilai.objects.create(matakuliah=matakuliah, nama_komponen='UAS', bobot_persen=Decimal('60')),
+            ]
+            peserta = [self.mahasiswa] + CustomUser.objects.bulk_create([
+                CustomUser(email=f'm{index}-{i}@student.prasetiyamulya.ac.id', full_name=f'M {index}-{i}', major=jurusan)
+                for i in range(n)
+            ])
+            Assessment.objects.bulk_create([
+                Assessment(mahasiswa=mahasiswa, komponen=k, matakuliah=matakuliah, nilai_angka=Decimal('75'))
+                for mahasiswa in peserta for k in komponen
+            ])
+            NilaiAkhir.objects.bulk_create([
+                NilaiAkhir(mahasiswa=mahasiswa, matakuliah=matakuliah, nilai_total=Decimal('75'), nilai_huruf='AB')
+                for mahasiswa in peserta
+            ])
+        perbarui_ringkasan_transkrip([self.mahasiswa.pk])
+
+    def count_queries(self, user, url):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(user)}')
+        # token_version biasanya sudah ter-cache sejak request sebelumnya.
+        versi_token(user.pk)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, f"{url}: {response.content[:200]}")
+        return len(queries)
+
+    def assertQueryBudget(self, name, user, url):
+        counts = []
+        for size in SIZES:
+            self.grow(size)
+            target = url() if callable(url) else url
+            counts.append(self.count_queries(user, target))
+
+        self.measured[name] = max(counts)
+        self.assertEqual(
+            len(set(counts)), 1,
+            f"{name}: jumlah query tumbuh bersama data {dict(zip(SIZES, counts))}"
+        )
+        if not UPDATE_BUDGETS:
+            self.assertIn(name, self.budgets, f"{name} belum punya batas di {BUDGET_FILE.name}")
+            self.assertLessEqual(
+                counts[0], self.budgets[name],
+                f"{name}: {counts[0]} query melebihi batas {self.budgets[name]}"
+            )
+
+    def test_jurusan_list(self):
+        self.assertQueryBudget('jurusan-list', self.dosen, '/api/academic/jurusan/')
+
+    def test_jurusan_detail(self):
+        self.assertQueryBudget('jurusan-detail', self.dosen, '/api/academic/jurusan/J0/')
+
+    def test_matakuliah_list(self):
+        self.assertQueryBudget('matakuliah-list', self.dosen, '/api/academic/matakuliah/')
+
+    def test_matakuliah_detail(self):
+        self.assertQueryBudget('matakuliah-detail', self.dosen, '/api/academic/matakuliah/MK000/')
+
+    def test_komponen_list(self):
+        self.assertQueryBudget('komponen-list', self.dosen, '/api/academic/komponen/')
+
+    def test_komponen_list_per_matakuliah(self):
+        self.assertQueryBudget(
+            'komponen-list-matakuliah', self.dosen, '/api/academic/komponen/?matakuliah_kode_mk=MK000'
+        )
+
+    def test_komponen_detail(self):
+        self.assertQueryBudget(
+            'komponen-detail', self.dosen, lambda: f'/api/academic/komponen/{KomponenNilai.objects.first().pk}/'
+        )
+
+    def test_assessment_list(self):
+        self.assertQueryBudget('assessment-list', self.dosen, '/api/academic/assessment/')
+
+    def test_assessment_list_per_matakuliah(self):
+        self.assertQueryBudget(
+            'assessment-list-matakuliah', self.dosen, '/api/academic/assessment/?matakuliah_kode_mk=MK000'
+        )
+
+    def test_assessment_detail(self):
+        self.assertQueryBudget(
+            'assessment-detail', self.dosen, lambda: f'/api/academic/assessment/{Assessment.objects.first().pk}/'
+        )
+
+    def test_nilai_akhir_list_dosen(self):
+        self.assertQueryBudget('nilai-akhir-list-dosen', self.dosen, '/api/academic/nilai-akhir/')
+
+    def test_nilai_akhir_list_mahasiswa(self):
+        self.assertQueryBudget('nilai-akhir-list-mahasiswa', self.mahasiswa, '/api/academic/nilai-akhir/')
+
+    def test_nilai_akhir_detail(self):
+        self.assertQueryBudget(
+            'nilai-akhir-detail', self.mahasiswa,
+            lambda: f'/api/academic/nilai-akhir/{NilaiAkhir.objects.filter(mahasiswa=self.mahasiswa).first().pk}/'
+        )
+
+    def test_nilai_akhir_summary(self):
+        self.assertQueryBudget('nilai-akhir-summary', self.mahasiswa, '/api/academic/nilai-akhir/summary/')
+
+    def test_mahasiswa_list(self):
+        self.assertQueryBudget('mahasiswa-list', self.dosen, '/api/academic/mahasiswa/')
+
+    def test_dashboard_mahasiswa(self):
+        self.assertQueryBudget('dashboard-mahasiswa', self.mahasiswa, '/api/academic/dashboard/')
+
+    def test_dashboard_dosen(self):
+        self.assertQueryBudget('dashboard-dosen', self.dosen, '/api/academic/dashboard/')
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class SeedSyntheticTests(APITestCase):
+    options = {'jurusan': 2, 'dosen': 3, 'mahasiswa': 12, 'matakuliah': 4, 'komponen': 3, 'mahasiswa_per_mk': 5}
+
+    def seed(self):
+        from django.core.management import call_command
+        call_command('seed_synthetic', stdout=StringIO(), **self.options)
+        return {
+            'user': list(CustomUser.objects.order_by('email').values_list('email', 'full_name', 'role', 'major_id')),
+            'matakuliah': list(Matakuliah.objects.order_by('pk').values_list('pk', 'sks', 'jurusan_id')),
+            'pengajar': list(Matakuliah.pengajar.through.objects.order_by('matakuliah_id', 'customuser__email')
+                             .values_list('matakuliah_id', 'customuser__email')),
+            'komponen': list(KomponenNilai.objects.order_by('matakuliah_id', 'nama_komponen')
+                             .values_list('matakuliah_id', 'nama_komponen', 'bobot_persen')),
+            'assessment': list(Assessment.objects.order_by('mahasiswa__email', 'komponen__matakuliah_id', 'komponen__nama_komponen')
+                               .values_list('mahasiswa__email', 'komponen__matakuliah_id', 'komponen__nama_komponen', 'nilai_angka')),
+            'nilai_akhir': list(NilaiAkhir.objects.order_by('mahasiswa__email', 'matakuliah_id')
+                                .values_list('mahasiswa__email', 'matakuliah_id', 'nilai_total', 'nilai_huruf')),
+            'ringkasan': list(RingkasanTranskrip.objects.order_by('mahasiswa__email')
+                              .values_list('mahasiswa__email', 'total_sks', 'ipk')),
+        }
+
+    def test_counts_and_determinism(self):
+        pertama = self.seed()
+        self.assertEqual(
+            {nama: len(rows) for nama, rows in pertama.items() if nama != 'pengajar'},
+            {'user': 15, 'matakuliah': 4, 'komponen': 12, 'assessment': 60, 'nilai_akhir': 20,
+             'ringkasan': len({email for email, *_ in pertama['nilai_akhir']})},
+        )
+        self.assertTrue(all(huruf for *_, huruf in pertama['nilai_akhir']))
+
+        # Database bersih lagi, seed yang sama: data yang dihasilkan harus identik.
+        Jurusan.objects.all().delete()
+        CustomUser.objects.all().delete()
+        self.assertEqual(self.seed(), pertama)
+
+    def test_refuses_existing_data(self):
+        from django.core.management import CommandError, call_command
+        self.seed()
+        with self.assertRaises(CommandError):
+            call_command('seed_synthetic', stdout=StringIO(), **self.options)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'], ALLOWED_HOSTS=['127.0.0.1'])
+class BenchApiTests(TransactionTestCase):
+    # Server bench_api berjalan di thread lain, jadi datanya harus sudah di-commit.
+
+    def test_smoke_report(self):
+        from django.core.management import call_command
+
+        cache.clear()
+        call_command(
+            'seed_synthetic', stdout=StringIO(), jurusan=1, dosen=2, mahasiswa=6, matakuliah=2, komponen=2, mahasiswa_per_mk=3
+        )
+        output = os.path.join(tempfile.mkdtemp(), 'bench.json')
+        call_command(
+            'bench_api', concurrency='1', duration=0.5, warmup=0, output=output, stdout=StringIO(), stderr=StringIO(),
+            mix='login=1,matakuliah=1,assessment=1,calculate=1,transkrip=1,ringkasan=1,dashboard=1',
+        )
+        with open(output) as f:
+            hasil = json.load(f)
+
+        [level] = hasil['levels']
+        self.assertEqual(level['concurrency'], 1)
+        self.assertGreater(level['requests'], 0)
+        ringkasan = [level, *level['per_operasi'].values()]
+        self.assertTrue(set(level['per_operasi']) <= set(hasil['mix']))
+        for r in ringkasan:
+            self.assertEqual(r['errors'], 0)
+            self.assertEqual(set(r['latency_ms']), {'p50', 'p95', 'p99', 'mean'})
+            self.assertGreater(r['rps'], 0)
+            self.assertIsNotNone(r['queries_per_request'])
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN, major=jurusan
+        )
+        matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=jurusan)
+        komponen = KomponenNilai.objects.create(matakuliah=matakuliah, nama_komponen='UAS', bobot_persen=Decimal('100'))
+        mahasiswa = CustomUser.objects.bulk_create([
+            CustomUser(email=f'm{i}@student.prasetiyamulya.ac.id', full_name=f'M {i}', major=jurusan)
+            for i in range(25)
+        ])
+        Assessment.objects.bulk_create([
+            Assessment(mahasiswa=m, komponen=komponen, matakuliah=matakuliah, nilai_angka=Decimal('70')) for m in mahasiswa
+        ])
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.dosen)}')
+        versi_token(self.dosen.pk)
+
+    def test_walk_all_pages(self):
+        url, ids, query_counts = '/api/academic/assessment/?page_size=10', [], []
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            ids.extend(item['id'] for item in response.data['results'])
+            query_counts.append(len(queries))
+            url = response.data['next']
+
+        self.assertEqual(ids, sorted(Assessment.objects.values_list('id', flat=True)))
+        self.assertEqual(len(query_counts), 3)
+        self.assertEqual(len(set(query_counts)), 1, f"Halaman dalam lebih mahal: {query_counts}")
+        self.assertFalse(any('OFFSET' in q['sql'] for q in queries.captured_queries))
+
+    def test_page_size_capped(self):
+        with mock.patch.object(AcademicCursorPagination, 'max_page_size', 20):
+            response = self.client.get('/api/academic/mahasiswa/?page_size=100000')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIsNotNone(response.data['next'])
+
+
+class StreamingExportTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN, major=jurusan
+        )
+        matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=jurusan)
+        komponen = KomponenNilai.objects.create(matakuliah=matakuliah, nama_komponen='UAS', bobot_persen=Decimal('100'))
+        self.mahasiswa = CustomUser.objects.bulk_create([
+            CustomUser(email=f'm{i}@student.prasetiyamulya.ac.id', full_name=f'M {i}', major=jurusan)
+            for i in range(30)
+        ])
+        Assessment.objects.bulk_create([
+            Assessment(mahasiswa=m, komponen=komponen, matakuliah=matakuliah, nilai_angka=Decimal('70.5')) for m in self.mahasiswa
+        ])
+        NilaiAkhir.objects.bulk_create([
+            NilaiAkhir(mahasiswa=m, matakuliah=matakuliah, nilai_total=Decimal('70.5'), nilai_huruf='B')
+            for m in self.mahasiswa
+        ])
+
+    def get_stream(self, user, url):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(user)}')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_assessment_csv(self):
+        lines = self.get_stream(self.dosen, '/api/academic/assessment/export/?matakuliah_kode_mk=MK001').splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['id', 'mahasiswa_id', 'email'])
+        self.assertEqual(len(lines), 31)
+        self.assertTrue(lines[1].endswith(',MK001,%d,UAS,70.50' % KomponenNilai.objects.get().pk))
+
+    def test_nilai_akhir_jsonl_scoped_to_mahasiswa(self):
+        lines = self.get_stream(self.mahasiswa[0], '/api/academic/nilai-akhir/export/?tipe=jsonl').splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual((row['email'], row['nilai_total'], row['nilai_huruf']), (self.mahasiswa[0].email, '70.50', 'B'))
+
+    def test_assessment_export_requires_dosen(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.mahasiswa[0])}')
+        self.assertEqual(self.client.get('/api/academic/assessment/export/').status_code, 403)
+
+    def test_unknown_tipe(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.dosen)}')
+        self.assertEqual(self.client.get('/api/academic/nilai-akhir/export/?tipe=xml').status_code, 400)
+
+
+class ClaimsAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.mahasiswa = CustomUser.objects.create(email='mhs@student.prasetiyamulya.ac.id', full_name='Mahasiswa')
+
+    def get(self, token, url='/api/academic/nilai-akhir/'):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return self.client.get(url)
+
+    def test_read_uses_claims_only(self):
+        token = access_token(self.mahasiswa)
+        versi_token(self.mahasiswa.pk)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.get(token).status_code, 200)
+        self.assertFalse(any('users_customuser' in q['sql'] for q in queries.captured_queries))
+
+    def test_claims_user_matches_model_types(self):
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+        from .authentication import ClaimsUser
+        from .views import IsMahasiswaSelf
+
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.mahasiswa.major = jurusan
+        self.mahasiswa.save()
+        user = ClaimsUser(JWTAuthentication().get_validated_token(str(access_token(self.mahasiswa))))
+        self.assertEqual((user.id, user.pk, user.major_id), (self.mahasiswa.pk, self.mahasiswa.pk, 'DBT'))
+        self.assertEqual(user.major, jurusan)
+
+        nilai = NilaiAkhir(mahasiswa=self.mahasiswa)
+        request = mock.Mock(user=user)
+        self.assertTrue(IsMahasiswaSelf().has_object_permission(request, None, nilai))
+
+    def test_revoked_token_rejected(self):
+        token = access_token(self.mahasiswa)
+        self.assertEqual(self.get(token).status_code, 200)
+
+        self.mahasiswa.cabut_token()
+        self.assertEqual(self.get(token).status_code, 401)
+        self.assertEqual(self.get(access_token(self.mahasiswa)).status_code, 200)
+
+    def test_password_change_revokes_refresh(self):
+        refresh = CustomTokenObtainPairSerializer.get_token(self.mahasiswa)
+        self.mahasiswa.set_password('password-baru-123')
+        self.mahasiswa.save()
+
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 401)
+
+    def test_privilege_change_revokes_tokens(self):
+        staff = CustomUser.objects.create(email='staff@prasetiyamulya.ac.id', full_name='Staff', is_staff=True)
+        refresh = CustomTokenObtainPairSerializer.get_token(staff)
+        token = refresh.access_token
+        self.assertEqual(self.get(token, '/api/academic/cache-stats/').status_code, 200)
+
+        staff = CustomUser.objects.get(pk=staff.pk)
+        staff.is_staff = False
+        staff.save()
+        self.assertEqual(self.get(token, '/api/academic/cache-stats/').status_code, 401)
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 401)
+
+        # Perubahan field lain tidak mencabut token.
+        token = access_token(staff)
+        staff.full_name = 'Nama Baru'
+        staff.save()
+        self.assertEqual(self.get(token).status_code, 200)
+
+    def test_login_rehash_keeps_new_token_valid(self):
+        from django.contrib.auth.hashers import make_password
+
+        # Hasher non-utama: login meng-hash ulang password lewat save(update_fields=['password']).
+        CustomUser.objects.filter(pk=self.mahasiswa.pk).update(
+            password=make_password('password-lama-123', hasher='pbkdf2_sha1')
+        )
+        response = self.client.post(
+            '/api/auth/login/', {'email': self.mahasiswa.email, 'password': 'password-lama-123'}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertTrue(CustomUser.objects.get(pk=self.mahasiswa.pk).password.startswith('pbkdf2_sha256$'))
+        self.assertEqual(self.get(response.data['access']).status_code, 200)
+
+    def test_inactive_user_rejected(self):
+        token = access_token(self.mahasiswa)
+        self.mahasiswa.is_active = False
+        self.mahasiswa.save()
+        self.assertEqual(self.get(token).status_code, 401)
+
+
+class UserCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.staff = CustomUser.objects.create(
+            email='admin@prasetiyamulya.ac.id', full_name='Admin', role=CustomUser.Role.DOSEN,
+            major=jurusan, is_staff=True,
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.staff)}')
+
+    def user_queries(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            getattr(self.client, method)(url, data, format='json')
+        return sum('FROM "users_customuser"' in q['sql'] for q in queries.captured_queries)
+
+    def test_write_requests_reuse_cached_user(self):
+        url = '/api/academic/nilai-akhir/calculate_course/'
+        awal = user_cache.stats()
+        # Request pertama: token_version + user; berikutnya keduanya dari cache.
+        self.assertEqual(self.user_queries('post', url, {'matakuliah_kode': 'X'}), 2)
+        self.assertEqual(self.user_queries('post', url, {'matakuliah_kode': 'X'}), 0)
+
+        stats = user_cache.stats()
+        self.assertEqual((stats['hits'] - awal['hits'], stats['misses'] - awal['misses'], stats['size']), (1, 1, 1))
+
+    def test_save_invalidates(self):
+        from . import jobs
+
+        def user_request():
+            # request.user untuk request tulis diambil dari user_cache.
+            with mock.patch.object(jobs, 'enqueue', wraps=jobs.enqueue) as enqueue:
+                response = self.client.post(
+                    '/api/academic/nilai-akhir/calculate_course/?background=1', {'matakuliah_kode': 'MK001'}, format='json'
+                )
+            self.assertEqual(response.status_code, 202)
+            return enqueue.call_args.kwargs['user']
+
+        Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=self.staff.major)
+        self.assertEqual(user_request().full_name, 'Admin')
+        self.assertEqual(user_cache.stats()['size'], 1)
+
+        self.staff.full_name = 'Admin Baru'
+        self.staff.save()
+        self.assertEqual(user_cache.stats()['size'], 0)
+        self.assertEqual(user_request().full_name, 'Admin Baru')
+
+    def test_cached_copy_is_isolated(self):
+        user_cache.get(self.staff.pk, 0).full_name = 'Diubah'
+        self.assertEqual(user_cache.get(self.staff.pk, 0).full_name, 'Admin')
+
+    def test_stats_endpoint_staff_only(self):
+        response = self.client.get('/api/academic/cache-stats/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('hit_rate', response.data['user'])
+
+        mahasiswa = CustomUser.objects.create(email='mhs@student.prasetiyamulya.ac.id', full_name='M')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(mahasiswa)}')
+        self.assertEqual(self.client.get('/api/academic/cache-stats/').status_code, 403)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class CohortRegistrationTests(APITestCase):
+    url = '/api/auth/register/cohort/'
+
+    def setUp(self):
+        cache.clear()
+        Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.staff = CustomUser.objects.create(
+            email='admin@prasetiyamulya.ac.id', full_name='Admin', role=CustomUser.Role.DOSEN, is_staff=True
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.staff)}')
+
+    def test_per_row_results(self):
+        response = self.client.post(self.url, {
+            'password_default': 'rahasia123',
+            'users': [
+                {'email': 'Baru@student.prasetiyamulya.ac.id', 'full_name': 'Baru', 'major': 'DBT'},
+                {'email': 'dosen.baru@prasetiyamulya.ac.id', 'full_name': 'Dosen Baru', 'password': 'lain12345'},
+                {'email': 'admin@prasetiyamulya.ac.id', 'full_name': 'Sudah Ada'},
+                {'email': 'baru@student.prasetiyamulya.ac.id', 'full_name': 'Duplikat'},
+                {'email': 'orang@gmail.com', 'full_name': 'Luar'},
+                {'email': 'x@student.prasetiyamulya.ac.id', 'full_name': 'X', 'major': 'NOPE'},
+            ],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['dibuat'], response.data['gagal']), (2, 4))
+        self.assertEqual([item['status'] for item in response.data['hasil']], ['dibuat', 'dibuat'] + ['gagal'] * 4)
+
+        baru = CustomUser.objects.get(email='baru@student.prasetiyamulya.ac.id')
+        self.assertEqual((baru.role, baru.major_id), (CustomUser.Role.MAHASISWA, 'DBT'))
+        self.assertTrue(baru.check_password('rahasia123'))
+        dosen = CustomUser.objects.get(email='dosen.baru@prasetiyamulya.ac.id')
+        self.assertEqual(dosen.role, CustomUser.Role.DOSEN)
+        self.assertTrue(dosen.check_password('lain12345'))
+
+    def test_password_validators_per_row(self):
+        response = self.client.post(self.url, {
+            'password_default': 'rahasia123',
+            'users': [
+                {'email': 'a@student.prasetiyamulya.ac.id', 'full_name': 'A'},
+                {'email': 'b@student.prasetiyamulya.ac.id', 'full_name': 'B', 'password': '12345678'},
+                {'email': 'c@student.prasetiyamulya.ac.id', 'full_name': 'C', 'password': 'pendek'},
+            ],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['status'] for item in response.data['hasil']], ['dibuat', 'gagal', 'gagal'])
+        self.assertIn('password', response.data['hasil'][1]['errors'])
+        self.assertIn('password', response.data['hasil'][2]['errors'])
+        self.assertFalse(CustomUser.objects.filter(email__in=['b@student.prasetiyamulya.ac.id', 'c@student.prasetiyamulya.ac.id']).exists())
+
+    def test_email_registered_concurrently(self):
+        from . import cohort
+
+        asli = cohort.hash_passwords
+
+        def daftar_duluan(passwords, workers=None):
+            # Request lain mendaftarkan email yang sama setelah pengecekan awal.
+            CustomUser.objects.create(email='a@student.prasetiyamulya.ac.id', full_name='Lebih Dulu')
+            return asli(passwords, workers)
+
+        with mock.patch.object(cohort, 'hash_passwords', side_effect=daftar_duluan):
+            response = self.client.post(self.url, {
+                'password_default': 'rahasia123',
+                'users': [
+                    {'email': 'a@student.prasetiyamulya.ac.id', 'full_name': 'A'},
+                    {'email': 'b@student.prasetiyamulya.ac.id', 'full_name': 'B'},
+                ],
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['dibuat'], response.data['gagal']), (1, 1))
+        self.assertEqual(response.data['hasil'][0]['errors'], {'email': "Email sudah terdaftar."})
+        self.assertEqual(CustomUser.objects.get(email='a@student.prasetiyamulya.ac.id').full_name, 'Lebih Dulu')
+        self.assertTrue(CustomUser.objects.filter(email='b@student.prasetiyamulya.ac.id').exists())
+
+    def test_staff_only(self):
+        mahasiswa = CustomUser.objects.create(email='mhs@student.prasetiyamulya.ac.id', full_name='M')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(mahasiswa)}')
+        self.assertEqual(self.client.post(self.url, [], format='json').status_code, 403)
+
+    def test_process_pool_hashing(self):
+        hashes = hash_passwords([f'password{i}' for i in range(MIN_POOL)], workers=2)
+        self.assertTrue(all(check_password(f'password{i}', h) for i, h in enumerate(hashes)))
+
+
+class CatalogCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=self.jurusan)
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+
+    def get(self, url='/api/academic/matakuliah/'):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data, len(queries)
+
+    def test_second_read_served_from_cache(self):
+        _, pertama = self.get()
+        data, kedua = self.get()
+        self.assertGreater(pertama, 0)
+        self.assertEqual(kedua, 0)
+        self.assertEqual(data['results'][0]['kode_mk'], 'MK001')
+
+    def test_changes_bump_version(self):
+        self.get()
+        self.matakuliah.pengajar.add(self.dosen)
+        data, _ = self.get()
+        self.assertEqual(data['results'][0]['pengajar'], [{'full_name': 'Dosen', 'email': self.dosen.email}])
+
+        self.dosen.full_name = 'Dosen Baru'
+        self.dosen.save()
+        data, _ = self.get()
+        self.assertEqual(data['results'][0]['pengajar'][0]['full_name'], 'Dosen Baru')
+
+        mahasiswa = CustomUser.objects.create(email='mhs@student.prasetiyamulya.ac.id', full_name='M')
+        NilaiAkhir.objects.create(mahasiswa=mahasiswa, matakuliah=self.matakuliah)
+        data, _ = self.get()
+        self.assertEqual(data['results'][0]['total_mahasiswa'], 1)
+
+        self.jurusan.nama = 'DBT Baru'
+        self.jurusan.save()
+        data, _ = self.get('/api/academic/jurusan/DBT/')
+        self.assertEqual(data['nama'], 'DBT Baru')
+
+    def test_regrading_keeps_catalog_version(self):
+        from .catalog_cache import versi_katalog
+
+        komponen = KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UAS', bobot_persen=Decimal('100'))
+        mahasiswa = CustomUser.objects.create(email='mhs@student.prasetiyamulya.ac.id', full_name='M')
+        with self.captureOnCommitCallbacks(execute=True):
+            assessment = Assessment.objects.create(mahasiswa=mahasiswa, komponen=komponen, nilai_angka=Decimal('70'))
+        versi = versi_katalog()
+        self.assertEqual(self.get()[0]['results'][0]['total_mahasiswa'], 1)
+
+        # Nilai peserta yang sama dihitung ulang: total_mahasiswa tetap, cache katalog tetap dipakai.
+        for nilai in (75, 80, 85):
+            with self.captureOnCommitCallbacks(execute=True):
+                assessment.nilai_angka = Decimal(nilai)
+                assessment.save()
+        self.assertEqual(NilaiAkhir.objects.get().nilai_total, Decimal('85.00'))
+        self.assertEqual(versi_katalog(), versi)
+        self.assertEqual(self.get()[1], 0)
+
+    def test_file_based_backend(self):
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': cache_dir}
+        }):
+            self.get()
+            _, jumlah = self.get()
+            self.assertEqual(jumlah, 0)
+            Matakuliah.objects.create(kode_mk='MK002', nama_mk='Baru', jurusan=self.jurusan)
+            data, _ = self.get()
+            self.assertEqual(len(data['results']), 2)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=self.jurusan)
+        self.komponen = KomponenNilai.objects.create(
+            matakuliah=self.matakuliah, nama_komponen='UTS', bobot_persen=Decimal('100')
+        )
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.mahasiswa = CustomUser.objects.create(email='mhs@student.prasetiyamulya.ac.id', full_name='M')
+        self.assessment = Assessment.objects.create(
+            mahasiswa=self.mahasiswa, komponen=self.komponen, nilai_angka=Decimal('80')
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.dosen)}')
+        versi_token(self.dosen.pk)
+
+    def get(self, url, **headers):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, headers=headers)
+        return response, len(queries)
+
+    def test_not_modified_skips_list_query(self):
+        url = '/api/academic/assessment/'
+        response, _ = self.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        # Validator dibaca dari cache; 304 tidak menyentuh database sama sekali.
+        response, jumlah = self.get(url, if_none_match=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(jumlah, 0)
+        self.assertEqual(response.content, b'')
+
+    def test_etag_changes_on_update_and_delete(self):
+        url = f'/api/academic/assessment/{self.assessment.pk}/'
+        etag = self.get(url)[0]['ETag']
+
+        self.assessment.nilai_angka = Decimal('90')
+        self.assessment.save()
+        response, _ = self.get(url, if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['nilai_angka'], '90.00')
+
+        # Nama komponen ikut tampil, jadi perubahan komponen juga mengubah ETag.
+        etag = response['ETag']
+        self.komponen.nama_komponen = 'UAS'
+        self.komponen.save()
+        self.assertEqual(self.get(url, if_none_match=etag)[0].status_code, 200)
+
+        # Begitu juga nama mahasiswa (mahasiswa_nama).
+        etag = self.get(url)[0]['ETag']
+        self.mahasiswa.full_name = 'Nama Baru'
+        self.mahasiswa.save()
+        response = self.get(url, if_none_match=etag)[0]
+        self.assertEqual((response.status_code, response.data['mahasiswa_nama']), (200, 'Nama Baru'))
+
+        list_url = '/api/academic/assessment/'
+        etag = self.get(list_url)[0]['ETag']
+        self.assessment.delete()
+        self.assertEqual(self.get(list_url, if_none_match=etag)[0].status_code, 200)
+
+    def test_etag_changes_on_bulk_writes(self):
+        from .imports import impor_nilai_assessment
+        from .utils import hitung_nilai_akhir_matakuliah
+
+        url = '/api/academic/nilai-akhir/'
+        etag = self.get(url)[0]['ETag']
+        # Upsert NilaiAkhir memakai bulk_create tanpa signal.
+        with self.captureOnCommitCallbacks(execute=True):
+            hitung_nilai_akhir_matakuliah('MK001')
+        response, _ = self.get(url, if_none_match=etag)
+        self.assertEqual(response.status_code, 200)
+
+        url = '/api/academic/assessment/'
+        etag = self.get(url)[0]['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            impor_nilai_assessment('MK001', [['email', 'UTS'], ['mhs@student.prasetiyamulya.ac.id', '70']])
+        self.assertEqual(self.get(url, if_none_match=etag)[0].status_code, 200)
+
+    def test_if_modified_since_for_detail(self):
+        url = f'/api/academic/assessment/{self.assessment.pk}/'
+        last_modified = self.get(url)[0]['Last-Modified']
+        self.assertEqual(self.get(url, if_modified_since=last_modified)[0].status_code, 304)
+        self.assertEqual(self.get('/api/academic/assessment/', if_modified_since=last_modified)[0].status_code, 200)
+
+    def test_catalog_etag_without_queries(self):
+        url = '/api/academic/matakuliah/'
+        etag = self.get(url)[0]['ETag']
+        response, jumlah = self.get(url, if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(jumlah, 0)
+
+        self.matakuliah.nama_mk = 'Nama Baru'
+        self.matakuliah.save()
+        self.assertEqual(self.get(url, if_none_match=etag)[0].status_code, 200)
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=self.jurusan)
+        komponen = KomponenNilai.objects.create(
+            matakuliah=self.matakuliah, nama_komponen='UTS', bobot_persen=Decimal('100')
+        )
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.matakuliah.pengajar.add(self.dosen)
+        mahasiswa = CustomUser.objects.create(email='mhs@student.prasetiyamulya.ac.id', full_name='M')
+        Assessment.objects.create(mahasiswa=mahasiswa, komponen=komponen, nilai_angka=Decimal('80.5'))
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.dosen)}')
+        versi_token(self.dosen.pk)
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [q['sql'] for q in queries]
+
+    def test_fields_trim_output_and_columns(self):
+        response, queries = self.get('/api/academic/assessment/?fields=id,nilai_angka')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'nilai_angka'})
+        self.assertEqual(response.json()['results'][0]['nilai_angka'], '80.50')
+        list_sql = queries[-1]
+        self.assertNotIn('JOIN', list_sql)
+        self.assertNotIn('"matakuliah_id"', list_sql.split('FROM')[0])
+
+        response, queries = self.get('/api/academic/assessment/?fields=id,komponen_nama')
+        self.assertEqual(response.data['results'][0], {'id': response.data['results'][0]['id'], 'komponen_nama': 'UTS'})
+        self.assertIn('users_komponennilai', queries[-1])
+        self.assertNotIn('users_customuser', queries[-1])
+
+    def test_nested_and_method_fields(self):
+        response, queries = self.get('/api/academic/matakuliah/?fields=kode_mk,jurusan')
+        self.assertEqual(response.data['results'][0], {
+            'kode_mk': 'MK001', 'jurusan': {'kode': 'DBT', 'nama': 'Digital Business Technology'}
+        })
+        self.assertFalse(any('users_customuser' in sql for sql in queries))
+
+        response, _ = self.get('/api/academic/matakuliah/MK001/?fields=pengajar')
+        self.assertEqual(response.data, {'pengajar': [{'full_name': 'Dosen', 'email': self.dosen.email}]})
+
+    def test_unknown_field_rejected(self):
+        response, _ = self.get('/api/academic/nilai-akhir/?fields=id,rahasia')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('rahasia', str(response.data['fields']))
+
+    def test_fast_renderer_matches_json_renderer(self):
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+        from .renderers import FastJSONRenderer
+
+        data = {'nilai': Decimal('80.50'), 'pesan': gettext_lazy('Nama'), 'daftar': [1, 'ö ']}
+        self.assertEqual(
+            json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data))
+        )
+        self.assertNotIn(b'\xe2\x80\xa8', FastJSONRenderer().render(data))
+
+
+class DashboardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.mahasiswa = [
+            CustomUser.objects.create(email=f'm{i}@student.prasetiyamulya.ac.id', full_name=f'M{i}') for i in range(2)
+        ]
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', sks=3, jurusan=jurusan)
+        self.matakuliah.pengajar.add(self.dosen)
+        Matakuliah.objects.create(kode_mk='MK002', nama_mk='Lain', jurusan=jurusan)
+        uts = KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UTS', bobot_persen=Decimal('40'))
+        KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UAS', bobot_persen=Decimal('60'))
+        for mahasiswa in self.mahasiswa:
+            NilaiAkhir.objects.create(mahasiswa=mahasiswa, matakuliah=self.matakuliah)
+        Assessment.objects.create(mahasiswa=self.mahasiswa[0], komponen=uts, nilai_angka=Decimal('90'))
+        NilaiAkhir.objects.filter(mahasiswa=self.mahasiswa[0]).update(nilai_total=Decimal('90'), nilai_huruf='A')
+        perbarui_ringkasan_transkrip([self.mahasiswa[0].pk])
+
+    def get(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(user)}')
+        response = self.client.get('/api/academic/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_mahasiswa_payload(self):
+        data = self.get(self.mahasiswa[0])
+        self.assertEqual([mk['kode_mk'] for mk in data['matakuliah']], ['MK001'])
+        self.assertEqual([n['nilai_huruf'] for n in data['nilai_akhir']], ['A'])
+        self.assertEqual(data['ringkasan']['total_sks'], 3)
+
+        data = self.get(self.mahasiswa[1])
+        self.assertEqual(len(data['matakuliah']), 1)
+        self.assertEqual(data['nilai_akhir'], [])
+
+    def test_dosen_progress(self):
+        data = self.get(self.dosen)
+        self.assertEqual(len(data['matakuliah']), 1)
+        mk = data['matakuliah'][0]
+        self.assertEqual(
+            (mk['total_mahasiswa'], mk['jumlah_komponen'], mk['nilai_terinput'], mk['nilai_diharapkan']),
+            (2, 2, 1, 4)
+        )
+        self.assertEqual(mk['nilai_akhir_keluar'], 1)
+        self.assertEqual(data['ringkasan']['progres_persen'], 25.0)
+
+
+class BatchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=jurusan)
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.dosen)}')
+
+    def batch(self, items):
+        return self.client.post('/api/batch/', {'requests': items}, format='json')
+
+    def test_reads_in_one_round_trip(self):
+        KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UTS', bobot_persen=Decimal('100'))
+        response = self.batch([
+            {'id': 'mk', 'path': '/api/academic/matakuliah/?fields=kode_mk'},
+            {'id': 'komponen', 'path': '/api/academic/komponen/?matakuliah_kode_mk=MK001'},
+            {'path': '/api/academic/tidak-ada/'},
+            {'path': '/api/auth/register/', 'method': 'POST'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        mk, komponen, hilang, luar = response.data['responses']
+        self.assertEqual((mk['id'], mk['status']), ('mk', 200))
+        self.assertEqual(mk['data']['results'], [{'kode_mk': 'MK001'}])
+        self.assertEqual(komponen['data']['results'][0]['nama_komponen'], 'UTS')
+        self.assertIn('etag', komponen)
+        self.assertEqual((hilang['id'], hilang['status']), (2, 404))
+        self.assertEqual(luar['status'], 400)
+
+    def test_writes_share_one_transaction(self):
+        response = self.batch([
+            {'method': 'POST', 'path': '/api/academic/komponen/',
+             'body': {'matakuliah': 'MK001', 'nama_komponen': 'UTS', 'bobot_persen': '40'}},
+            {'method': 'POST', 'path': '/api/academic/komponen/', 'body': {'matakuliah': 'MK001'}},
+        ])
+        self.assertEqual([r['status'] for r in response.data['responses']], [201, 400])
+        self.assertTrue(response.data['rolled_back'])
+        self.assertFalse(KomponenNilai.objects.exists())
+
+        response = self.batch([
+            {'method': 'POST', 'path': '/api/academic/komponen/',
+             'body': {'matakuliah': 'MK001', 'nama_komponen': 'UTS', 'bobot_persen': '40'}},
+        ])
+        self.assertFalse(response.data['rolled_back'])
+        self.assertEqual(KomponenNilai.objects.count(), 1)
+
+    def test_batch_size_capped(self):
+        from .batch import MAX_BATCH
+        response = self.batch([{'path': '/api/academic/jurusan/'}] * (MAX_BATCH + 1))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.post('/api/batch/', {'requests': 'x'}, format='json').status_code, 400)
+
+
+class AsyncReadTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.mahasiswa = CustomUser.objects.create(email='mhs@student.prasetiyamulya.ac.id', full_name='M')
+        for i in range(3):
+            mk = Matakuliah.objects.create(kode_mk=f'MK00{i}', nama_mk=f'MK {i}', jurusan=jurusan)
+            mk.pengajar.add(self.dosen)
+            NilaiAkhir.objects.create(mahasiswa=self.mahasiswa, matakuliah=mk, nilai_total=Decimal('80'), nilai_huruf='A')
+        self.async_client = AsyncClient()
+
+    def auth(self, user):
+        return {'Authorization': f'Bearer {access_token(user)}'}
+
+    async def test_catalog_pages_match_sync_view(self):
+        response = await self.async_client.get('/api/academic/async/matakuliah/?page_size=2')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([mk['kode_mk'] for mk in data['results']], ['MK000', 'MK001'])
+        self.assertEqual(data['results'][0]['pengajar'], [{'full_name': 'Dosen', 'email': 'dosen@prasetiyamulya.ac.id'}])
+
+        kedua = (await self.async_client.get(data['next'])).json()
+        self.assertEqual([mk['kode_mk'] for mk in kedua['results']], ['MK002'])
+        self.assertIsNone(kedua['next'])
+
+        sync = (await self.async_client.get('/api/academic/matakuliah/?page_size=3')).json()
+        self.assertEqual(sync['results'], data['results'] + kedua['results'])
+
+    async def test_transcript_and_dashboard_need_token(self):
+        response = await self.async_client.get('/api/academic/async/transkrip/')
+        self.assertEqual(response.status_code, 401)
+
+        headers = await sync_to_async(self.auth)(self.mahasiswa)
+        response = await self.async_client.get('/api/academic/async/transkrip/', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 3)
+
+        response = await self.async_client.get('/api/academic/async/dashboard/', headers=headers)
+        self.assertEqual(response.json()['ringkasan']['jumlah_matakuliah'], 3)
+
+        headers = await sync_to_async(self.auth)(self.dosen)
+        response = await self.async_client.get('/api/academic/async/dashboard/', headers=headers)
+        self.assertEqual(response.json()['role'], 'DOSEN')
+        self.assertEqual(len(response.json()['matakuliah']), 3)
+
+    async def test_revoked_token_rejected(self):
+        headers = await sync_to_async(self.auth)(self.mahasiswa)
+        await sync_to_async(self.mahasiswa.cabut_token)()
+        response = await self.async_client.get('/api/academic/async/transkrip/', headers=headers)
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.post('/api/academic/async/transkrip/', headers=headers)
+        self.assertEqual(response.status_code, 405)
+
+
+class StatisticsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=jurusan)
+        self.uts = KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UTS', bobot_persen=Decimal('50'))
+        self.uas = KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UAS', bobot_persen=Decimal('50'))
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        # NilaiAkhir dihitung ulang saat commit, seperti di request sungguhan.
+        with self.captureOnCommitCallbacks(execute=True):
+            for i, (uts, uas) in enumerate([(90, 90), (70, 80), (50, 60), (80, 80)]):
+                mahasiswa = CustomUser.objects.create(email=f'm{i}@student.prasetiyamulya.ac.id', full_name=f'M{i}')
+                Assessment.objects.create(mahasiswa=mahasiswa, komponen=self.uts, nilai_angka=Decimal(uts))
+                Assessment.objects.create(mahasiswa=mahasiswa, komponen=self.uas, nilai_angka=Decimal(uas))
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.dosen)}')
+        versi_token(self.dosen.pk)
+        self.url = '/api/academic/matakuliah/MK001/statistics/'
+
+    def get(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.data, len(queries)
+
+    def test_distribution(self):
+        data, _ = self.get()
+        # Total: 90, 75, 55, 80.
+        self.assertEqual(data['jumlah_mahasiswa'], 4)
+        self.assertEqual(data['nilai_akhir']['mean'], 75.0)
+        self.assertEqual(data['nilai_akhir']['median'], 77.5)
+        self.assertEqual(data['nilai_akhir']['persentil']['25'], 70.0)
+        self.assertEqual(data['histogram_huruf'], {'A': 2, 'AB': 1, 'B': 0, 'BC': 0, 'C': 0, 'D': 1, 'E': 0})
+
+        uts = data['komponen'][0]
+        self.assertEqual((uts['nama_komponen'], uts['jumlah'], uts['max']), ('UTS', 4, 90.0))
+        self.assertEqual({h['rentang']: h['jumlah'] for h in uts['histogram']}['80-90'], 1)
+        self.assertEqual({h['rentang']: h['jumlah'] for h in uts['histogram']}['90-100'], 1)
+
+    def test_statistics_module_fallback_matches_numpy(self):
+        from . import analytics
+        nilai = [90.0, 75.0, 55.0, 75.0, 61.5]
+        with mock.patch.object(analytics, 'np', None):
+            tanpa_numpy = analytics._ringkas(nilai), analytics._histogram_skor(nilai)
+        self.assertEqual((analytics._ringkas(nilai), analytics._histogram_skor(nilai)), tanpa_numpy)
+        with mock.patch.object(analytics, 'np', None):
+            self.assertEqual(analytics._ringkas([80.0])['persentil']['90'], 80.0)
+
+    def test_cached_until_scores_change(self):
+        _, pertama = self.get()
+        data, kedua = self.get()
+        self.assertLess(kedua, pertama)
+        self.assertEqual(kedua, 1)
+
+        # Hitung ulang NilaiAkhir (saat commit) yang menaikkan versi statistik.
+        with self.captureOnCommitCallbacks(execute=True):
+            Assessment.objects.filter(komponen=self.uts, nilai_angka=Decimal('50')).get().delete()
+        data, _ = self.get()
+        self.assertEqual(data['komponen'][0]['jumlah'], 3)
+        self.assertEqual(data['nilai_akhir']['min'], 30.0)
+
+        self.uas.nama_komponen = 'Ujian Akhir'
+        self.uas.save()
+        data, _ = self.get()
+        self.assertEqual(data['komponen'][1]['nama_komponen'], 'Ujian Akhir')
+
+    def test_permissions_and_missing_course(self):
+        self.assertEqual(self.client.get('/api/academic/matakuliah/TIDAK/statistics/').status_code, 404)
+        mahasiswa = CustomUser.objects.get(email='m0@student.prasetiyamulya.ac.id')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(mahasiswa)}')
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class RankingTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', sks=3, jurusan=self.jurusan)
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.mahasiswa = []
+        for i, (total, huruf) in enumerate([(90, 'A'), (75, 'AB'), (75, 'AB'), (55, 'D')]):
+            mahasiswa = CustomUser.objects.create(
+                email=f'm{i}@student.prasetiyamulya.ac.id', full_name=f'M{i}', major=self.jurusan
+            )
+            NilaiAkhir.objects.create(mahasiswa=mahasiswa, matakuliah=self.matakuliah,
+                                      nilai_total=Decimal(total), nilai_huruf=huruf)
+            self.mahasiswa.append(mahasiswa)
+        perbarui_ringkasan_transkrip([m.pk for m in self.mahasiswa])
+
+    def get(self, user, url):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(user)}')
+        versi_token(user.pk)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data, len(queries)
+
+    def test_course_leaderboard(self):
+        data, _ = self.get(self.dosen, '/api/academic/matakuliah/MK001/ranking/?limit=3')
+        self.assertEqual(data['jumlah'], 4)
+        self.assertEqual(
+            [(r['full_name'], r['nilai'], r['peringkat'], r['peringkat_padat']) for r in data['leaderboard']],
+            [('M0', '90.00', 1, 1), ('M1', '75.00', 2, 2), ('M2', '75.00', 2, 2)]
+        )
+        self.assertEqual(data['leaderboard'][0]['persentil'], 100.0)
+
+    def test_own_rank_in_one_query(self):
+        data, jumlah = self.get(self.mahasiswa[3], '/api/academic/matakuliah/MK001/ranking/')
+        self.assertNotIn('leaderboard', data)
+        self.assertEqual(data['mahasiswa'], {
+            'mahasiswa_id': self.mahasiswa[3].pk, 'full_name': 'M3', 'nilai': '55.00',
+            'peringkat': 4, 'peringkat_padat': 3, 'persentil': 0.0,
+        })
+        self.assertEqual(data['jumlah'], 4)
+        # Hanya satu query ber-window; keberadaan mata kuliah tidak dicek terpisah.
+        self.assertEqual(jumlah, 1)
+
+        data, _ = self.get(self.dosen, f'/api/academic/matakuliah/MK001/ranking/?limit=0&mahasiswa_id={self.mahasiswa[1].pk}')
+        self.assertEqual(data['mahasiswa']['peringkat'], 2)
+
+    def test_jurusan_ranking_by_ipk(self):
+        data, _ = self.get(self.dosen, '/api/academic/jurusan/DBT/ranking/')
+        self.assertEqual([r['full_name'] for r in data['leaderboard']], ['M0', 'M1', 'M2', 'M3'])
+        self.assertEqual(data['leaderboard'][0]['nilai'], '4.00')
+
+        data, _ = self.get(self.mahasiswa[1], '/api/academic/jurusan/DBT/ranking/')
+        self.assertEqual((data['mahasiswa']['peringkat'], data['mahasiswa']['nilai']), (2, '3.50'))
+
+    def test_jurusan_ranking_includes_backfilled_students(self):
+        from importlib import import_module
+        from django.apps import apps
+
+        # Mahasiswa lama tanpa ringkasan ikut diperingkat setelah migrasi backfill.
+        RingkasanTranskrip.objects.all().delete()
+        import_module('users.migrations.0010_isi_ringkasantranskrip').isi_ringkasan_transkrip(apps, None)
+        data, jumlah = self.get(self.dosen, '/api/academic/jurusan/DBT/ranking/')
+        self.assertEqual((data['jumlah'], jumlah), (4, 1))
+
+    def test_empty_course_is_not_missing(self):
+        Matakuliah.objects.create(kode_mk='MK002', nama_mk='Kosong', jurusan=self.jurusan)
+        data, _ = self.get(self.dosen, '/api/academic/matakuliah/MK002/ranking/')
+        self.assertEqual((data['jumlah'], data['leaderboard']), (0, []))
+
+    def test_errors(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(self.dosen)}')
+        self.assertEqual(self.client.get('/api/academic/matakuliah/TIDAK/ranking/').status_code, 404)
+        self.assertEqual(self.client.get('/api/academic/matakuliah/MK001/ranking/?limit=x').status_code, 400)
+        self.client.credentials()
+        self.assertEqual(self.client.get('/api/academic/jurusan/DBT/ranking/').status_code, 401)
+        self.assertEqual(self.client.get('/api/academic/jurusan/DBT/').status_code, 200)
+
+
+class JobQueueTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.export_dir = tempfile.mkdtemp()
+        patcher = mock.patch('users.jobs.JOB_EXPORT_DIR', self.export_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        jurusan = Jurusan.objects.create(kode='DBT', nama='Digital Business Technology')
+        self.matakuliah = Matakuliah.objects.create(kode_mk='MK001', nama_mk='Mata Kuliah', jurusan=jurusan)
+        komponen = KomponenNilai.objects.create(matakuliah=self.matakuliah, nama_komponen='UAS', bobot_persen=Decimal('100'))
+        self.dosen = CustomUser.objects.create(
+            email='dosen@prasetiyamulya.ac.id', full_name='Dosen', role=CustomUser.Role.DOSEN
+        )
+        self.mahasiswa = CustomUser.objects.create(email='m0@student.prasetiyamulya.ac.id', full_name='M0')
+        Assessment.objects.create(mahasiswa=self.mahasiswa, komponen=komponen, nilai_angka=Decimal('85'))
+        NilaiAkhir.objects.all().delete()
+
+    def auth(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token(user)}')
+
+    def test_calculate_course_in_background(self):
+        from .jobs import proses_antrian
+
+        self.auth(self.dosen)
+        response = self.client.post(
+            '/api/academic/nilai-akhir/calculate_course/', {'matakuliah_kode': 'MK001', 'background': True}, format='json'
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['status'], 'ANTRI')
+        self.assertFalse(NilaiAkhir.objects.exists())
+
+        self.assertEqual(proses_antrian(burst=True), 1)
+        data = self.client.get(f"/api/academic/jobs/{response.data['id']}/").data
+        self.assertEqual((data['status'], data['progres']), ('SELESAI', 100))
+        self.assertEqual(data['hasil']['jumlah_mahasiswa'], 1)
+        self.assertEqual(NilaiAkhir.objects.get().nilai_huruf, 'A')
+
+        response = self.client.post(
+            '/api/academic/nilai-akhir/calculate_course/?background=1', {'matakuliah_kode': 'TIDAK'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_retry_when_database_locked(self):
+        from django.db import OperationalError
+        from . import jobs, utils
+
+        job = jobs.enqueue('hitung_nilai_matakuliah', {'matakuliah_kode': 'MK001'})
+        asli = utils.hitung_nilai_akhir_matakuliah
+        terkunci = iter([OperationalError('database is locked')] * 2)
+
+        def kadang_terkunci(kode):
+            error = next(terkunci, None)
+            if error:
+                raise error
+            return asli(kode)
+
+        with mock.patch('users.jobs.JOB_RETRY_DELAY', 0), mock.patch.object(
+            utils, 'hitung_nilai_akhir_matakuliah', side_effect=kadang_terkunci
+        ):
+            self.assertEqual(jobs.proses_antrian(burst=True), 3)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.percobaan), (Job.Status.SELESAI, 3))
+
+        job = jobs.enqueue('hitung_nilai_matakuliah', {'matakuliah_kode': 'MK001'})
+        with mock.patch.object(utils, 'hitung_nilai_akhir_matakuliah', side_effect=OperationalError('disk I/O error')):
+            jobs.proses_antrian(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.percobaan, job.error), (Job.Status.GAGAL, 1, 'disk I/O error'))
+
+    def test_export_job_and_download(self):
+        from .jobs import proses_antrian
+
+        self.auth(self.dosen)
+        response = self.client.get('/api/academic/assessment/export/?matakuliah_kode_mk=MK001&background=1')
+        self.assertEqual(response.status_code, 202)
+        url = f"/api/academic/jobs/{response.data['id']}/download/"
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        proses_antrian(burst=True)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,mahasiswa_id,email,matakuliah_kode,komponen_id,nama_komponen,nilai_angka')
+        self.assertEqual(len(lines), 2)
+
+        # Job orang lain tidak terlihat.
+        self.auth(self.mahasiswa)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get('/api/academic/jobs/').data['results'], [])
+
+    def test_cohort_payload_cleared(self):
+        from .jobs import proses_antrian
+
+        admin = CustomUser.objects.create(email='admin@prasetiyamulya.ac.id', full_name='Admin', is_staff=True)
+        self.auth(admin)
+        response = self.client.post('/api/auth/register/cohort/?background=1', {
+            'users': [{'email': 'baru@student.prasetiyamulya.ac.id', 'full_name': 'Baru', 'major': 'DBT'}],
+            'password_default': 'rahasia123',
+        }, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertNotIn('payload', response.data)
+
+        proses_antrian(burst=True)
+        job = Job.objects.get(pk=response.data['id'])
+        self.assertEqual((job.status, job.hasil['dibuat'], job.payload), (Job.Status.SELESAI, 1, {}))
+        self.assertTrue(check_password('rahasia123', CustomUser.objects.get(email='baru@student.prasetiyamulya.ac.id').password))
+
+    def test_stale_jobs_requeued(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .jobs import antrekan_ulang_macet
+
+        lama = timezone.now() - timedelta(hours=2)
+        macet = Job.objects.create(jenis='ekspor', status=Job.Status.BERJALAN, started_at=lama, percobaan=1)
+        habis = Job.objects.create(jenis='ekspor', status=Job.Status.BERJALAN, started_at=lama, percobaan=5)
+        self.assertEqual(antrekan_ulang_macet(60 * 60), (1, 1))
+        macet.refresh_from_db()
+        habis.refresh_from_db()
+        self.assertEqual((macet.status, habis.status), (Job.Status.ANTRI, Job.Status.GAGAL))
+
+    def test_workers_refuse_process_local_cache(self):
+        from django.core.management import CommandError, call_command
+
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with override_settings(CACHES=locmem), self.assertRaises(CommandError):
+            call_command('run_workers', workers=1, burst=True, stdout=StringIO())
+        self.assertNotEqual(
+            django_settings.CACHES['default']['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache'
+        )
+
+    def test_failed_cohort_payload_cleared(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .jobs import antrekan_ulang_macet, enqueue, proses_antrian
+
+        # Daftar user kosong membuat tugasnya gagal.
+        payload = {'users': [], 'password_default': 'rahasia123'}
+        job = enqueue('registrasi_angkatan', payload)
+        proses_antrian(burst=True)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.payload), (Job.Status.GAGAL, {}))
+
+        # Worker mati di percobaan terakhir: ditandai gagal tanpa pernah lewat jalankan_job.
+        job = enqueue('registrasi_angkatan', payload)
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.BERJALAN, started_at=timezone.now() - timedelta(hours=2), percobaan=job.maks_percobaan
+        )
+        antrekan_ulang_macet(60 * 60)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.payload), (Job.Status.GAGAL, {}))
+
+    def test_admin_hides_payload(self):
+        from .jobs import enqueue
+
+        admin = CustomUser.objects.create(
+            email='admin@prasetiyamulya.ac.id', full_name='Admin', is_staff=True, is_superuser=True
+        )
+        job = enqueue('registrasi_angkatan', {'users': [], 'password_default': 'rahasia123'})
+        self.client.force_login(admin)
+        response = self.client.get(f'/admin/users/job/{job.pk}/change/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'rahasia123')
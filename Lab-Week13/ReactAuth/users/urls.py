@@ -1,7 +1,9 @@
 from django.urls import path, include
-from .views import RegisterView, CustomTokenObtainPairView, JurusanViewSet, MatakuliahViewSet, KomponenNilaiViewSet,AssessmentViewSet,NilaiAkhirViewSet, MahasiswaListView
+from .views import RegisterView, CustomTokenObtainPairView, JurusanViewSet, MatakuliahViewSet, KomponenNilaiViewSet,AssessmentViewSet,NilaiAkhirViewSet, JobViewSet, MahasiswaListView, cache_stats_view, register_cohort_view, dashboard_view, batch_view
 from rest_framework_simplejwt.views import TokenRefreshView
+from .serializers import CustomTokenRefreshSerializer
 from rest_framework.routers import DefaultRouter
+from . import async_views
 
 router = DefaultRouter()
 router.register(r'jurusan', JurusanViewSet, basename='jurusan')
@@ -9,15 +11,27 @@ router.register(r'matakuliah', MatakuliahViewSet, basename='matakuliah')
 router.register(r'komponen', KomponenNilaiViewSet, basename='komponen')
 router.register(r'assessment', AssessmentViewSet, basename='assessment')
 router.register(r'nilai-akhir', NilaiAkhirViewSet, basename='nilai-akhir')
+router.register(r'jobs', JobViewSet, basename='job')
 
 
 auth_urls = [
     path('register/', RegisterView.as_view(), name='register'),
+    path('register/cohort/', register_cohort_view, name='register-cohort'),
     path('login/', CustomTokenObtainPairView.as_view(), name='login'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', TokenRefreshView.as_view(serializer_class=CustomTokenRefreshSerializer), name='token_refresh'),
 ]
 
 academic_urls = [
     path('mahasiswa/', MahasiswaListView.as_view(), name='mahasiswa-list'),
+    path('cache-stats/', cache_stats_view, name='cache-stats'),
+    path('dashboard/', dashboard_view, name='dashboard'),
+    # Versi async (ASGI) untuk endpoint baca yang paling sering dipanggil.
+    path('async/matakuliah/', async_views.matakuliah_list, name='async-matakuliah-list'),
+    path('async/transkrip/', async_views.transkrip, name='async-transkrip'),
+    path('async/dashboard/', async_views.dashboard, name='async-dashboard'),
     path('', include(router.urls)),
-]
\ No newline at end of file
+]
+
+batch_urls = [
+    path('', batch_view, name='batch'),
+]
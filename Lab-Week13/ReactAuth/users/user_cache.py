@@ -0,0 +1,82 @@
+# users/user_cache.py
+"""Cache LRU+TTL per proses untuk objek CustomUser (beserta major).
+
+Kunci cache adalah (user_id, token_version), jadi pencabutan token otomatis
+membuat entri lama tidak terpakai. Signal menghapus entri user yang disimpan
+atau dihapus di proses ini; proses lain paling lama basi selama TTL.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+
+class UserCache:
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id, versi):
+        """User (salinan) dari cache, atau dimuat dengan select_related('major') bila belum ada."""
+        # Claim user_id di token berupa str, sedangkan signal memakai instance.pk (int).
+        key = (int(user_id), versi)
+        sekarang = time.monotonic()
+        with self._lock:
+            entri = self._data.get(key)
+            if entri is not None and entri[0] > sekarang:
+                self._data.move_to_end(key)
+                self.hits += 1
+                user = entri[1]
+            else:
+                self.misses += 1
+                user = None
+
+        if user is None:
+            user = get_user_model().objects.select_related('major').get(pk=user_id)
+            with self._lock:
+                self._data[key] = (sekarang + self.ttl, user)
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+
+        # Salinan dangkal (state dan fields_cache ikut disalin) supaya perubahan
+        # di satu request tidak bocor ke request lain.
+        return copy.copy(user)
+
+    def invalidate(self, user_id):
+        user_id = int(user_id)
+        with self._lock:
+            for key in [key for key in self._data if key[0] == user_id]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / total, 4) if total else None,
+            }
+
+
+user_cache = UserCache(
+    maxsize=getattr(settings, 'USER_CACHE_MAXSIZE', 1024),
+    ttl=getattr(settings, 'USER_CACHE_TTL', 300),
+)
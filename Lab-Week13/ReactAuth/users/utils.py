@@ -1,30 +1,24 @@
-from django.db.models import Sum, F
+import time
+from django.db import transaction
+from django.db.models import Sum, F, Q, Count, Case, When, Value, DecimalField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from decimal import Decimal, InvalidOperation
-from .models import Matakuliah, NilaiAkhir
+from .models import Matakuliah, NilaiAkhir, Assessment, RingkasanTranskrip
+from . import analytics, catalog_cache, conditional, grading
+from .grading import GRADING_SCALE
 
 CustomUser = get_user_model()
 
-GRADING_SCALE = [
-    (80, 'A'),
-    (75, 'AB'),
-    (70, 'B'),
-    (65, 'BC'),
-    (60, 'C'),
-    (50, 'D'),
-    (0, 'E'),
-]
-
-def get_nilai_huruf(nilai_angka):
+def get_nilai_huruf(nilai_angka, matakuliah_kode=None, jurusan_kode=None):
     try:
         nilai_angka = Decimal(nilai_angka)
-    except InvalidOperation:
+    except (InvalidOperation, TypeError, ValueError):
         return 'E' 
-    
-    for threshold, grade in GRADING_SCALE:
-        if nilai_angka >= Decimal(threshold):
-            return grade
-    return 'E'
+    if nilai_angka.is_nan():
+        return 'E'
+
+    return grading.scale_for(matakuliah_kode, jurusan_kode).letter(nilai_angka)
 
 def hitung_dan_simpan_nilai_akhir(mahasiswa_id, matakuliah_kode):
 
@@ -36,7 +30,7 @@ def hitung_dan_simpan_nilai_akhir(mahasiswa_id, matakuliah_kode):
     except Matakuliah.DoesNotExist:
         return False, "Mata Kuliah tidak ditemukan."
     assessment_data = mahasiswa.assessment_scores.filter(
-        komponen__matakuliah=matakuliah
+        matakuliah=matakuliah
     ).annotate(
         weighted_score=(F('nilai_angka') * F('komponen__bobot_persen')) / Decimal('100.0')
     )
@@ -47,7 +41,7 @@ def hitung_dan_simpan_nilai_akhir(mahasiswa_id, matakuliah_kode):
     if nilai_total is None:
         return False, "Tidak ada nilai assessment yang ditemukan untuk mata kuliah ini."
 
-    nilai_huruf = get_nilai_huruf(nilai_total)
+    nilai_huruf = get_nilai_huruf(nilai_total, matakuliah.kode_mk, matakuliah.jurusan_id)
 
     nilai_akhir, created = NilaiAkhir.objects.update_or_create(
         mahasiswa=mahasiswa,
@@ -58,4 +52,198 @@ def hitung_dan_simpan_nilai_akhir(mahasiswa_id, matakuliah_kode):
         }
     )
     
-    return True, nilai_akhir
\ No newline at end of file
+    return True, nilai_akhir
+
+def _total_terbobot(assessment_filter):
+    """Satu agregat ber-GROUP BY (mahasiswa, matakuliah) atas Assessment yang lolos filter."""
+    return (
+        Assessment.objects.filter(assessment_filter, mahasiswa__role=CustomUser.Role.MAHASISWA)
+        .values(
+            'mahasiswa_id',
+            matakuliah_kode=F('matakuliah_id'),
+            jurusan_kode=F('matakuliah__jurusan_id'),
+        )
+        .annotate(total=Sum((F('nilai_angka') * F('komponen__bobot_persen')) / Decimal('100.0')))
+        .order_by()
+    )
+
+def _upsert_nilai_akhir(totals, batch_size=500):
+    per_matakuliah = {}
+    for row in totals:
+        if row['total'] is not None:
+            per_matakuliah.setdefault((row['matakuliah_kode'], row['jurusan_kode']), []).append(row)
+
+    rows = []
+    for (matakuliah_kode, jurusan_kode), group in per_matakuliah.items():
+        # Satu panggilan pemetaan huruf untuk semua mahasiswa dalam mata kuliah ini.
+        letters = grading.scale_for(matakuliah_kode, jurusan_kode).letters_for(row['total'] for row in group)
+        rows.extend(
+            NilaiAkhir(
+                mahasiswa_id=row['mahasiswa_id'],
+                matakuliah_id=matakuliah_kode,
+                nilai_total=row['total'],
+                nilai_huruf=letter,
+            )
+            for row, letter in zip(group, letters)
+        )
+    NilaiAkhir.objects.bulk_create(
+        rows,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['mahasiswa', 'matakuliah'],
+        update_fields=['nilai_total', 'nilai_huruf'],
+    )
+    sinkronkan_total_mahasiswa({matakuliah_kode for matakuliah_kode, _ in per_matakuliah})
+    # bulk_create tidak memicu signal; validator ETag NilaiAkhir ikut basi.
+    conditional.naikkan_versi('nilai_akhir')
+    return rows
+
+def sinkronkan_total_mahasiswa(matakuliah_kodes):
+    """Hitung ulang Matakuliah.total_mahasiswa setelah upsert massal (bulk_create tanpa signal).
+
+    Hanya mata kuliah yang jumlahnya benar-benar berubah yang ditulis, dan versi
+    katalog hanya dinaikkan bila ada; menghitung ulang nilai peserta lama tidak
+    membuang cache katalog.
+    """
+    if not matakuliah_kodes:
+        return
+    sekarang = dict(
+        NilaiAkhir.objects.filter(matakuliah_id__in=matakuliah_kodes)
+        .values('matakuliah_id')
+        .annotate(jumlah=Count('id'))
+        .order_by()
+        .values_list('matakuliah_id', 'jumlah')
+    )
+    berubah = [
+        kode for kode, total in
+        Matakuliah.objects.filter(kode_mk__in=matakuliah_kodes).values_list('kode_mk', 'total_mahasiswa')
+        if sekarang.get(kode, 0) != total
+    ]
+    if not berubah:
+        return
+
+    jumlah = (
+        NilaiAkhir.objects.filter(matakuliah=OuterRef('pk'))
+        .order_by()
+        .values('matakuliah')
+        .annotate(jumlah=Count('id'))
+        .values('jumlah')
+    )
+    Matakuliah.objects.filter(kode_mk__in=berubah).update(
+        total_mahasiswa=Coalesce(Subquery(jumlah), 0)
+    )
+    # total_mahasiswa ikut tampil di respons katalog yang di-cache.
+    catalog_cache.naikkan_versi_katalog()
+
+def hitung_nilai_akhir_matakuliah(matakuliah_kode, batch_size=500):
+    """Hitung nilai akhir seluruh mahasiswa dalam satu mata kuliah sekaligus.
+
+    Total terbobot dihitung dengan satu agregat ber-GROUP BY mahasiswa, lalu
+    semua baris NilaiAkhir di-upsert dengan satu bulk write (per batch_size).
+    """
+    mulai = time.perf_counter()
+
+    try:
+        matakuliah = Matakuliah.objects.get(kode_mk=matakuliah_kode)
+    except Matakuliah.DoesNotExist:
+        return False, "Mata Kuliah tidak ditemukan."
+
+    with transaction.atomic():
+        existing = set(
+            NilaiAkhir.objects.filter(matakuliah=matakuliah).values_list('mahasiswa_id', flat=True)
+        )
+        rows = _upsert_nilai_akhir(_total_terbobot(Q(matakuliah=matakuliah)), batch_size)
+        perbarui_ringkasan_transkrip(existing | {row.mahasiswa_id for row in rows})
+        analytics.naikkan_versi_nilai([matakuliah.kode_mk])
+
+    diperbarui = sum(1 for row in rows if row.mahasiswa_id in existing)
+    return True, {
+        'matakuliah': matakuliah.kode_mk,
+        'jumlah_mahasiswa': len(rows),
+        'dibuat': len(rows) - diperbarui,
+        'diperbarui': diperbarui,
+        'durasi_ms': round((time.perf_counter() - mulai) * 1000, 2),
+    }
+
+def hitung_ulang_nilai_akhir(pasangan=(), matakuliah_kodes=(), batch_size=500):
+    """Hitung ulang hanya pasangan (mahasiswa_id, matakuliah_kode) yang kotor.
+
+    Mata kuliah di matakuliah_kodes dihitung ulang untuk semua mahasiswanya.
+    Semua pasangan digabung ke dalam satu filter sehingga agregatnya tetap satu
+    query dan upsert-nya satu bulk write. Pasangan yang sudah tidak punya
+    Assessment dikembalikan menjadi 'Belum Dihitung'.
+    """
+    matakuliah_kodes = set(matakuliah_kodes)
+    per_matakuliah = {}
+    for mahasiswa_id, matakuliah_kode in pasangan:
+        if matakuliah_kode not in matakuliah_kodes:
+            per_matakuliah.setdefault(matakuliah_kode, set()).add(mahasiswa_id)
+
+    if not matakuliah_kodes and not per_matakuliah:
+        return []
+
+    filter_assessment = Q(matakuliah_id__in=matakuliah_kodes)
+    filter_nilai = Q(matakuliah_id__in=matakuliah_kodes)
+    for matakuliah_kode, mahasiswa_ids in per_matakuliah.items():
+        filter_assessment |= Q(matakuliah_id=matakuliah_kode, mahasiswa_id__in=mahasiswa_ids)
+        filter_nilai |= Q(matakuliah_id=matakuliah_kode, mahasiswa_id__in=mahasiswa_ids)
+
+    with transaction.atomic():
+        terdampak = set(NilaiAkhir.objects.filter(filter_nilai).values_list('mahasiswa_id', flat=True))
+        NilaiAkhir.objects.filter(filter_nilai).update(nilai_total=None, nilai_huruf=None)
+        conditional.naikkan_versi('nilai_akhir')
+        rows = _upsert_nilai_akhir(_total_terbobot(filter_assessment), batch_size)
+        perbarui_ringkasan_transkrip(terdampak | {row.mahasiswa_id for row in rows})
+        analytics.naikkan_versi_nilai(matakuliah_kodes | set(per_matakuliah))
+    return rows
+
+def perbarui_ringkasan_transkrip(mahasiswa_ids, batch_size=500):
+    """Segarkan RingkasanTranskrip untuk mahasiswa yang NilaiAkhir-nya berubah.
+
+    Hanya baris milik mahasiswa tersebut yang diagregasi (satu query), lalu
+    ringkasannya di-upsert dalam satu bulk write.
+    """
+    # Mahasiswa yang baru saja dihapus (cascade) tidak perlu ringkasan lagi.
+    mahasiswa_ids = set(CustomUser.objects.filter(pk__in=set(mahasiswa_ids)).values_list('pk', flat=True))
+    if not mahasiswa_ids:
+        return []
+
+    bobot_huruf = Case(
+        *[When(nilai_huruf=huruf, then=Value(Decimal(str(bobot)))) for huruf, bobot in grading.BOBOT_HURUF.items()],
+        default=Value(Decimal('0')),
+        output_field=DecimalField(max_digits=3, decimal_places=2),
+    )
+    agregat = {
+        row['mahasiswa_id']: row
+        for row in NilaiAkhir.objects.filter(mahasiswa_id__in=mahasiswa_ids, nilai_huruf__isnull=False)
+        .values('mahasiswa_id')
+        .annotate(
+            jumlah=Count('id'),
+            sks=Sum('matakuliah__sks'),
+            bobot=Sum(F('matakuliah__sks') * bobot_huruf),
+        )
+        .order_by()
+    }
+
+    ringkasan = []
+    for mahasiswa_id in mahasiswa_ids:
+        row = agregat.get(mahasiswa_id, {})
+        total_sks = row.get('sks') or 0
+        total_bobot = Decimal(row.get('bobot') or 0)
+        ipk = (total_bobot / total_sks).quantize(Decimal('0.01')) if total_sks else Decimal('0.00')
+        ringkasan.append(RingkasanTranskrip(
+            mahasiswa_id=mahasiswa_id,
+            jumlah_matakuliah=row.get('jumlah', 0),
+            total_sks=total_sks,
+            total_bobot=total_bobot,
+            ipk=ipk,
+        ))
+
+    RingkasanTranskrip.objects.bulk_create(
+        ringkasan,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=['mahasiswa'],
+        update_fields=['jumlah_matakuliah', 'total_sks', 'total_bobot', 'ipk', 'updated_at'],
+    )
+    return ringkasan
@@ -4,11 +4,19 @@ from django.shortcuts import render
 from rest_framework import generics, permissions, viewsets, status
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import get_user_model
-from .serializers import CustomUserSerializer, CustomTokenObtainPairSerializer,JurusanSerializer, MatakuliahReadSerializer, MatakuliahWriteSerializer, KomponenNilaiSerializer, AssessmentSerializer, NilaiAkhirSerializer, MahasiswaSerializer
+from .serializers import CustomUserSerializer, CustomTokenObtainPairSerializer,JurusanSerializer, MatakuliahReadSerializer, MatakuliahWriteSerializer, KomponenNilaiSerializer, AssessmentSerializer, NilaiAkhirSerializer, MahasiswaSerializer, RingkasanTranskripSerializer, AssessmentBulkSerializer, JobSerializer
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import FileResponse
 from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
-from .models import Jurusan, Matakuliah, KomponenNilai, Assessment, NilaiAkhir, CustomUser
+from .models import Jurusan, Matakuliah, KomponenNilai, Assessment, NilaiAkhir, CustomUser, RingkasanTranskrip, Job
+from .catalog_cache import CatalogCacheMixin
+from .conditional import ConditionalGetMixin
+from .fieldsets import SparseFieldsetMixin, terapkan_fields
+from .exports import FORMAT_EKSPOR, KOLOM_EKSPOR, cek_tipe, stream_ekspor
 User = get_user_model()
 
 class RegisterView(generics.CreateAPIView):
@@ -27,6 +35,75 @@ def protected_data_view(request):
         "message": f"Akses berhasil! Anda adalah {request.user.role}.",
         "full_name": request.user.full_name
     })
+
+def minta_background(request):
+    """?background=1 (atau "background": true di body): jalankan lewat antrian job."""
+    nilai = request.query_params.get('background')
+    if nilai is None and isinstance(request.data, dict):
+        nilai = request.data.get('background')
+    return str(nilai).lower() in ('1', 'true', 'yes')
+
+def antrekan(request, jenis, payload):
+    from .jobs import enqueue
+    job = enqueue(jenis, payload, user=request.user)
+    return Response(JobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+@api_view(['POST'])
+@permission_classes([IsAdminUser])
+def register_cohort_view(request):
+    rows = request.data.get('users') if isinstance(request.data, dict) else request.data
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        return Response(
+            {"detail": "Data harus berupa list user (atau {'users': [...]})."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    from .cohort import daftarkan_angkatan
+
+    password_default = request.data.get('password_default') if isinstance(request.data, dict) else None
+    if minta_background(request):
+        return antrekan(request, 'registrasi_angkatan', {'users': rows, 'password_default': password_default})
+
+    success, result = daftarkan_angkatan(rows, password_default=password_default)
+
+    if not success:
+        return Response({"detail": result}, status=status.HTTP_400_BAD_REQUEST)
+    if not result['dibuat']:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result, status=status.HTTP_201_CREATED)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch_view(request):
+    items = request.data.get('requests') if isinstance(request.data, dict) else request.data
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return Response(
+            {"detail": "Data harus berupa list request (atau {'requests': [...]})."},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    from .batch import jalankan_batch
+
+    success, result = jalankan_batch(request, items)
+    if not success:
+        return Response({"detail": result}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard_view(request):
+    from .dashboard import dashboard_dosen, dashboard_mahasiswa
+
+    if request.user.role == CustomUser.Role.DOSEN:
+        return Response(dashboard_dosen(request.user.id))
+    return Response(dashboard_mahasiswa(request.user.id))
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats_view(request):
+    from . import catalog_cache
+    from .user_cache import user_cache
+    return Response({'user': user_cache.stats(), 'katalog': catalog_cache.stats()})
     
 
 class IsDosenOrReadOnly(permissions.BasePermission):
@@ -36,27 +113,63 @@ class IsDosenOrReadOnly(permissions.BasePermission):
         return request.user.is_authenticated and (
             request.user.role == CustomUser.Role.DOSEN or request.user.is_staff
         )
-class MahasiswaListView(generics.ListAPIView):
-    queryset = User.objects.filter(role=CustomUser.Role.MAHASISWA)
+class IsDosenOrStaff(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.role == CustomUser.Role.DOSEN or request.user.is_staff
+        )
+class MahasiswaListView(SparseFieldsetMixin, generics.ListAPIView):
+    queryset = User.objects.filter(role=CustomUser.Role.MAHASISWA).select_related('major')
     serializer_class = MahasiswaSerializer
     permission_classes = [IsAuthenticated, IsDosenOrReadOnly] 
 class IsMahasiswaSelf(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.user.role == CustomUser.Role.DOSEN or request.user.is_staff:
             return True
-        return obj.mahasiswa == request.user
+        return obj.mahasiswa_id == request.user.id
+
+def ranking_response(request, fungsi, kode):
+    """Dosen/staff: leaderboard (?limit=) dan ?mahasiswa_id=; mahasiswa hanya peringkatnya sendiri."""
+    if request.user.role == CustomUser.Role.MAHASISWA and not request.user.is_staff:
+        limit, mahasiswa_id = 0, request.user.id
+    else:
+        limit = request.query_params.get('limit', '10')
+        mahasiswa_id = request.query_params.get('mahasiswa_id')
+        if not limit.isdigit() or (mahasiswa_id is not None and not mahasiswa_id.isdigit()):
+            return Response(
+                {"detail": "limit dan mahasiswa_id harus berupa angka."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = int(limit)
+
+    success, result = fungsi(kode, limit=limit, mahasiswa_id=mahasiswa_id)
+    if not success:
+        return Response({"detail": result}, status=status.HTTP_404_NOT_FOUND)
+    return Response(result, status=status.HTTP_200_OK)
 
-class JurusanViewSet(viewsets.ModelViewSet):
+class JurusanViewSet(ConditionalGetMixin, CatalogCacheMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
+    etag_tabel = ('katalog',)
     queryset = Jurusan.objects.all()
     serializer_class = JurusanSerializer
+    permission_classes = [permissions.AllowAny]
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
             return [permissions.IsAdminUser()] 
         
-        return [permissions.AllowAny()]
+        # permission_classes di @action (misal ranking) ikut dipakai.
+        return super().get_permissions()
+
+    @action(detail=True, methods=['GET'], permission_classes=[IsAuthenticated])
+    def ranking(self, request, pk=None):
+        from .ranking import peringkat_jurusan
+        return ranking_response(request, peringkat_jurusan, pk)
 
-class MatakuliahViewSet(viewsets.ModelViewSet):
-    queryset = Matakuliah.objects.all()
+class MatakuliahViewSet(ConditionalGetMixin, CatalogCacheMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
+    etag_tabel = ('katalog',)
+    sparse_sources = {'pengajar': ['pengajar']}
+    queryset = Matakuliah.objects.select_related('jurusan').prefetch_related(
+        Prefetch('pengajar', queryset=User.objects.only('id', 'full_name', 'email'))
+    )
     permission_classes = [IsDosenOrReadOnly] 
 
     def get_serializer_class(self):
@@ -67,8 +180,23 @@ class MatakuliahViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save()
 
-class KomponenNilaiViewSet(viewsets.ModelViewSet):
-    queryset = KomponenNilai.objects.all()
+    @action(detail=True, methods=['GET'], permission_classes=[IsAuthenticated])
+    def ranking(self, request, pk=None):
+        from .ranking import peringkat_matakuliah
+        return ranking_response(request, peringkat_matakuliah, pk)
+
+    @action(detail=True, methods=['GET'], permission_classes=[IsDosenOrStaff])
+    def statistics(self, request, pk=None):
+        from .analytics import statistik_matakuliah
+
+        success, result = statistik_matakuliah(pk)
+        if not success:
+            return Response({"detail": result}, status=status.HTTP_404_NOT_FOUND)
+        return Response(result, status=status.HTTP_200_OK)
+
+class KomponenNilaiViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
+    etag_tabel = ('komponen', 'katalog')
+    queryset = KomponenNilai.objects.select_related('matakuliah')
     serializer_class = KomponenNilaiSerializer
     permission_classes = [IsDosenOrReadOnly]
     
@@ -80,8 +208,9 @@ class KomponenNilaiViewSet(viewsets.ModelViewSet):
             return queryset.filter(matakuliah__kode_mk=matakuliah_kode_mk)
         return queryset
 
-class AssessmentViewSet(viewsets.ModelViewSet):
-    queryset = Assessment.objects.all()
+class AssessmentViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
+    etag_tabel = ('assessment', 'komponen', 'user')
+    queryset = Assessment.objects.select_related('mahasiswa', 'komponen')
     serializer_class = AssessmentSerializer
     permission_classes = [IsDosenOrReadOnly]
     
@@ -89,17 +218,83 @@ class AssessmentViewSet(viewsets.ModelViewSet):
         queryset = super().get_queryset()
         matakuliah_kode_mk = self.request.query_params.get('matakuliah_kode_mk')
         if matakuliah_kode_mk:
-            return queryset.filter(komponen__matakuliah__kode_mk=matakuliah_kode_mk)
+            return queryset.filter(matakuliah_id=matakuliah_kode_mk)
         return queryset
 
-class NilaiAkhirViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = NilaiAkhir.objects.all()
+    @action(detail=False, methods=['POST', 'PUT'])
+    def bulk(self, request):
+        if not isinstance(request.data, list):
+            return Response(
+                {"detail": "Data harus berupa list nilai."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # POST hanya membuat baru, PUT meng-upsert seluruh grid.
+        serializer = AssessmentBulkSerializer(
+            data=request.data, many=True, context={'upsert': request.method == 'PUT'}
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            objs = serializer.save()
+
+        diperbarui = sum(
+            1 for obj in objs if (obj.mahasiswa_id, obj.komponen_id) in serializer.existing
+        )
+        return Response(
+            {'jumlah': len(objs), 'dibuat': len(objs) - diperbarui, 'diperbarui': diperbarui},
+            status=status.HTTP_200_OK if request.method == 'PUT' else status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, methods=['POST'], url_path='import', parser_classes=[MultiPartParser, FormParser])
+    def import_nilai(self, request):
+        matakuliah_kode = request.data.get('matakuliah_kode')
+        berkas = request.FILES.get('file')
+
+        if not matakuliah_kode or berkas is None:
+            return Response(
+                {"detail": "matakuliah_kode dan file harus disediakan."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        from .imports import baca_baris, impor_nilai_assessment
+
+        success, result = impor_nilai_assessment(matakuliah_kode, baca_baris(berkas))
+
+        if not success:
+            return Response({"detail": result}, status=status.HTTP_400_BAD_REQUEST)
+        if result['errors'] and not result['nilai_disimpan']:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['GET'], permission_classes=[IsDosenOrStaff])
+    def export(self, request):
+        # ?tipe= karena ?format= sudah dipakai DRF untuk memilih renderer.
+        tipe = request.query_params.get('tipe', 'csv')
+        try:
+            if minta_background(request):
+                cek_tipe(tipe)
+                matakuliah_kode_mk = request.query_params.get('matakuliah_kode_mk')
+                return antrekan(request, 'ekspor', {
+                    'sumber': 'assessment', 'tipe': tipe,
+                    'filter': {'matakuliah_id': matakuliah_kode_mk} if matakuliah_kode_mk else {},
+                })
+            fields, kolom = KOLOM_EKSPOR['assessment']
+            return stream_ekspor(
+                self.get_queryset(), fields, tipe=tipe, nama_berkas='assessment', kolom=kolom,
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+class NilaiAkhirViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
+    etag_tabel = ('nilai_akhir', 'katalog')
+    queryset = NilaiAkhir.objects.select_related('matakuliah')
     serializer_class = NilaiAkhirSerializer
     permission_classes = [IsAuthenticated]
     def get_queryset(self):
+        queryset = super().get_queryset()
         if self.request.user.role == CustomUser.Role.MAHASISWA and not self.request.user.is_staff:
-            return NilaiAkhir.objects.filter(mahasiswa=self.request.user)
-        return NilaiAkhir.objects.all()
+            return queryset.filter(mahasiswa_id=self.request.user.id)
+        return queryset
 
     @action(detail=False, methods=['POST'], permission_classes=[IsDosenOrReadOnly])
     def calculate_final_score(self, request):
@@ -120,4 +315,96 @@ class NilaiAkhirViewSet(viewsets.ReadOnlyModelViewSet):
             serializer = NilaiAkhirSerializer(result)
             return Response(serializer.data, status=status.HTTP_200_OK)
         else:
-            return Response({"detail": result}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response({"detail": result}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['POST'], permission_classes=[IsDosenOrReadOnly])
+    def calculate_course(self, request):
+        matakuliah_kode = request.data.get('matakuliah_kode')
+
+        if not matakuliah_kode:
+            return Response(
+                {"detail": "matakuliah_kode harus disediakan."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if minta_background(request):
+            if not Matakuliah.objects.filter(kode_mk=matakuliah_kode).exists():
+                return Response({"detail": "Mata Kuliah tidak ditemukan."}, status=status.HTTP_400_BAD_REQUEST)
+            return antrekan(request, 'hitung_nilai_matakuliah', {'matakuliah_kode': matakuliah_kode})
+
+        from .utils import hitung_nilai_akhir_matakuliah
+
+        success, result = hitung_nilai_akhir_matakuliah(matakuliah_kode)
+
+        if success:
+            return Response(result, status=status.HTTP_200_OK)
+        return Response({"detail": result}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['GET'])
+    def export(self, request):
+        tipe = request.query_params.get('tipe', 'csv')
+        try:
+            if minta_background(request):
+                cek_tipe(tipe)
+                saring = {}
+                if request.user.role == CustomUser.Role.MAHASISWA and not request.user.is_staff:
+                    saring['mahasiswa_id'] = request.user.id
+                return antrekan(request, 'ekspor', {'sumber': 'nilai_akhir', 'tipe': tipe, 'filter': saring})
+            fields, kolom = KOLOM_EKSPOR['nilai_akhir']
+            return stream_ekspor(
+                self.get_queryset(), fields, tipe=tipe, nama_berkas='nilai_akhir', kolom=kolom,
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=False, methods=['GET'])
+    def summary(self, request):
+        if request.user.role == CustomUser.Role.MAHASISWA and not request.user.is_staff:
+            mahasiswa_id = request.user.id
+        else:
+            mahasiswa_id = request.query_params.get('mahasiswa_id')
+            if not mahasiswa_id or not mahasiswa_id.isdigit():
+                return Response(
+                    {"detail": "mahasiswa_id harus disediakan."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        ringkasan = RingkasanTranskrip.objects.filter(mahasiswa_id=mahasiswa_id).first()
+        if ringkasan is None:
+            # Belum pernah dihitung (data lama): buat sekali, selanjutnya dijaga oleh signal.
+            from .utils import perbarui_ringkasan_transkrip
+            hasil = perbarui_ringkasan_transkrip([mahasiswa_id])
+            if not hasil:
+                return Response({"detail": "Mahasiswa tidak ditemukan."}, status=status.HTTP_404_NOT_FOUND)
+            ringkasan = hasil[0]
+
+        serializer = terapkan_fields(RingkasanTranskripSerializer(ringkasan), request)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Status dan progres job latar belakang; user biasa hanya melihat job miliknya."""
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(dibuat_oleh_id=self.request.user.id)
+        status_job = self.request.query_params.get('status')
+        if status_job:
+            queryset = queryset.filter(status=status_job.upper())
+        return queryset
+
+    @action(detail=True, methods=['GET'])
+    def download(self, request, pk=None):
+        from .jobs import berkas_ekspor
+
+        job = self.get_object()
+        path = berkas_ekspor(job)
+        if path is None:
+            return Response({"detail": "Berkas ekspor belum tersedia."}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(
+            open(path, 'rb'), as_attachment=True, filename=job.hasil['berkas'],
+            content_type=FORMAT_EKSPOR[job.hasil['tipe']],
+        )
@@ -1,6 +1,7 @@
 
 import { useState, useEffect, useCallback } from 'react';
 import axios from 'axios';
+import { fetchAllPages } from '../utils/Api';
 
 const API_BASE_URL = 'http://localhost:8000/api';
 
@@ -71,7 +72,7 @@ export const useAPI = (endpoint, dependencies = []) => {
 
     try {
       const token = localStorage.getItem('access_token');
-      const response = await axios.get(`${API_BASE_URL}${endpoint}`, {
+      const response = await fetchAllPages(`${API_BASE_URL}${endpoint}`, {
         headers: { Authorization: `Bearer ${token}` }
       });
       setData(response.data);
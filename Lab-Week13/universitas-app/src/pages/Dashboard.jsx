@@ -10,6 +10,7 @@ const Dashboard = () => {
   const navigate = useNavigate();
   const [matakuliah, setMatakuliah] = useState([]);
   const [nilaiAkhir, setNilaiAkhir] = useState([]);
+  const [ringkasan, setRingkasan] = useState(null);
   const [loading, setLoading] = useState(true);
   const [sidebarOpen, setSidebarOpen] = useState(true);
 
@@ -17,25 +18,13 @@ const Dashboard = () => {
     if (!user) return;
 
     try {
-      if (user.role === "DOSEN") {
-        const mkResponse = await axios.get(
-          "http://localhost:8000/api/academic/matakuliah/"
-        );
-        const filtered = mkResponse.data.filter((mk) =>
-          mk.pengajar.some((p) => p.email === user.email)
-        );
-        setMatakuliah(filtered);
-      } else {
-        const mkResponse = await axios.get(
-          "http://localhost:8000/api/academic/matakuliah/"
-        );
-        setMatakuliah(mkResponse.data);
-
-        const nilaiResponse = await axios.get(
-          "http://localhost:8000/api/academic/nilai-akhir/"
-        );
-        setNilaiAkhir(nilaiResponse.data);
-      }
+      // Satu request: server mengirim payload sesuai role (MK, nilai, IPK/SKS, progres).
+      const response = await axios.get(
+        "http://localhost:8000/api/academic/dashboard/"
+      );
+      setMatakuliah(response.data.matakuliah);
+      setNilaiAkhir(response.data.nilai_akhir || []);
+      setRingkasan(response.data.ringkasan);
       setLoading(false);
     } catch (error) {
       console.error("Error fetching data:", error);
@@ -63,27 +52,15 @@ const Dashboard = () => {
   if (!user) {
     return null;
   }
+  // IPK dan total SKS dihitung di server (RingkasanTranskrip)
   const calculateIPK = () => {
-    if (nilaiAkhir.length === 0) return "0.00";
-
-    const gradePoints = {
-      A: 4.0,
-      AB: 3.5,
-      B: 3.0,
-      BC: 2.5,
-      C: 2.0,
-      D: 1.0,
-      E: 0.0,
-    };
-
-    const total = nilaiAkhir.reduce((sum, nilai) => {
-      return sum + (gradePoints[nilai.nilai_huruf] || 0);
-    }, 0);
-
-    return (total / nilaiAkhir.length).toFixed(2);
+    return ringkasan ? parseFloat(ringkasan.ipk).toFixed(2) : "0.00";
   };
   const calculateTotalSKS = () => {
-    return matakuliah.length * 3; // 3 SKS per MK
+    if (user.role === "DOSEN") {
+      return matakuliah.reduce((sum, mk) => sum + mk.sks, 0);
+    }
+    return ringkasan ? ringkasan.total_sks : 0;
   };
   const Sidebar = () => (
     <aside
@@ -353,15 +330,10 @@ const Dashboard = () => {
 
   const StatsCards = () => {
     const getTotalMahasiswa = () => {
-      return matakuliah.reduce((sum, mk) => sum + (mk.total_mahasiswa || 0), 0);
+      return ringkasan ? ringkasan.total_mahasiswa : 0;
     };
     const getNilaiTerinputPercentage = () => {
-      const totalMK = matakuliah.length;
-      const studentsPerMK = 20;
-      const componentsPerMK = 4;
-      const expectedTotal = totalMK * studentsPerMK * componentsPerMK;
-
-      return expectedTotal;
+      return ringkasan ? `${ringkasan.progres_persen}%` : "0%";
     };
 
     const dosenStats = [
@@ -384,7 +356,9 @@ const Dashboard = () => {
         value: getNilaiTerinputPercentage(),
         icon: "✅",
         color: "purple",
-        trend: "11 pending",
+        trend: ringkasan
+          ? `${ringkasan.nilai_terinput} dari ${ringkasan.nilai_diharapkan} nilai`
+          : "",
       },
     ];
 
@@ -25,79 +25,61 @@ const InputNilai = () => {
   const [error, setError] = useState("");
   const [success, setSuccess] = useState("");
 
-  const fetchMatakuliah = useCallback(async () => {
+  // Matakuliah + mahasiswa diambil dalam satu request batch.
+  const fetchAwal = useCallback(async () => {
     if (!user) return;
     setLoading(true);
     try {
-      // ✅ GANTI dari axios.get ke api.get
-      const response = await api.get("/academic/matakuliah/");
+      const [mkList, mahasiswaList] = await api.getAllBatch([
+        "/academic/matakuliah/",
+        "/academic/mahasiswa/",
+      ]);
       const filtered =
         user.role === "DOSEN"
-          ? response.data.filter((mk) =>
+          ? mkList.filter((mk) =>
               mk.pengajar?.some((p) => p.email === user.email)
             )
-          : response.data;
+          : mkList;
       setMatakuliah(filtered);
+      setMahasiswa(mahasiswaList);
     } catch (error) {
-      console.error("Error fetching matakuliah:", error);
-      setError("Gagal memuat data mata kuliah");
+      console.error("Error fetching matakuliah/mahasiswa:", error);
+      setError("Gagal memuat data mata kuliah dan mahasiswa");
+      setMahasiswa([]);
     } finally {
       setLoading(false);
     }
   }, [user]);
 
-  const fetchMahasiswa = useCallback(async () => {
-    try {
-      // ✅ GANTI dari axios.get ke api.get
-      const response = await api.get("/academic/mahasiswa/");
-      setMahasiswa(response.data);
-    } catch (error) {
-      console.error("Error fetching mahasiswa:", error);
-      setError("Gagal memuat data mahasiswa");
-      setMahasiswa([]);
-    }
-  }, []);
-
-  const fetchKomponenNilai = useCallback(async (kode_mk) => {
+  // Komponen nilai + assessment untuk satu MK, juga satu request batch.
+  const fetchNilaiMK = useCallback(async (kode_mk) => {
     try {
-      // ✅ GANTI dari axios.get ke api.get
-      const response = await api.get("/academic/komponen/", {
-        params: { matakuliah_kode_mk: kode_mk },
-      });
-      setKomponenNilai(response.data);
+      const query = `?matakuliah_kode_mk=${encodeURIComponent(kode_mk)}`;
+      const [komponenList, assessmentList] = await api.getAllBatch([
+        `/academic/komponen/${query}`,
+        `/academic/assessment/${query}`,
+      ]);
+      setKomponenNilai(komponenList);
+      setAssessments(assessmentList);
     } catch (error) {
-      console.error("Error fetching komponen nilai:", error);
+      console.error("Error fetching komponen/assessment:", error);
       setKomponenNilai([]);
-    }
-  }, []);
-
-  const fetchAssessments = useCallback(async (kode_mk) => {
-    try {
-      // ✅ GANTI dari axios.get ke api.get
-      const response = await api.get("/academic/assessment/", {
-        params: { matakuliah_kode_mk: kode_mk },
-      });
-      setAssessments(response.data);
-    } catch (error) {
-      console.error("Error fetching assessments:", error);
       setAssessments([]);
     }
   }, []);
 
   useEffect(() => {
-    fetchMatakuliah();
-    fetchMahasiswa();
-  }, [fetchMatakuliah, fetchMahasiswa]);
+    fetchAwal();
+  }, [fetchAwal]);
 
   useEffect(() => {
     if (selectedMK) {
-      fetchKomponenNilai(selectedMK);
-      fetchAssessments(selectedMK);
+      fetchNilaiMK(selectedMK);
     } else {
       setKomponenNilai([]);
       setAssessments([]);
     }
-  }, [selectedMK, fetchKomponenNilai, fetchAssessments]);
+  }, [selectedMK, fetchNilaiMK]);
 
   const handleSubmit = async (e) => {
     e.preventDefault();
@@ -116,7 +98,7 @@ const InputNilai = () => {
 
       setSuccess("Nilai berhasil diinput!");
       setShowModal(false);
-      fetchAssessments(selectedMK);
+      fetchNilaiMK(selectedMK);
       resetForm();
     } catch (error) {
       if (error.response?.data?.non_field_errors) {
@@ -141,7 +123,7 @@ const InputNilai = () => {
       // ✅ GANTI dari axios.delete ke api.delete
       await api.delete(`/academic/assessment/${id}/`);
       setSuccess("Nilai berhasil dihapus!");
-      fetchAssessments(selectedMK);
+      fetchNilaiMK(selectedMK);
     } catch (error) {
       setError("Gagal menghapus nilai");
     }
@@ -35,7 +35,7 @@ const JadwalKRS = () => {
         }
       );
 
-      const coursesWithSchedule = response.data
+      const coursesWithSchedule = response.data.results
         .slice(0, 8)
         .map((mk, index) => ({
           ...mk,
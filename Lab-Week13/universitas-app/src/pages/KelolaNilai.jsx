@@ -45,7 +45,7 @@ const KelolaNilai = () => {
 
   const fetchMatakuliah = async () => {
     try {
-      const response = await api.get("/academic/matakuliah/");
+      const response = await api.getAll("/academic/matakuliah/");
       const filtered =
         user.role === "DOSEN"
           ? response.data.filter((mk) =>
@@ -63,7 +63,7 @@ const KelolaNilai = () => {
 
   const fetchKomponen = async (kode_mk) => {
     try {
-      const response = await api.get("/academic/komponen/", {
+      const response = await api.getAll("/academic/komponen/", {
         params: { matakuliah_kode_mk: kode_mk },
       });
       setKomponenList(response.data);
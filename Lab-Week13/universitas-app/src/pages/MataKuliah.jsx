@@ -2,6 +2,7 @@ import React, { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import { useAuth } from "../context/AuthContext";
 import axios from "axios";
+import { fetchAllPages } from "../utils/Api";
 
 const MataKuliah = () => {
   const { user } = useAuth();
@@ -31,7 +32,7 @@ const MataKuliah = () => {
       const token = localStorage.getItem("access_token");
       const config = { headers: { Authorization: `Bearer ${token}` } };
 
-      const mkResponse = await axios.get(
+      const mkResponse = await fetchAllPages(
         "http://localhost:8000/api/academic/matakuliah/",
         config
       );
@@ -45,7 +46,7 @@ const MataKuliah = () => {
 
       setMatakuliah(filtered);
 
-      const jurusanResponse = await axios.get(
+      const jurusanResponse = await fetchAllPages(
         "http://localhost:8000/api/academic/jurusan/",
         config
       );
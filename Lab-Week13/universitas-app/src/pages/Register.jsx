@@ -2,6 +2,7 @@
 
 import React, { useState, useEffect } from "react";
 import axios from "axios";
+import { fetchAllPages } from "../utils/Api";
 import { useNavigate } from "react-router-dom";
 import { useAuth } from "../context/AuthContext";
 
@@ -32,7 +33,7 @@ const Register = () => {
   useEffect(() => {
     const fetchJurusan = async () => {
       try {
-        const response = await axios.get(`${API_BASE_URL}/academic/jurusan/`);
+        const response = await fetchAllPages(`${API_BASE_URL}/academic/jurusan/`);
         setJurusanList(response.data);
       } catch (err) {
         console.error("Failed to fetch jurusan list:", err);
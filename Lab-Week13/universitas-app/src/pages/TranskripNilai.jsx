@@ -7,6 +7,7 @@ const TranskripNilai = () => {
   const { user } = useAuth();
   const navigate = useNavigate();
   const [nilaiAkhir, setNilaiAkhir] = useState([]);
+  const [ringkasan, setRingkasan] = useState(null);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState("all");
   const [searchTerm, setSearchTerm] = useState("");
@@ -18,8 +19,12 @@ const TranskripNilai = () => {
   const fetchNilai = async () => {
     try {
       // ✅ GANTI dari axios.get ke api.get
-      const response = await api.get("/academic/nilai-akhir/");
+      const [response, summaryResponse] = await Promise.all([
+        api.getAll("/academic/nilai-akhir/"),
+        api.get("/academic/nilai-akhir/summary/"),
+      ]);
       setNilaiAkhir(response.data);
+      setRingkasan(summaryResponse.data);
       setLoading(false);
     } catch (error) {
       console.error("Error fetching nilai:", error);
@@ -27,28 +32,13 @@ const TranskripNilai = () => {
     }
   };
 
+  // IPK dan total SKS dihitung di server (RingkasanTranskrip)
   const calculateIPK = () => {
-    if (nilaiAkhir.length === 0) return "0.00";
-
-    const gradePoints = {
-      A: 4.0,
-      AB: 3.5,
-      B: 3.0,
-      BC: 2.5,
-      C: 2.0,
-      D: 1.0,
-      E: 0.0,
-    };
-
-    const total = nilaiAkhir.reduce((sum, nilai) => {
-      return sum + (gradePoints[nilai.nilai_huruf] || 0);
-    }, 0);
-
-    return (total / nilaiAkhir.length).toFixed(2);
+    return ringkasan ? parseFloat(ringkasan.ipk).toFixed(2) : "0.00";
   };
 
   const calculateTotalSKS = () => {
-    return nilaiAkhir.length * 3;
+    return ringkasan ? ringkasan.total_sks : 0;
   };
 
   const getGradeColor = (grade) => {
@@ -6,6 +6,23 @@ const getAuthToken = () => {
   return localStorage.getItem('access_token');
 };
 
+// Endpoint list memakai cursor pagination ({ next, previous, results }).
+// Ikuti `next` sampai habis dan kembalikan semua hasil sebagai response.data.
+export const fetchAllPages = async (url, config = {}) => {
+  const results = [];
+  let next = url;
+  let response;
+  while (next) {
+    response = await axios.get(next, config);
+    if (!Array.isArray(response.data?.results)) return response;
+    results.push(...response.data.results);
+    next = response.data.next;
+    // URL `next` sudah membawa query string halaman pertama.
+    config = { ...config, params: undefined };
+  }
+  return { ...response, data: results };
+};
+
 const api = {
   get: (url, config = {}) => {
     const token = getAuthToken();
@@ -18,6 +35,60 @@ const api = {
     });
   },
 
+  getAll: (url, config = {}) => {
+    const token = getAuthToken();
+    return fetchAllPages(`${API_BASE_URL}${url}`, {
+      ...config,
+      headers: {
+        ...config.headers,
+        Authorization: token ? `Bearer ${token}` : '',
+      },
+    });
+  },
+
+  // Beberapa request dalam satu round trip lewat /api/batch/.
+  // requests: [{ id, method, path: "/academic/...", body }]
+  batch: (requests, config = {}) => {
+    const token = getAuthToken();
+    return axios.post(
+      `${API_BASE_URL}/batch/`,
+      {
+        requests: requests.map((item) => ({ ...item, path: `/api${item.path}` })),
+      },
+      {
+        ...config,
+        headers: {
+          ...config.headers,
+          Authorization: token ? `Bearer ${token}` : '',
+        },
+      }
+    );
+  },
+
+  // Seperti getAll untuk beberapa list sekaligus: halaman pertama diambil
+  // dalam satu batch, halaman lanjutan (jarang) diikuti per list.
+  getAllBatch: async (paths) => {
+    const token = getAuthToken();
+    const config = {
+      headers: { Authorization: token ? `Bearer ${token}` : '' },
+    };
+    const response = await api.batch(
+      paths.map((path) => ({
+        path: `${path}${path.includes('?') ? '&' : '?'}page_size=500`,
+      }))
+    );
+    return Promise.all(
+      response.data.responses.map(async (item) => {
+        if (item.status >= 400) {
+          throw new Error(item.data?.detail || `Request gagal (${item.status})`);
+        }
+        if (!item.data?.next) return item.data.results;
+        const rest = await fetchAllPages(item.data.next, config);
+        return [...item.data.results, ...rest.data];
+      })
+    );
+  },
+
   post: (url, data, config = {}) => {
     const token = getAuthToken();
     return axios.post(`${API_BASE_URL}${url}`, data, {